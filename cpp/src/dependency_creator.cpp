@@ -1,11 +1,18 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
+#include <cstdint>
+#include <stdexcept>
 #include <string>
 #include <tuple>
 #include <utility>
 #include <vector>
 #include <unordered_map>
 #include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <optional>
+#include <thread>
 
 namespace py = pybind11;
 
@@ -36,7 +43,8 @@ void sort_actions_by_time_step(std::vector<Action>& actions) {
 enum class DepCreationMethod {
     EXHAUSTIVE,
     CP,
-    SCP
+    SCP,
+    SCP_DENSE
 };
 
 struct Pos2DHash {
@@ -80,32 +88,157 @@ std::optional<Action> find_rel_candidate(const std::vector<Action>& candidate_ac
     return std::nullopt;
 }
 
-std::vector<std::tuple<int, int>> create_type2_dependencies(const std::vector<Action>& all_actions, DepCreationMethod method_to_use) {
-    std::vector<std::tuple<int, int>> dependencies;
+// Candidate lookup over a dense grid: actions are bucketed by their linearized start cell
+// (x * width + y) in a CSR layout, and ordered by time_step_t within each cell.
+struct DenseCandidateIndex {
+    int min_x = 0;
+    int min_y = 0;
+    int width = 0;
+    std::vector<int> cell_offsets;
+    std::vector<int> action_indices;
+    std::vector<int> time_steps;
 
+    int cell_of(const Pos2D& pos) const {
+        return (std::get<0>(pos) - min_x) * width + (std::get<1>(pos) - min_y);
+    }
+};
+
+DenseCandidateIndex create_dense_candidate_index(const std::vector<Action>& all_actions) {
+    DenseCandidateIndex index;
+    if (all_actions.empty()) {
+        index.cell_offsets.assign(1, 0);
+        return index;
+    }
+
+    int min_x = std::get<0>(all_actions[0].start_s), max_x = min_x;
+    int min_y = std::get<1>(all_actions[0].start_s), max_y = min_y;
+    int min_t = all_actions[0].time_step_t, max_t = min_t;
+    for (const auto& action : all_actions) {
+        for (const Pos2D* pos : {&action.start_s, &action.goal_g}) {
+            min_x = std::min(min_x, std::get<0>(*pos));
+            max_x = std::max(max_x, std::get<0>(*pos));
+            min_y = std::min(min_y, std::get<1>(*pos));
+            max_y = std::max(max_y, std::get<1>(*pos));
+        }
+        min_t = std::min(min_t, action.time_step_t);
+        max_t = std::max(max_t, action.time_step_t);
+    }
+    index.min_x = min_x;
+    index.min_y = min_y;
+    index.width = max_y - min_y + 1;
+    const size_t num_cells = static_cast<size_t>(max_x - min_x + 1) * index.width;
+    const size_t num_actions = all_actions.size();
+
+    // Two stable counting sort passes (time step, then start cell) yield the (cell, time_step_t) order.
+    std::vector<int> time_offsets(max_t - min_t + 2, 0);
+    for (const auto& action : all_actions) {
+        ++time_offsets[action.time_step_t - min_t + 1];
+    }
+    for (size_t t = 1; t < time_offsets.size(); ++t) {
+        time_offsets[t] += time_offsets[t - 1];
+    }
+    std::vector<int> by_time(num_actions);
+    for (size_t i = 0; i < num_actions; ++i) {
+        by_time[time_offsets[all_actions[i].time_step_t - min_t]++] = static_cast<int>(i);
+    }
+
+    index.cell_offsets.assign(num_cells + 1, 0);
+    for (const auto& action : all_actions) {
+        ++index.cell_offsets[index.cell_of(action.start_s) + 1];
+    }
+    for (size_t c = 1; c <= num_cells; ++c) {
+        index.cell_offsets[c] += index.cell_offsets[c - 1];
+    }
+    std::vector<int> cell_fill(index.cell_offsets.begin(), index.cell_offsets.end() - 1);
+    index.action_indices.resize(num_actions);
+    index.time_steps.resize(num_actions);
+    for (int i : by_time) {
+        const int slot = cell_fill[index.cell_of(all_actions[i].start_s)]++;
+        index.action_indices[slot] = i;
+        index.time_steps[slot] = all_actions[i].time_step_t;
+    }
+    return index;
+}
+
+using Dependencies = std::vector<std::tuple<int, int>>;
+
+constexpr size_t SHARD_SIZE = 1024;
+
+// Runs collect(i, out) for every action index. With more than one thread the indices are split into
+// fixed-size shards that idle threads pick up; every shard writes into its own buffer and the buffers
+// are concatenated in shard order, so the result is identical to the single threaded run.
+template <typename CollectFn>
+Dependencies collect_sharded(size_t num_actions, int num_threads, const CollectFn& collect) {
+    if (num_threads <= 0) {
+        num_threads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+    const size_t num_shards = (num_actions + SHARD_SIZE - 1) / SHARD_SIZE;
+    num_threads = static_cast<int>(std::min<size_t>(num_threads, num_shards));
+
+    Dependencies dependencies;
+    if (num_threads <= 1) {
+        for (size_t i = 0; i < num_actions; ++i) {
+            collect(i, dependencies);
+        }
+        return dependencies;
+    }
+
+    std::vector<Dependencies> shard_dependencies(num_shards);
+    std::atomic<size_t> next_shard{0};
+    std::vector<std::thread> workers;
+    workers.reserve(num_threads);
+    for (int t = 0; t < num_threads; ++t) {
+        workers.emplace_back([&]() {
+            for (size_t shard = next_shard++; shard < num_shards; shard = next_shard++) {
+                const size_t end = std::min(num_actions, (shard + 1) * SHARD_SIZE);
+                for (size_t i = shard * SHARD_SIZE; i < end; ++i) {
+                    collect(i, shard_dependencies[shard]);
+                }
+            }
+        });
+    }
+    for (auto& worker : workers) {
+        worker.join();
+    }
+
+    size_t num_dependencies = 0;
+    for (const auto& shard : shard_dependencies) {
+        num_dependencies += shard.size();
+    }
+    dependencies.reserve(num_dependencies);
+    for (const auto& shard : shard_dependencies) {
+        dependencies.insert(dependencies.end(), shard.begin(), shard.end());
+    }
+    return dependencies;
+}
+
+Dependencies create_type2_dependencies(const std::vector<Action>& all_actions, DepCreationMethod method_to_use,
+                                       int num_threads = 1) {
     switch (method_to_use)
     {
         case DepCreationMethod::EXHAUSTIVE:
-            {
-                for (const auto& action_a : all_actions) {
-                    for (const auto& action_b : all_actions) {
-                        if (action_a.shuttle_R == action_b.shuttle_R) {
-                            continue;
-                        }
-                        if (action_a.goal_g == action_b.start_s &&
-                            action_a.time_step_t >= action_b.time_step_t) {
-                            dependencies.emplace_back(action_b.related_vertex_id, action_a.related_vertex_id);
-                        }
+            return collect_sharded(all_actions.size(), num_threads, [&](size_t i, Dependencies& dependencies) {
+                const Action& action_a = all_actions[i];
+                for (const auto& action_b : all_actions) {
+                    if (action_a.shuttle_R == action_b.shuttle_R) {
+                        continue;
+                    }
+                    if (action_a.goal_g == action_b.start_s &&
+                        action_a.time_step_t >= action_b.time_step_t) {
+                        dependencies.emplace_back(action_b.related_vertex_id, action_a.related_vertex_id);
                     }
                 }
-            }
-        break;
+            });
         case DepCreationMethod::CP:
             {
-                auto candidate_action_lookup_S = create_candidate_action_lookup(all_actions);
-                for (const auto& a_i : all_actions) {
-                    for (const auto& c_i : candidate_action_lookup_S[a_i.goal_g])
-                    {
+                const auto candidate_action_lookup_S = create_candidate_action_lookup(all_actions);
+                return collect_sharded(all_actions.size(), num_threads, [&](size_t i, Dependencies& dependencies) {
+                    const Action& a_i = all_actions[i];
+                    const auto candidates = candidate_action_lookup_S.find(a_i.goal_g);
+                    if (candidates == candidate_action_lookup_S.end()) {
+                        return;
+                    }
+                    for (const auto& c_i : candidates->second) {
                         if (a_i.shuttle_R == c_i.shuttle_R) {
                             continue;
                         }
@@ -113,9 +246,8 @@ std::vector<std::tuple<int, int>> create_type2_dependencies(const std::vector<Ac
                             dependencies.emplace_back(c_i.related_vertex_id, a_i.related_vertex_id);
                         }
                     }
-                }
+                });
             }
-        break;
         case DepCreationMethod::SCP:
             {
                 auto candidate_action_lookup_S = create_candidate_action_lookup(all_actions);
@@ -124,18 +256,100 @@ std::vector<std::tuple<int, int>> create_type2_dependencies(const std::vector<Ac
                     std::sort(actions.begin(), actions.end());
                 }
 
-                for (const auto& a_i : all_actions) {
-                    auto candidate_actions_C = candidate_action_lookup_S[a_i.goal_g];
-                    
-                    auto candidate_ck = find_rel_candidate(candidate_actions_C, a_i);
+                return collect_sharded(all_actions.size(), num_threads, [&](size_t i, Dependencies& dependencies) {
+                    const Action& a_i = all_actions[i];
+                    const auto candidates = candidate_action_lookup_S.find(a_i.goal_g);
+                    if (candidates == candidate_action_lookup_S.end()) {
+                        return;
+                    }
+
+                    auto candidate_ck = find_rel_candidate(candidates->second, a_i);
                     if (candidate_ck.has_value()) {
                         dependencies.emplace_back(candidate_ck->related_vertex_id, a_i.related_vertex_id);
                     }
-                }
+                });
+            }
+        case DepCreationMethod::SCP_DENSE:
+            {
+                const auto index = create_dense_candidate_index(all_actions);
+                return collect_sharded(all_actions.size(), num_threads, [&](size_t i, Dependencies& dependencies) {
+                    const Action& a_i = all_actions[i];
+                    const int cell = index.cell_of(a_i.goal_g);
+                    const auto first = index.time_steps.begin() + index.cell_offsets[cell];
+                    const auto last = index.time_steps.begin() + index.cell_offsets[cell + 1];
+
+                    // Latest candidate starting at the goal cell no later than a_i, same rule as find_rel_candidate.
+                    const auto it = std::upper_bound(first, last, a_i.time_step_t);
+                    if (it == first) {
+                        return;
+                    }
+                    const Action& candidate = all_actions[index.action_indices[it - index.time_steps.begin() - 1]];
+                    if (candidate.shuttle_R != a_i.shuttle_R) {
+                        dependencies.emplace_back(candidate.related_vertex_id, a_i.related_vertex_id);
+                    }
+                });
             }
-        break;
     }
-    return dependencies;
+    return {};
+}
+
+using IntColumn = py::array_t<int32_t, py::array::c_style | py::array::forcecast>;
+
+std::vector<Action> actions_from_columns(const IntColumn& start_x, const IntColumn& start_y,
+                                         const IntColumn& goal_x, const IntColumn& goal_y,
+                                         const IntColumn& time_step_t, const IntColumn& shuttle_R,
+                                         const IntColumn& related_vertex_id) {
+    const py::ssize_t num_actions = start_x.size();
+    for (const IntColumn* column : {&start_y, &goal_x, &goal_y, &time_step_t, &shuttle_R, &related_vertex_id}) {
+        if (column->ndim() != 1 || column->size() != num_actions) {
+            throw std::invalid_argument("All action columns must be one-dimensional and of equal length.");
+        }
+    }
+
+    auto sx = start_x.unchecked<1>();
+    auto sy = start_y.unchecked<1>();
+    auto gx = goal_x.unchecked<1>();
+    auto gy = goal_y.unchecked<1>();
+    auto t = time_step_t.unchecked<1>();
+    auto r = shuttle_R.unchecked<1>();
+    auto v = related_vertex_id.unchecked<1>();
+
+    std::vector<Action> all_actions;
+    all_actions.reserve(num_actions);
+    for (py::ssize_t i = 0; i < num_actions; ++i) {
+        all_actions.emplace_back(std::make_tuple(sx(i), sy(i)), std::make_tuple(gx(i), gy(i)), t(i), r(i), v(i));
+    }
+    return all_actions;
+}
+
+py::array_t<int32_t> dependencies_to_array(const Dependencies& dependencies) {
+    py::array_t<int32_t> result({static_cast<py::ssize_t>(dependencies.size()), static_cast<py::ssize_t>(2)});
+    auto out = result.mutable_unchecked<2>();
+    for (size_t i = 0; i < dependencies.size(); ++i) {
+        out(i, 0) = std::get<0>(dependencies[i]);
+        out(i, 1) = std::get<1>(dependencies[i]);
+    }
+    return result;
+}
+
+// Returns the (E, 2) dependencies and the seconds spent creating them. The columns are copied once into a
+// std::vector<Action> and the dependencies once into the result array, no Python object is created per action.
+// Only create_type2_dependencies is timed, not these two copies.
+std::tuple<py::array_t<int32_t>, double> create_type2_dependencies_columnar(
+        const IntColumn& start_x, const IntColumn& start_y, const IntColumn& goal_x, const IntColumn& goal_y,
+        const IntColumn& time_step_t, const IntColumn& shuttle_R, const IntColumn& related_vertex_id,
+        DepCreationMethod method_to_use, int num_threads) {
+    auto all_actions = actions_from_columns(start_x, start_y, goal_x, goal_y, time_step_t, shuttle_R,
+                                            related_vertex_id);
+    Dependencies dependencies;
+    std::chrono::duration<double> elapsed;
+    {
+        py::gil_scoped_release release;
+        const auto start = std::chrono::steady_clock::now();
+        dependencies = create_type2_dependencies(all_actions, method_to_use, num_threads);
+        elapsed = std::chrono::steady_clock::now() - start;
+    }
+    return {dependencies_to_array(dependencies), elapsed.count()};
 }
 
 std::string hello_from_cpp() {
@@ -148,7 +362,8 @@ PYBIND11_MODULE(dependency_creator, m) {
     py::enum_<DepCreationMethod>(m, "DepCreationMethod")
         .value("EXHAUSTIVE", DepCreationMethod::EXHAUSTIVE)
         .value("CP", DepCreationMethod::CP)
-        .value("SCP", DepCreationMethod::SCP);
+        .value("SCP", DepCreationMethod::SCP)
+        .value("SCP_DENSE", DepCreationMethod::SCP_DENSE);
     
     py::class_<Action>(m, "Action")
         .def(py::init<Pos2D, Pos2D, int, int, int>())
@@ -159,5 +374,13 @@ PYBIND11_MODULE(dependency_creator, m) {
         .def_readwrite("related_vertex_id", &Action::related_vertex_id);
 
     m.def("create_type2_dependencies", &create_type2_dependencies, "Create Type 2 dependencies from a list of actions",
-      py::arg("all_actions"), py::arg("dep_creation_method"));
+      py::arg("all_actions"), py::arg("dep_creation_method"), py::arg("num_threads") = 1,
+      py::call_guard<py::gil_scoped_release>());
+
+    m.def("create_type2_dependencies_columnar", &create_type2_dependencies_columnar,
+      "Create Type 2 dependencies from int32 action columns, returns an (E, 2) int32 array of (from, to) vertex ids "
+      "and the seconds spent creating them",
+      py::arg("start_x"), py::arg("start_y"), py::arg("goal_x"), py::arg("goal_y"),
+      py::arg("time_step_t"), py::arg("shuttle_R"), py::arg("related_vertex_id"), py::arg("dep_creation_method"),
+      py::arg("num_threads") = 1);
 }
\ No newline at end of file
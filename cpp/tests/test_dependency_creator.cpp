@@ -35,6 +35,59 @@ TEST(DependencyCreatorTest, create_type2_dependencies_cp)
     EXPECT_EQ(0, deps.size());
 }
 
+// Shuttles occupy distinct cells of a torus grid and all shift in the same random direction per time step,
+// so no two actions start in the same cell at the same time step.
+std::vector<Action> create_collision_free_actions(int num_shuttles, int num_time_steps, int grid_size) {
+    std::vector<Action> actions;
+    unsigned int state = 42;
+    auto next_random = [&state]() {
+        state = state * 1103515245u + 12345u;
+        return static_cast<int>((state >> 16) & 0x7fff);
+    };
+
+    std::vector<Pos2D> positions;
+    for (int cell = 0; cell < grid_size * grid_size && static_cast<int>(positions.size()) < num_shuttles; ++cell) {
+        if (next_random() % 2 == 0) {
+            positions.emplace_back(cell / grid_size, cell % grid_size);
+        }
+    }
+
+    for (int t = 0; t < num_time_steps; ++t) {
+        const int direction = next_random() % 3;
+        for (size_t shuttle = 0; shuttle < positions.size(); ++shuttle) {
+            auto [x, y] = positions[shuttle];
+            Pos2D goal = direction == 0 ? Pos2D(x, y)
+                       : direction == 1 ? Pos2D((x + 1) % grid_size, y)
+                                        : Pos2D(x, (y + 1) % grid_size);
+            const int vertex_id = static_cast<int>(actions.size());
+            actions.emplace_back(positions[shuttle], goal, t, static_cast<int>(shuttle), vertex_id);
+            positions[shuttle] = goal;
+        }
+    }
+    return actions;
+}
+
+TEST(DependencyCreatorTest, create_type2_dependencies_multithreaded_matches_single_threaded)
+{
+    auto actions = create_collision_free_actions(200, 25, 24);
+    for (auto method : {DepCreationMethod::EXHAUSTIVE, DepCreationMethod::CP, DepCreationMethod::SCP,
+                        DepCreationMethod::SCP_DENSE}) {
+        auto expected = create_type2_dependencies(actions, method, 1);
+        EXPECT_FALSE(expected.empty());
+        EXPECT_EQ(expected, create_type2_dependencies(actions, method, 4));
+        EXPECT_EQ(expected, create_type2_dependencies(actions, method, 0));
+    }
+}
+
+TEST(DependencyCreatorTest, create_type2_dependencies_scp_dense_matches_scp)
+{
+    auto actions = create_collision_free_actions(200, 25, 24);
+    auto expected = create_type2_dependencies(actions, DepCreationMethod::SCP);
+    EXPECT_FALSE(expected.empty());
+    EXPECT_EQ(expected, create_type2_dependencies(actions, DepCreationMethod::SCP_DENSE));
+    EXPECT_EQ(expected, create_type2_dependencies(actions, DepCreationMethod::SCP_DENSE, 4));
+}
+
 int main(int argc, char **argv) {
     ::testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();
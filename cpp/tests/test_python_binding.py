@@ -2,9 +2,14 @@ import sys
 import os
 import unittest
 
+import numpy as np
+
 sys.path.append(os.path.abspath('../build'))
+sys.path.append(os.path.abspath('../..'))
 
 import dependency_creator
+from src.adg.dependency_creator_cpp_wrapper import ActionColumns, DepCreationType
+from src.adg.dependency_creator_numpy import DependencyCreatorNumpy
 
 
 class TestDependencyCreator(unittest.TestCase):
@@ -16,10 +21,68 @@ class TestDependencyCreator(unittest.TestCase):
         action_1 = dependency_creator.Action((1, 0), (2, 0), 1, 42, 99)
         action_2 = dependency_creator.Action((2, 0), (3, 0), 1, 66, 142)
         
-        result = dependency_creator.create_type2_dependencies([action_1, action_2])
+        result = dependency_creator.create_type2_dependencies([action_1, action_2],
+                                                              dependency_creator.DepCreationMethod.EXHAUSTIVE)
         expected = [(142, 99)]
         self.assertListEqual(expected, result)
 
+    def test_create_dependency_columnar(self):
+        columns = [np.array(column, dtype=np.int32) for column in
+                   ([1, 2], [0, 0], [2, 3], [0, 0], [1, 1], [42, 66], [99, 142])]
+
+        result, elapsed = dependency_creator.create_type2_dependencies_columnar(
+            *columns, dependency_creator.DepCreationMethod.SCP)
+        self.assertGreaterEqual(elapsed, 0.0)
+        self.assertEqual(np.int32, result.dtype)
+        np.testing.assert_array_equal(np.array([[142, 99]], dtype=np.int32), result)
+
+    def test_create_dependency_columnar_length_mismatch(self):
+        columns = [np.zeros(2, dtype=np.int32) for _ in range(6)] + [np.zeros(1, dtype=np.int32)]
+        with self.assertRaises(ValueError):
+            dependency_creator.create_type2_dependencies_columnar(*columns, dependency_creator.DepCreationMethod.CP)
+
+
+def create_collision_free_columns(num_shuttles: int, num_time_steps: int, grid_size: int, seed: int) -> ActionColumns:
+    # Shuttles occupy distinct torus cells and all shift in the same random direction per time step.
+    rng = np.random.default_rng(seed)
+    cells = rng.choice(grid_size * grid_size, num_shuttles, replace=False)
+    position = np.stack((cells // grid_size, cells % grid_size), axis=1)
+
+    starts, goals = [], []
+    for _ in range(num_time_steps):
+        goal = (position + [(0, 0), (1, 0), (0, 1)][rng.integers(3)]) % grid_size
+        starts.append(position)
+        goals.append(goal)
+        position = goal
+
+    starts = np.stack(starts, axis=1).reshape(-1, 2)
+    goals = np.stack(goals, axis=1).reshape(-1, 2)
+    shuttles = np.repeat(np.arange(num_shuttles), num_time_steps)
+    time_steps = np.tile(np.arange(num_time_steps), num_shuttles)
+    vertex_ids = rng.permutation(len(shuttles))
+    return ActionColumns(*[np.ascontiguousarray(column, dtype=np.int32) for column in
+                           (starts[:, 0], starts[:, 1], goals[:, 0], goals[:, 1], time_steps, shuttles, vertex_ids)])
+
+
+class TestDependencyCreatorNumpyParity(unittest.TestCase):
+    METHODS = {
+        DepCreationType.EXHAUSTIVE: dependency_creator.DepCreationMethod.EXHAUSTIVE,
+        DepCreationType.CP: dependency_creator.DepCreationMethod.CP,
+        DepCreationType.SCP: dependency_creator.DepCreationMethod.SCP,
+        DepCreationType.SCP_DENSE: dependency_creator.DepCreationMethod.SCP_DENSE,
+    }
+
+    def test_numpy_matches_cpp(self):
+        for seed, (num_shuttles, num_time_steps, grid_size) in enumerate([(2, 3, 2), (30, 40, 8), (150, 30, 20)]):
+            columns = create_collision_free_columns(num_shuttles, num_time_steps, grid_size, seed)
+            for dep_creation_type, cpp_method in self.METHODS.items():
+                with self.subTest(seed=seed, method=dep_creation_type.name):
+                    expected, _ = dependency_creator.create_type2_dependencies_columnar(*columns.as_tuple(), cpp_method)
+                    result = DependencyCreatorNumpy().get_type2_dependencies_from_columns(columns, dep_creation_type)
+                    # CP/EXHAUSTIVE visit candidates in a different order, SCP creates one dependency per action.
+                    self.assertListEqual(sorted(map(tuple, expected.tolist())),
+                                         sorted(map(tuple, result.dependencies.tolist())))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,32 +1,72 @@
+import os
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
 from src.common.grid_map import GridMap, CELL_FREE_VALUE, CELL_UNPASSABLE_VALUE
+from src.common.path_util import cache_file_for, remove_stale_cache_files
+from src.common.resources import PATH_MAPF_BENCHMARK_MAP_CACHE
 
+TERRAIN_MAPPING = {
+    '.': CELL_FREE_VALUE,                        # Passable terrain
+    'G': CELL_FREE_VALUE,                        # Passable terrain
+    '@': CELL_UNPASSABLE_VALUE,                  # Out of bounds (impassable)
+    'O': CELL_UNPASSABLE_VALUE,                  # Out of bounds (impassable)
+    'T': CELL_UNPASSABLE_VALUE,                  # Trees (unpassable)
+    'S': CELL_FREE_VALUE,                        # Swamp (passable, but marked differently if needed)
+    'W': CELL_UNPASSABLE_VALUE                   # Water (impassable from terrain)
+}
 
-def parse_map_file(filepath: str) -> GridMap:
+# Cell value per map file byte, unknown terrain is marked with a value no cell has.
+_UNKNOWN_TERRAIN = np.iinfo(np.int8).max
+_TERRAIN_LOOKUP = np.full(256, _UNKNOWN_TERRAIN, dtype=np.int8)
+for terrain, cell_value in TERRAIN_MAPPING.items():
+    _TERRAIN_LOOKUP[ord(terrain)] = cell_value
 
-    terrain_mapping = {
-        '.': CELL_FREE_VALUE,                        # Passable terrain
-        'G': CELL_FREE_VALUE,                        # Passable terrain
-        '@': CELL_UNPASSABLE_VALUE,                  # Out of bounds (impassable)
-        'O': CELL_UNPASSABLE_VALUE,                  # Out of bounds (impassable)
-        'T': CELL_UNPASSABLE_VALUE,                  # Trees (unpassable)
-        'S': CELL_FREE_VALUE,                        # Swamp (passable, but marked differently if needed)
-        'W': CELL_UNPASSABLE_VALUE                   # Water (impassable from terrain)
-    }
 
-    with open(filepath, 'r') as f:
-        lines = f.readlines()
+def parse_map_cells(filepath: Union[str, Path]) -> np.ndarray:
+    with open(filepath, 'rb') as f:
+        lines = f.read().splitlines()
 
     # Parse header
-    assert lines[0].strip() == "type octile", "Invalid map file format"
+    assert lines[0].strip() == b"type octile", "Invalid map file format"
     height = int(lines[1].split()[1])
     width = int(lines[2].split()[1])
 
-    grid_map = GridMap(grid_size_x=height, grid_size_y=width)
+    # Rows that are shorter than the width stay free.
+    terrain = np.full((height, width), ord('.'), dtype=np.uint8)
+    for y, line in enumerate(lines[4:]):
+        row = line.strip()
+        terrain[y, :len(row)] = np.frombuffer(row, dtype=np.uint8)
+
+    cells = _TERRAIN_LOOKUP[terrain]
+    unknown = np.flatnonzero(cells == _UNKNOWN_TERRAIN)
+    if len(unknown):
+        raise ValueError(f"Unknown terrain type: {chr(terrain.flat[unknown[0]])} in map file")
+    return cells
+
+
+def load_map_cells(filepath: Union[str, Path], use_cache=True,
+                   cache_dir: Path = PATH_MAPF_BENCHMARK_MAP_CACHE) -> np.ndarray:
+    filepath = Path(filepath)
+    cache_file = cache_file_for(filepath, cache_dir, ".npy") if use_cache else None
+    if cache_file is not None and cache_file.exists():
+        return np.load(cache_file)
+
+    cells = parse_map_cells(filepath)
+    if cache_file is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        remove_stale_cache_files(cache_file)
+        # Written to a temporary file first, so concurrent readers never see a partial cache entry.
+        tmp_file = Path(f"{cache_file}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            np.save(f, cells)
+        os.replace(tmp_file, cache_file)
+    return cells
+
 
-    for y, line in enumerate(lines[4:]): 
-        for x, char in enumerate(line.strip()):
-            if char not in terrain_mapping:
-                raise ValueError(f"Unknown terrain type: {char} in map file")
-            mapped_char = terrain_mapping[char]
-            grid_map.update_pos(y, x, mapped_char)
-    return grid_map
+def parse_map_file(filepath: Union[str, Path], use_cache=True,
+                   cache_dir: Path = PATH_MAPF_BENCHMARK_MAP_CACHE) -> GridMap:
+    cells = load_map_cells(filepath, use_cache=use_cache, cache_dir=cache_dir)
+    return GridMap(grid_size_x=cells.shape[0], grid_size_y=cells.shape[1], MAP=cells)
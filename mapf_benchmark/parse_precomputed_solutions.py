@@ -1,27 +1,126 @@
+import itertools
 import json
+import os
 from collections import defaultdict
-from typing import List, Dict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Union
 
-from src.common.action import Action
+import numpy as np
 
+from src.adg.dependency_creator_cpp_wrapper import ActionColumns
+from src.common.action import CompactAction
+from src.common.path_util import cache_file_for, remove_stale_cache_files
+from src.common.resources import PATH_MAPF_BENCHMARK_SOLUTION_CACHE
 
-def parse_precomputed_solution_from_file(solution_file: str) -> Dict[int, List[Action]]:
+
+def parse_precomputed_solution_from_file(solution_file: str) -> Dict[int, List[CompactAction]]:
     with open(solution_file) as json_file:
         data = json.load(json_file)
     return parse_precomputed_solution(data)
 
 
-def parse_precomputed_solution(stored_actions: dict) -> Dict[int, List[Action]]:
+def parse_precomputed_solution(stored_actions: dict) -> Dict[int, List[CompactAction]]:
     shuttle_actions = defaultdict(list)
     for shuttle_id, moves in stored_actions.items():
         prev_pos = None
         for time_step, goal_g in enumerate(moves):
+            goal_g = tuple(goal_g)
             if prev_pos is None:
                 start_s = goal_g
             else:
                 start_s = prev_pos
-            action = Action(start_s=start_s, goal_g=goal_g, time_step_t=time_step, shuttle_R=int(shuttle_id))
+            action = CompactAction(start_s, goal_g, time_step, int(shuttle_id))
             shuttle_actions[shuttle_id].append(action)
 
             prev_pos = goal_g
     return shuttle_actions
+
+
+@dataclass
+class ColumnarPlan:
+    # All actions of a solution as int32 columns, grouped per shuttle in file order and sorted by time step.
+    shuttle_ids: np.ndarray
+    action_counts: np.ndarray
+    start_s: np.ndarray  # (N, 2)
+    goal_g: np.ndarray  # (N, 2)
+    time_step_t: np.ndarray
+    shuttle_R: np.ndarray
+
+    @staticmethod
+    def from_stored_actions(stored_actions: dict) -> 'ColumnarPlan':
+        shuttle_ids = np.fromiter(stored_actions.keys(), dtype=np.int32, count=len(stored_actions))
+        action_counts = np.fromiter((len(moves) for moves in stored_actions.values()), dtype=np.int32,
+                                    count=len(stored_actions))
+        num_actions = int(action_counts.sum())
+        goal_g = np.fromiter(itertools.chain.from_iterable(itertools.chain.from_iterable(stored_actions.values())),
+                             dtype=np.int32, count=2 * num_actions).reshape(-1, 2)
+
+        first_action = np.cumsum(action_counts) - action_counts
+        # The start of an action is the goal of the previous one, the first action of a shuttle waits.
+        start_s = np.empty_like(goal_g)
+        start_s[1:] = goal_g[:-1]
+        start_s[first_action[action_counts > 0]] = goal_g[first_action[action_counts > 0]]
+
+        time_step_t = (np.arange(num_actions) - np.repeat(first_action, action_counts)).astype(np.int32)
+        shuttle_R = np.repeat(shuttle_ids, action_counts)
+        return ColumnarPlan(shuttle_ids, action_counts, start_s, goal_g, time_step_t, shuttle_R)
+
+    @staticmethod
+    def load(cache_file: Union[str, Path]) -> 'ColumnarPlan':
+        with np.load(cache_file) as data:
+            return ColumnarPlan(**{name: data[name] for name in data.files})
+
+    def save(self, cache_file: Union[str, Path]):
+        # Written to a temporary file first, so concurrent readers never see a partial cache entry.
+        tmp_file = Path(f"{cache_file}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as file:
+            np.savez(file, **self.__dict__)
+        os.replace(tmp_file, cache_file)
+
+    def num_actions(self) -> int:
+        return len(self.time_step_t)
+
+    def is_move_action(self) -> np.ndarray:
+        return np.any(self.start_s != self.goal_g, axis=1)
+
+    def to_action_columns(self, skip_wait_actions=False) -> ActionColumns:
+        # Vertex ids are the action indices, as in an ArrayADG built from the same plan.
+        mask = self.is_move_action() if skip_wait_actions else np.ones(self.num_actions(), dtype=bool)
+        return ActionColumns(np.ascontiguousarray(self.start_s[mask, 0]), np.ascontiguousarray(self.start_s[mask, 1]),
+                             np.ascontiguousarray(self.goal_g[mask, 0]), np.ascontiguousarray(self.goal_g[mask, 1]),
+                             self.time_step_t[mask], self.shuttle_R[mask],
+                             np.arange(np.count_nonzero(mask), dtype=np.int32))
+
+    def to_shuttle_actions(self) -> Dict[int, List[CompactAction]]:
+        # As in parse_precomputed_solution, an action shares its start tuple with the goal of the previous one.
+        goals = list(map(tuple, self.goal_g.tolist()))
+        starts = goals[-1:] + goals[:-1]
+        for first_action in (np.cumsum(self.action_counts) - self.action_counts)[self.action_counts > 0].tolist():
+            starts[first_action] = goals[first_action]
+        actions = [CompactAction(start_s, goal_g, time_step_t, shuttle_R)
+                   for start_s, goal_g, time_step_t, shuttle_R
+                   in zip(starts, goals, self.time_step_t.tolist(), self.shuttle_R.tolist())]
+        shuttle_actions = {}
+        first_action = 0
+        for shuttle_id, action_count in zip(self.shuttle_ids.tolist(), self.action_counts.tolist()):
+            shuttle_actions[shuttle_id] = actions[first_action:first_action + action_count]
+            first_action += action_count
+        return shuttle_actions
+
+
+def load_precomputed_solution_columns(solution_file: Union[str, Path], use_cache=True,
+                                      cache_dir: Path = PATH_MAPF_BENCHMARK_SOLUTION_CACHE) -> ColumnarPlan:
+    solution_file = Path(solution_file)
+    cache_file = cache_file_for(solution_file, cache_dir, ".npz") if use_cache else None
+    if cache_file is not None and cache_file.exists():
+        return ColumnarPlan.load(cache_file)
+
+    with open(solution_file) as json_file:
+        plan = ColumnarPlan.from_stored_actions(json.load(json_file))
+
+    if cache_file is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        remove_stale_cache_files(cache_file)
+        plan.save(cache_file)
+    return plan
@@ -1,8 +1,12 @@
+import os
 from collections import defaultdict
 
 from src.common.path_util import get_all_files_in_directory, Path
-from typing import List
-from src.common.resources import PATH_MAPF_BENCHMARK_SOLUTIONS, PATH_MAPF_BENCHMARK_MAPS
+from typing import Dict, List
+from src.common.pydantic_util import BaseConfig
+from src.common.resources import PATH_MAPF_BENCHMARK_SOLUTIONS, PATH_MAPF_BENCHMARK_MAPS, PATH_MAPF_BENCHMARK_MAP_CACHE
+
+SCENARIO_INDEX_FILE = PATH_MAPF_BENCHMARK_MAP_CACHE / "scenario_index.json"
 
 
 class BenchmarkScenario:
@@ -18,9 +22,53 @@ class BenchmarkScenario:
         self.solution_files = group
 
 
-def prepare_benchmark_scenarios():
-    map_files = get_all_files_in_directory(PATH_MAPF_BENCHMARK_MAPS, file_extension="map")
-    solution_files = get_all_files_in_directory(PATH_MAPF_BENCHMARK_SOLUTIONS, file_extension="json")
+class ScenarioIndex(BaseConfig):
+    # Adding, removing or renaming a file or directory changes the mtime of the directory containing it, so the
+    # index is up to date while no directory below the maps and solutions directories changed.
+    directory_mtimes: Dict[str, int]
+    map_files: List[str]
+    solution_files: List[str]
+
+    def is_up_to_date(self) -> bool:
+        try:
+            return all(os.stat(directory).st_mtime_ns == mtime for directory, mtime in self.directory_mtimes.items())
+        except OSError:
+            return False
+
+
+def _directory_mtimes(*root_directories: Path) -> Dict[str, int]:
+    directory_mtimes = {}
+    for root_directory in root_directories:
+        for directory, _, _ in os.walk(root_directory):
+            directory_mtimes[directory] = os.stat(directory).st_mtime_ns
+    return directory_mtimes
+
+
+def load_scenario_index(use_cache=True, index_file: Path = SCENARIO_INDEX_FILE) -> ScenarioIndex:
+    if use_cache and index_file.exists():
+        try:
+            scenario_index = ScenarioIndex.from_file(index_file)
+            if scenario_index.is_up_to_date():
+                return scenario_index
+        except ValueError:
+            pass
+
+    # The mtimes are taken before listing, so a file added in between invalidates the index next time.
+    scenario_index = ScenarioIndex(
+        directory_mtimes=_directory_mtimes(PATH_MAPF_BENCHMARK_MAPS, PATH_MAPF_BENCHMARK_SOLUTIONS),
+        map_files=[str(f) for f in get_all_files_in_directory(PATH_MAPF_BENCHMARK_MAPS, file_extension="map")],
+        solution_files=[str(f) for f in
+                        get_all_files_in_directory(PATH_MAPF_BENCHMARK_SOLUTIONS, file_extension="json")])
+    if use_cache:
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        scenario_index.to_file(index_file)
+    return scenario_index
+
+
+def prepare_benchmark_scenarios(use_cache=True):
+    scenario_index = load_scenario_index(use_cache=use_cache)
+    map_files = [Path(f) for f in scenario_index.map_files]
+    solution_files = [Path(f) for f in scenario_index.solution_files]
 
     grouped_solutions = defaultdict(list)
 
@@ -37,4 +85,3 @@ def prepare_benchmark_scenarios():
             BenchmarkScenario(map_file=map_file, solution_files=grouped_solutions[map_file_name.split("-")[0]]))
 
     return benchmark_scenarios
-
@@ -1,28 +1,76 @@
-import itertools
+import heapq
 from collections import deque
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
 import networkx as nx
-from src.common.action import Action, ActionStatus
+import numpy as np
+from src.common.action import Action, STATUS_CODE_COMPLETED, STATUS_CODE_PENDING
+from src.adg.cycle_detection import find_dependency_cycle
+from src.adg.reachability import ChainReachabilityIndex, CompressedChainReachabilityIndex, chain_reachability_index
+from src.adg.transitive_reduction import find_redundant_type2_dependencies, shuttle_chains
+from src.common.math_util import frames_and_time_to_next_frame
 
-_global_node_counter = itertools.count()
+
+@dataclass
+class ExecutionSchedule:
+    start_times: Dict[int, float]
+    # Motion duration of each action, without the time up to the next frame.
+    durations: Dict[int, float]
+    finish_times: Dict[int, float]
+    makespan: float
 
 
 class ADG:
+    # Vertices are numbered 0..V-1 per ADG in insertion order, and vertex v holds the action whose
+    # related_vertex_id is v. Arrays over the vertices can therefore be indexed by vertex id.
+
     def __init__(self):
+        self._init_storage()
+        self._invalidate_reachability()
+
+    def _init_storage(self) -> None:
         self.graph = nx.DiGraph()
 
+    def _invalidate_reachability(self) -> None:
+        # The reachability index is built on the next query.
+        self._reachability_index: Optional[Union[ChainReachabilityIndex, CompressedChainReachabilityIndex]] = None
+        self._reachability_dirty = True
+
+    def _add_reachability_dependency(self, action_vertex_id_from: int, action_vertex_id_to: int) -> None:
+        if self._reachability_index is None:
+            self._reachability_dirty = True
+        elif not self._reachability_index.add_dependency(action_vertex_id_from, action_vertex_id_to):
+            # The ADG has a cycle now, queries fall back to a path search.
+            self._reachability_index = None
+
     def add_action(self, action: Action) -> int:
-        node_id = next(_global_node_counter)
+        node_id = self.graph.number_of_nodes()
         action.related_vertex_id = node_id
         self.graph.add_node(node_id, action=action)
+        self._invalidate_reachability()
         return node_id
 
     def add_dependency(self, action_vertex_id_from: int, action_vertex_id_to: int) -> None:
         if action_vertex_id_from in self.graph and action_vertex_id_to in self.graph:
             self.graph.add_edge(action_vertex_id_from, action_vertex_id_to)
+            self._add_reachability_dependency(action_vertex_id_from, action_vertex_id_to)
         else:
             raise ValueError("One or both action IDs not found in the graph.")
 
+    def add_dependencies_bulk(self, dependencies: np.ndarray) -> None:
+        # (E, 2) array of (from, to) vertex ids, validated at once and added like add_dependency.
+        dependencies = np.asarray(dependencies, dtype=np.int64).reshape(-1, 2)
+        if len(dependencies) and (dependencies.min() < 0 or dependencies.max() >= self.num_vertices()):
+            raise ValueError("One or both action IDs not found in the graph.")
+        self.graph.add_edges_from(dependencies.tolist())
+        self._invalidate_reachability()
+
+    def remove_dependency(self, action_vertex_id_from: int, action_vertex_id_to: int) -> None:
+        if not self.graph.has_edge(action_vertex_id_from, action_vertex_id_to):
+            raise ValueError("Dependency not found in the graph.")
+        self.graph.remove_edge(action_vertex_id_from, action_vertex_id_to)
+        self._invalidate_reachability()
+
     def get_action(self, node_id: int) -> Action:
         action = self.graph.nodes[node_id].get('action')
         if not action:
@@ -30,7 +78,7 @@ class ADG:
         return action
 
     def is_action_equable(self, action: Action) -> bool:
-        if action.status != ActionStatus.PENDING:
+        if action.status_code != STATUS_CODE_PENDING:
             return False
         predecessors = self.get_predecessors(action.related_vertex_id)
         predecessors_allow_enqueued_status = True
@@ -38,11 +86,11 @@ class ADG:
         for predecessor in predecessors:
             predecessor_action = self.get_action(predecessor)
             if predecessor_action.shuttle_R != action.shuttle_R:
-                if predecessor_action.status != ActionStatus.COMPLETED:
+                if predecessor_action.status_code != STATUS_CODE_COMPLETED:
                     predecessors_allow_enqueued_status = False
                     break
             else:
-                if predecessor_action.status == ActionStatus.PENDING:
+                if predecessor_action.status_code == STATUS_CODE_PENDING:
                     predecessors_allow_enqueued_status = False
                     break
 
@@ -50,27 +98,43 @@ class ADG:
 
     def enqueue_actions_bfs(self, start_action: Action) -> List[Action]:
         queue = deque([start_action])
+        in_queue = {start_action.related_vertex_id}
         enqueued_actions = []
 
         while queue:
             current_action = queue.popleft()
+            in_queue.discard(current_action.related_vertex_id)
             if self.is_action_equable(current_action):
                 current_action.move_status_forward()
                 enqueued_actions.append(current_action)
                 
-            if current_action.status != ActionStatus.PENDING:
+            if current_action.status_code != STATUS_CODE_PENDING:
                 successors = self.get_successors(current_action.related_vertex_id)
                 for successor_id in successors:
                     successor_action = self.get_action(successor_id)
-                    if successor_action.status == ActionStatus.PENDING:
+                    if successor_action.status_code == STATUS_CODE_PENDING and successor_id not in in_queue:
+                        in_queue.add(successor_id)
                         queue.append(successor_action)
                     
         return enqueued_actions
 
+    def num_vertices(self) -> int:
+        return self.graph.number_of_nodes()
+
     def get_all_actions(self) -> List[Action]:
         return [self.get_action(node_id) for node_id in self.graph.nodes]
 
     def is_reachable(self, source_id: int, target_id: int) -> bool:
+        self.get_action(source_id)
+        self.get_action(target_id)
+        if self._reachability_dirty:
+            self._reachability_index = chain_reachability_index(self.get_all_actions(), self.get_dependencies())
+            self._reachability_dirty = False
+        if self._reachability_index is None:
+            return self._has_path(source_id, target_id)
+        return self._reachability_index.is_reachable(source_id, target_id)
+
+    def _has_path(self, source_id: int, target_id: int) -> bool:
         return nx.has_path(self.graph, source_id, target_id)
 
     def reverse_graph(self) -> 'ADG':
@@ -108,37 +172,139 @@ class ADG:
         predecessors = set(self.graph.predecessors(node_id))
         return list(successors.union(predecessors))
 
+    def find_cycle(self) -> Optional[List[int]]:
+        # Vertex ids of one cycle in dependency order, or None if the ADG is acyclic. Only equal-time
+        # dependencies can close a cycle as long as no dependency goes backwards in time.
+        time_step_t = {node_id: action.time_step_t for node_id, action in self.graph.nodes(data='action')}
+        dependencies = [(u, v) for u, v in self.graph.edges() if time_step_t[u] >= time_step_t[v]]
+        if any(time_step_t[u] > time_step_t[v] for u, v in dependencies):
+            dependencies = list(self.graph.edges())
+        if not dependencies:
+            return None
+
+        vertex_ids, dependency_idx = np.unique(np.array(dependencies, dtype=np.int64), return_inverse=True)
+        dependency_idx = dependency_idx.reshape(-1, 2)
+        cycle = find_dependency_cycle(len(vertex_ids), dependency_idx[:, 0], dependency_idx[:, 1])
+        return None if cycle is None else vertex_ids[cycle].tolist()
+
     def is_acyclic(self):
-        return nx.is_directed_acyclic_graph(self.graph)
+        return self.find_cycle() is None
+
+    def get_dependencies(self) -> np.ndarray:
+        return np.array(list(self.graph.edges()), dtype=np.int64).reshape(-1, 2)
+
+    def copy_with_dependencies(self, dependencies: np.ndarray) -> 'ADG':
+        # Same vertices and actions, the given (from, to) dependencies.
+        adg = ADG()
+        adg.graph.add_nodes_from(self.graph.nodes(data=True))
+        adg.graph.add_edges_from(dependencies.tolist())
+        return adg
 
     def transitive_reduction(self) -> 'ADG':
-        if not self.is_acyclic():
-            raise ValueError("Transitive reduction is only defined for directed acyclic graphs (DAGs).")
+        # Non-mutating, the type-1 dependencies are always kept.
+        shuttle_idx, chain_position = shuttle_chains(self.get_all_actions())
+        dependencies = self.get_dependencies()
+        redundant = find_redundant_type2_dependencies(shuttle_idx, chain_position, dependencies[:, 0],
+                                                      dependencies[:, 1])
+        return self.copy_with_dependencies(dependencies[~redundant])
 
-        reduced_adg = ADG()
+    def canonical_dependencies(self) -> set:
+        # Dependencies as ((shuttle_R, time_step_t), (shuttle_R, time_step_t)) pairs, which do not depend on
+        # the order in which the vertices were added.
+        keys = [(action.shuttle_R, action.time_step_t) for action in self.get_all_actions()]
+        return {(keys[vertex_from], keys[vertex_to]) for vertex_from, vertex_to in self.get_dependencies().tolist()}
 
-        for node_id, data in self.graph.nodes(data=True):
-            reduced_adg.graph.add_node(node_id, **data)
+    def has_same_edges(self, other: 'ADG') -> bool:
+        # Compare edges without considering node attributes
+        return self.canonical_dependencies() == other.canonical_dependencies()
 
-        edges = list(self.graph.edges())
-        for u, v in edges:
+    def compute_execution_schedule(self, execution_time: float, consecutive_move_execution_time: float, fps: int,
+                                   eps: float) -> ExecutionSchedule:
+        # Start and finish time of every action as ShuttleSupervisor and Shuttle execute a pending ADG, without
+        # simulating it. An action is enqueued once its type-1 predecessor is enqueued and its type-2 predecessors
+        # are completed, and its shuttle takes it from the queue when its previous action is finished. The shuttle
+        # shortens a move if the next action is a move that is already queued at that moment: queued before, or
+        # together with the action if the shuttle took it right away. A shuttle that finishes an action takes the
+        # next one before the queue updates of the same time step, an idle shuttle after them. Actions are
+        # finalized in the order of that moment, which increases along every dependency, so the queue state at a
+        # moment is known from the actions finalized before.
+        enqueue_times: Dict[int, float] = {}
+        start_times: Dict[int, float] = {}
+        durations: Dict[int, float] = {}
+        finish_times: Dict[int, float] = {}
 
-            action_u = self.get_action(u)
-            action_v = self.get_action(v)
+        actions = {}
+        previous_action_id = {}
+        next_action_id = {}
+        type2_predecessors = {}
+        open_predecessors = {}
+        for action in self.get_all_actions():
+            vertex_id = action.related_vertex_id
+            actions[vertex_id] = action
+            type2_predecessors[vertex_id] = []
+            open_predecessors[vertex_id] = 0
+        for vertex_id, action in actions.items():
+            for predecessor_id in self.get_predecessors(vertex_id):
+                predecessor_id = int(predecessor_id)
+                open_predecessors[vertex_id] += 1
+                if actions[predecessor_id].shuttle_R == action.shuttle_R:
+                    previous_action_id[vertex_id] = predecessor_id
+                    next_action_id[predecessor_id] = vertex_id
+                else:
+                    type2_predecessors[vertex_id].append(predecessor_id)
 
-            if action_u.shuttle_R == action_v.shuttle_R:
-                reduced_adg.graph.add_edge(u, v)
-                continue
+        # (time the shuttle takes the action, vertex id, shuttle is idle since or None if it was busy)
+        ready = []
 
-            self.graph.remove_edge(u, v)  # Temporarily remove the edge
-            if not nx.has_path(self.graph, u, v):  # Check if reachability is lost
-                reduced_adg.graph.add_edge(u, v)  # Edge is essential, add to reduced graph
-            self.graph.add_edge(u, v)  # Re-add the edge
+        def push_ready(vertex_id: int):
+            previous_id = previous_action_id.get(vertex_id)
+            enqueue_time = enqueue_times[previous_id] if previous_id is not None else 0.0
+            for predecessor_id in type2_predecessors[vertex_id]:
+                enqueue_time = max(enqueue_time, finish_times[predecessor_id])
+            enqueue_times[vertex_id] = enqueue_time
 
-        return reduced_adg
+            idle_since = finish_times[previous_id] if previous_id is not None else 0.0
+            if enqueue_time < idle_since:
+                heapq.heappush(ready, (idle_since, vertex_id, None))
+            else:
+                heapq.heappush(ready, (enqueue_time, vertex_id, idle_since))
 
-    def has_same_edges(self, other: 'ADG') -> bool:
-        # Compare edges without considering node attributes
-        this_edges = set(self.graph.edges())
-        other_edges = set(other.graph.edges())
-        return this_edges == other_edges
+        for vertex_id, count in open_predecessors.items():
+            if count == 0:
+                push_ready(vertex_id)
+
+        makespan = 0.0
+        while ready:
+            now, vertex_id, idle_since = heapq.heappop(ready)
+            action = actions[vertex_id]
+
+            action_duration = execution_time
+            next_id = next_action_id.get(vertex_id)
+            if next_id is not None and action.is_move_action() and actions[next_id].is_move_action():
+                enqueue_time = enqueue_times[vertex_id]
+                if all(predecessor_id in finish_times and (finish_times[predecessor_id] < now
+                                                           or finish_times[predecessor_id] <= enqueue_time)
+                       for predecessor_id in type2_predecessors[next_id]):
+                    action_duration = consecutive_move_execution_time
+
+            if idle_since is not None and now - idle_since >= eps:
+                _, time_diff_to_yield = frames_and_time_to_next_frame(now - idle_since, fps)
+                if time_diff_to_yield > 0:
+                    now = now + time_diff_to_yield
+
+            _, time_diff_to_yield = frames_and_time_to_next_frame(action_duration, fps)
+            start_times[vertex_id] = now
+            durations[vertex_id] = action_duration
+            finish_times[vertex_id] = now + (action_duration + time_diff_to_yield)
+            makespan = max(makespan, finish_times[vertex_id])
+
+            for successor_id in self.get_successors(vertex_id):
+                successor_id = int(successor_id)
+                open_predecessors[successor_id] -= 1
+                if open_predecessors[successor_id] == 0:
+                    push_ready(successor_id)
+
+        if len(finish_times) != len(actions):
+            raise ValueError("ADG contains a Cycle!")
+        return ExecutionSchedule(start_times=start_times, durations=durations, finish_times=finish_times,
+                                 makespan=makespan)
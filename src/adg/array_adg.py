@@ -0,0 +1,201 @@
+from typing import List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+from src.adg.adg import ADG
+from src.adg.cycle_detection import find_dependency_cycle
+from src.common.action import Action
+
+
+class ArrayADG(ADG):
+    # Vertices are numbered 0..V-1 in insertion order and index a parallel action table.
+    # Dependencies are collected in append buffers and compacted into CSR (successors)
+    # and CSC (predecessors) arrays on the first read after a modification. Removed dependencies
+    # are filtered out at the next compaction as well, so adding and removing never compacts. Successors and
+    # predecessors are returned as lists like in ADG. The graph property is a frozen networkx
+    # view for read-only use, the ADG is only modified through its methods.
+
+    def _init_storage(self) -> None:
+        self._actions: List[Action] = []
+        self._edges_from: List[int] = []
+        self._edges_to: List[int] = []
+        self._adjacency_dirty = False
+        self._succ_ptr = np.zeros(1, dtype=np.int64)
+        self._succ_idx = np.zeros(0, dtype=np.int32)
+        self._pred_ptr = np.zeros(1, dtype=np.int64)
+        self._pred_idx = np.zeros(0, dtype=np.int32)
+        self._graph_cache: Optional[nx.DiGraph] = None
+        # Set of all (from, to) dependencies, created by the first removal and kept up to date from then on.
+        self._edge_set: Optional[Set[Tuple[int, int]]] = None
+        self._removed_edges: Set[Tuple[int, int]] = set()
+
+    def _invalidate(self) -> None:
+        self._adjacency_dirty = True
+        self._graph_cache = None
+        self._invalidate_reachability()
+
+    def _ensure_adjacency(self) -> None:
+        if not self._adjacency_dirty:
+            return
+        num_vertices = max(len(self._actions), 1)
+        edges_from = np.asarray(self._edges_from, dtype=np.int64)
+        edges_to = np.asarray(self._edges_to, dtype=np.int64)
+
+        # np.unique drops duplicate dependencies (like DiGraph.add_edge) and sorts by (from, to).
+        keys = np.unique(edges_from * num_vertices + edges_to)
+        if self._removed_edges:
+            removed_edges = np.array(list(self._removed_edges), dtype=np.int64)
+            keys = np.setdiff1d(keys, removed_edges[:, 0] * num_vertices + removed_edges[:, 1], assume_unique=True)
+            self._removed_edges = set()
+        edges_from = keys // num_vertices
+        edges_to = keys % num_vertices
+        self._edges_from = edges_from.tolist()
+        self._edges_to = edges_to.tolist()
+
+        num_vertices = len(self._actions)
+        self._succ_ptr = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges_from, minlength=num_vertices), out=self._succ_ptr[1:])
+        self._succ_idx = edges_to.astype(np.int32)
+
+        pred_order = np.argsort(edges_to, kind='stable')
+        self._pred_ptr = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges_to, minlength=num_vertices), out=self._pred_ptr[1:])
+        self._pred_idx = edges_from[pred_order].astype(np.int32)
+
+        self._adjacency_dirty = False
+
+    def _check_vertex(self, node_id: int) -> None:
+        if not 0 <= node_id < len(self._actions):
+            raise ValueError(f"Node with ID {node_id} not found.")
+
+    @property
+    def graph(self) -> nx.DiGraph:
+        if self._graph_cache is None:
+            self._ensure_adjacency()
+            graph = nx.DiGraph()
+            for node_id, action in enumerate(self._actions):
+                graph.add_node(node_id, action=action)
+            graph.add_edges_from(zip(self._edges_from, self._edges_to))
+            self._graph_cache = nx.freeze(graph)
+        return self._graph_cache
+
+    def num_vertices(self) -> int:
+        return len(self._actions)
+
+    def num_dependencies(self) -> int:
+        self._ensure_adjacency()
+        return len(self._succ_idx)
+
+    def add_action(self, action: Action) -> int:
+        node_id = len(self._actions)
+        action.related_vertex_id = node_id
+        self._actions.append(action)
+        self._invalidate()
+        return node_id
+
+    def add_dependency(self, action_vertex_id_from: int, action_vertex_id_to: int) -> None:
+        num_vertices = len(self._actions)
+        if 0 <= action_vertex_id_from < num_vertices and 0 <= action_vertex_id_to < num_vertices:
+            self._edges_from.append(action_vertex_id_from)
+            self._edges_to.append(action_vertex_id_to)
+            if self._edge_set is not None:
+                self._edge_set.add((action_vertex_id_from, action_vertex_id_to))
+                self._removed_edges.discard((action_vertex_id_from, action_vertex_id_to))
+            self._adjacency_dirty = True
+            self._graph_cache = None
+            self._add_reachability_dependency(action_vertex_id_from, action_vertex_id_to)
+        else:
+            raise ValueError("One or both action IDs not found in the graph.")
+
+    def add_dependencies_bulk(self, dependencies: np.ndarray) -> None:
+        dependencies = np.asarray(dependencies, dtype=np.int64).reshape(-1, 2)
+        if len(dependencies) and (dependencies.min() < 0 or dependencies.max() >= len(self._actions)):
+            raise ValueError("One or both action IDs not found in the graph.")
+        self._edges_from.extend(dependencies[:, 0].tolist())
+        self._edges_to.extend(dependencies[:, 1].tolist())
+        if self._edge_set is not None:
+            added_edges = set(map(tuple, dependencies.tolist()))
+            self._edge_set |= added_edges
+            self._removed_edges -= added_edges
+        self._invalidate()
+
+    def remove_dependency(self, action_vertex_id_from: int, action_vertex_id_to: int) -> None:
+        if self._edge_set is None:
+            self._ensure_adjacency()
+            self._edge_set = set(zip(self._edges_from, self._edges_to))
+        edge = (action_vertex_id_from, action_vertex_id_to)
+        if edge not in self._edge_set:
+            raise ValueError("Dependency not found in the graph.")
+        self._edge_set.remove(edge)
+        self._removed_edges.add(edge)
+        self._invalidate()
+
+    def get_action(self, node_id: int) -> Action:
+        if not 0 <= node_id < len(self._actions):
+            raise ValueError("Action not found for node ID.")
+        return self._actions[node_id]
+
+    def get_all_actions(self) -> List[Action]:
+        return list(self._actions)
+
+    def get_successors(self, node_id: int) -> List[int]:
+        self._check_vertex(node_id)
+        self._ensure_adjacency()
+        return self._succ_idx[self._succ_ptr[node_id]:self._succ_ptr[node_id + 1]].tolist()
+
+    def get_predecessors(self, node_id: int) -> List[int]:
+        self._check_vertex(node_id)
+        self._ensure_adjacency()
+        return self._pred_idx[self._pred_ptr[node_id]:self._pred_ptr[node_id + 1]].tolist()
+
+    def get_neighbors(self, node_id: int) -> List[int]:
+        return list(set(self.get_successors(node_id)).union(self.get_predecessors(node_id)))
+
+    def traverse_graph(self, start_id: int) -> List[int]:
+        self._check_vertex(start_id)
+        self._ensure_adjacency()
+        succ_ptr = self._succ_ptr.tolist()
+        succ_idx = self._succ_idx.tolist()
+
+        visited = bytearray(len(self._actions))
+        preorder = []
+        stack = [start_id]
+        while stack:
+            node_id = stack.pop()
+            if visited[node_id]:
+                continue
+            visited[node_id] = 1
+            preorder.append(node_id)
+            stack.extend(reversed(succ_idx[succ_ptr[node_id]:succ_ptr[node_id + 1]]))
+        return preorder
+
+    def _has_path(self, source_id: int, target_id: int) -> bool:
+        return target_id in self.traverse_graph(source_id)
+
+    def find_cycle(self) -> Optional[List[int]]:
+        dependencies = self.get_dependencies()
+        time_step_t = np.array([action.time_step_t for action in self._actions], dtype=np.int64)
+        return find_dependency_cycle(len(self._actions), dependencies[:, 0], dependencies[:, 1], time_step_t)
+
+    def get_dependencies(self) -> np.ndarray:
+        self._ensure_adjacency()
+        return np.column_stack((np.asarray(self._edges_from, dtype=np.int64),
+                                np.asarray(self._edges_to, dtype=np.int64))).reshape(-1, 2)
+
+    def copy_with_dependencies(self, dependencies: np.ndarray) -> 'ArrayADG':
+        adg = ArrayADG()
+        adg._actions = list(self._actions)
+        adg._edges_from = dependencies[:, 0].tolist()
+        adg._edges_to = dependencies[:, 1].tolist()
+        adg._invalidate()
+        return adg
+
+    def reverse_graph(self) -> 'ArrayADG':
+        self._ensure_adjacency()
+        reversed_graph = ArrayADG()
+        reversed_graph._actions = list(self._actions)
+        reversed_graph._edges_from = list(self._edges_to)
+        reversed_graph._edges_to = list(self._edges_from)
+        reversed_graph._invalidate()
+        return reversed_graph
@@ -1,16 +1,18 @@
-import bisect
-import copy
+import warnings
 from abc import abstractmethod, ABC
 from collections import defaultdict
 from dataclasses import dataclass
+from enum import Enum
 from typing import List, Optional, Tuple, Set
 
-import networkx
 from pydantic import BaseModel
 from ttictoc import tic, toc
 
 from src.adg.adg import ADG
+from src.adg.array_adg import ArrayADG
 from src.adg.dependency_creator_cpp_wrapper import DepCreationType, DependencyCreatorCpp, DepCreationResult
+from src.adg.dependency_creator_numpy import DependencyCreatorNumpy
+from src.adg.vertex_action import VertexAction
 from src.common.action import Action
 from src.common.resources import PATH_ROOT_DIR
 
@@ -25,13 +27,23 @@ def create_candidate_action_lookup(adg: ADG) -> defaultdict[Tuple[int, int], Lis
 
 class ADGCreationResult(BaseModel):
     elapsed_time: float = -1.0
+    marshalling_time: float = -1.0
     created_type2_dependencies: int = 0
 
 
+def load_dependency_creator():
+    try:
+        return DependencyCreatorCpp(PATH_ROOT_DIR)
+    except ImportError:
+        warnings.warn("The C++ dependency_creator extension is not built, falling back to the NumPy implementation.")
+        return DependencyCreatorNumpy()
+
+
 class Type2DepCreator(ABC):
 
-    def __init__(self):
-        self.dep_creator_cpp = DependencyCreatorCpp(PATH_ROOT_DIR)
+    def __init__(self, num_threads: int = 1):
+        self.dep_creator = load_dependency_creator()
+        self.num_threads = num_threads
 
     @abstractmethod
     def create_type2_dependencies(self, adg: ADG) -> ADGCreationResult:
@@ -42,60 +54,78 @@ class NaiveDepCreator(Type2DepCreator):
 
     def create_type2_dependencies(self, adg: ADG):
         all_actions = adg.get_all_actions()
-        result = self.dep_creator_cpp.get_type2_dependencies(all_actions, DepCreationType.EXHAUSTIVE)
-        for dep in result.dependencies:
-            adg.add_dependency(dep[0], dep[1])
+        result = self.dep_creator.get_type2_dependencies(all_actions, DepCreationType.EXHAUSTIVE,
+                                                         self.num_threads)
+        adg.add_dependencies_bulk(result.dependencies)
 
-        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, created_type2_dependencies=len(result.dependencies))
+        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, marshalling_time=result.marshalling_time,
+                                            created_type2_dependencies=len(result.dependencies))
         return creation_result
 
 class CandidatePartitioningDepCreator(Type2DepCreator):
     def create_type2_dependencies(self, adg: ADG):
         all_actions = adg.get_all_actions()
-        result = self.dep_creator_cpp.get_type2_dependencies(all_actions, DepCreationType.CP)
-        for dep in result.dependencies:
-            adg.add_dependency(dep[0], dep[1])
+        result = self.dep_creator.get_type2_dependencies(all_actions, DepCreationType.CP,
+                                                         self.num_threads)
+        adg.add_dependencies_bulk(result.dependencies)
 
-        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, created_type2_dependencies=len(result.dependencies))
+        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, marshalling_time=result.marshalling_time,
+                                            created_type2_dependencies=len(result.dependencies))
         return creation_result
 
 
 class SparseCandidatePartitioningDepCreator(Type2DepCreator):
 
-    @staticmethod
-    def find_rel_candidate(candidate_actions: List[Action], for_this_action: Action) -> Optional[Action]:
-        idx = bisect.bisect_right(candidate_actions, for_this_action) - 1
-        while idx >= 0:
-            candidate = candidate_actions[idx]
-            assert candidate.time_step_t <= for_this_action.time_step_t
-            if candidate.shuttle_R == for_this_action.shuttle_R:
-                idx -= 1
-                continue
+    def create_type2_dependencies(self, adg: ADG):
+        all_actions = adg.get_all_actions()
+        result = self.dep_creator.get_type2_dependencies(all_actions, DepCreationType.SCP,
+                                                         self.num_threads)
+        adg.add_dependencies_bulk(result.dependencies)
+
+        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, marshalling_time=result.marshalling_time,
+                                            created_type2_dependencies=len(result.dependencies))
+        return creation_result
+
 
-            return candidate
-        return None
+class DenseSparseCandidatePartitioningDepCreator(Type2DepCreator):
+    # SCP over a grid-dense candidate index (linearized start cell, CSR layout) instead of a hash map.
 
     def create_type2_dependencies(self, adg: ADG):
         all_actions = adg.get_all_actions()
-        result = self.dep_creator_cpp.get_type2_dependencies(all_actions, DepCreationType.SCP)
-        for dep in result.dependencies:
-            adg.add_dependency(dep[0], dep[1])
+        result = self.dep_creator.get_type2_dependencies(all_actions, DepCreationType.SCP_DENSE,
+                                                         self.num_threads)
+        adg.add_dependencies_bulk(result.dependencies)
 
-        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, created_type2_dependencies=len(result.dependencies))
+        creation_result = ADGCreationResult(elapsed_time=result.elapsed_time, marshalling_time=result.marshalling_time,
+                                            created_type2_dependencies=len(result.dependencies))
         return creation_result
 
 
+class ADGBackend(Enum):
+    NETWORKX = 1
+    ARRAY = 2
+
+
+def new_adg(adg_backend: ADGBackend) -> ADG:
+    match adg_backend:
+        case ADGBackend.NETWORKX:
+            return ADG()
+        case ADGBackend.ARRAY:
+            return ArrayADG()
+
+
 class ADGBuilder:
 
-    def create_adg(self, all_actions: List[Action], skip_wait_actions=False) -> 'ADGBuilder':
-        self.adg = ADG()
+    def create_adg(self, all_actions: List[Action], skip_wait_actions=False,
+                   adg_backend: ADGBackend = ADGBackend.NETWORKX) -> 'ADGBuilder':
+        self.adg = new_adg(adg_backend)
 
         actions_per_robot = defaultdict(list)
-        all_actions_copied = copy.deepcopy(all_actions)
-        for action in all_actions_copied:
+        for action in all_actions:
             if action.start_s == action.goal_g and skip_wait_actions:
                 continue
-            actions_per_robot[action.shuttle_R].append(action)
+            # The plan actions are shared, only the per-vertex state belongs to this ADG.
+            actions_per_robot[action.shuttle_R].append(VertexAction(action))
 
         for actions_per_robot in actions_per_robot.values():
             for i in range(len(actions_per_robot)):
@@ -110,9 +140,12 @@ class ADGBuilder:
         return self.adg
 
     def build(self, all_actions: List[Action], type2_dep_creator: Type2DepCreator = NaiveDepCreator(),
-              skip_wait_actions=False) -> ADG:
-        self.create_adg(all_actions, skip_wait_actions=skip_wait_actions)
+              skip_wait_actions=False, adg_backend: ADGBackend = ADGBackend.NETWORKX) -> ADG:
+        self.create_adg(all_actions, skip_wait_actions=skip_wait_actions, adg_backend=adg_backend)
         type2_dep_creator.create_type2_dependencies(self.adg)
-        if not networkx.is_directed_acyclic_graph(self.adg.graph):
-            raise ValueError("ADG contains a Cycle!")
+        cycle = self.adg.find_cycle()
+        if cycle is not None:
+            cycle_actions = [self.adg.get_action(vertex_id) for vertex_id in cycle]
+            witness = " -> ".join(f"{action.shuttle_R}@{action.time_step_t}" for action in cycle_actions)
+            raise ValueError(f"ADG contains a Cycle! (shuttle@time_step: {witness})")
         return self.get_adg()
@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.adg.transitive_reduction import peel_sinks
+
+
+def find_dependency_cycle(num_vertices: int, edges_from: np.ndarray, edges_to: np.ndarray,
+                          time_step_t: Optional[np.ndarray] = None) -> Optional[List[int]]:
+    # Returns the vertices of one cycle in dependency order, or None for a DAG. Without dependencies going
+    # backwards in time, a cycle cannot contain a dependency that goes forward, so only the equal-time
+    # dependencies have to be checked.
+    if time_step_t is not None:
+        time_from, time_to = time_step_t[edges_from], time_step_t[edges_to]
+        if not np.any(time_from > time_to):
+            same_time = time_from == time_to
+            edges_from, edges_to = edges_from[same_time], edges_to[same_time]
+    if len(edges_from) == 0:
+        return None
+
+    on_or_before_cycle = peel_sinks(num_vertices, edges_from, edges_to) < 0
+    if not on_or_before_cycle.any():
+        return None
+
+    # Each remaining vertex has a successor that remains, following them from any of them runs into a cycle.
+    remaining_edges = on_or_before_cycle[edges_from] & on_or_before_cycle[edges_to]
+    next_vertex = np.full(num_vertices, -1, dtype=np.int64)
+    next_vertex[edges_from[remaining_edges]] = edges_to[remaining_edges]
+    walk_position = {}
+    vertex = int(np.flatnonzero(on_or_before_cycle)[0])
+    walk = []
+    while vertex not in walk_position:
+        walk_position[vertex] = len(walk)
+        walk.append(vertex)
+        vertex = int(next_vertex[vertex])
+    return walk[walk_position[vertex]:]
@@ -3,8 +3,9 @@ import sys
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Tuple, List
+from typing import List
 
+import numpy as np
 from ttictoc import tic, toc
 
 from src.common.action import Action
@@ -14,12 +15,37 @@ class DepCreationType(Enum):
     EXHAUSTIVE = 1
     CP = 2
     SCP = 3
+    SCP_DENSE = 4
 
 
 @dataclass
 class DepCreationResult:
-    dependencies: List[Tuple[int, int]]
+    # (E, 2) int32 array of (from, to) vertex ids
+    dependencies: np.ndarray
     elapsed_time: float
+    marshalling_time: float = 0.0
+
+
+@dataclass
+class ActionColumns:
+    start_x: np.ndarray
+    start_y: np.ndarray
+    goal_x: np.ndarray
+    goal_y: np.ndarray
+    time_step_t: np.ndarray
+    shuttle_R: np.ndarray
+    related_vertex_id: np.ndarray
+
+    @staticmethod
+    def from_actions(actions: List[Action]) -> 'ActionColumns':
+        rows = np.fromiter(((action.start_s[0], action.start_s[1], action.goal_g[0], action.goal_g[1],
+                             action.time_step_t, action.shuttle_R, action.related_vertex_id) for action in actions),
+                           dtype=np.dtype((np.int32, 7)), count=len(actions))
+        return ActionColumns(*np.ascontiguousarray(rows.T))
+
+    def as_tuple(self):
+        return (self.start_x, self.start_y, self.goal_x, self.goal_y,
+                self.time_step_t, self.shuttle_R, self.related_vertex_id)
 
 
 class DependencyCreatorCpp:
@@ -34,10 +60,6 @@ class DependencyCreatorCpp:
     def hello_from_cpp(self) -> str:
         return self.dep_creator_cpp.hello_from_cpp()
 
-    def _create_action(self, start_s: Tuple[int, int], goal_g: Tuple[int, int],
-                       time_step_t: int, shuttle_R: int, related_vertex_id: int):
-        return self.dep_creator_cpp.Action(start_s, goal_g, time_step_t, shuttle_R, related_vertex_id)
-
     def _enum_correspondence(self, dep_creation_type: DepCreationType) -> Enum:
         match dep_creation_type:
             case DepCreationType.EXHAUSTIVE:
@@ -46,12 +68,26 @@ class DependencyCreatorCpp:
                 return self.dep_creator_cpp.DepCreationMethod.CP
             case DepCreationType.SCP:
                 return self.dep_creator_cpp.DepCreationMethod.SCP
+            case DepCreationType.SCP_DENSE:
+                return self.dep_creator_cpp.DepCreationMethod.SCP_DENSE
 
-    def get_type2_dependencies(self, actions: List[Action], dep_creation_type: DepCreationType) -> DepCreationResult:
-        cpp_actions = [self._create_action(action.start_s, action.goal_g, action.time_step_t, action.shuttle_R,
-                                           action.related_vertex_id) for action in actions]
+    # num_threads <= 0 uses all hardware threads, the GIL is released while the dependencies are created.
+    def get_type2_dependencies_from_columns(self, columns: ActionColumns, dep_creation_type: DepCreationType,
+                                            num_threads: int = 1) -> DepCreationResult:
         creation_method = self._enum_correspondence(dep_creation_type)
+        # elapsed_time is measured around the algorithm in C++. marshalling_time includes the C++-side copy of the
+        # columns into a vector of actions and of the dependencies into the result array.
+        tic()
+        deps, elapsed = self.dep_creator_cpp.create_type2_dependencies_columnar(*columns.as_tuple(), creation_method,
+                                                                                num_threads)
+        total = toc()
+        return DepCreationResult(deps, elapsed, marshalling_time=max(total - elapsed, 0.0))
+
+    def get_type2_dependencies(self, actions: List[Action], dep_creation_type: DepCreationType,
+                               num_threads: int = 1) -> DepCreationResult:
         tic()
-        deps = self.dep_creator_cpp.create_type2_dependencies(cpp_actions, creation_method)
-        elapsed = toc()
-        return DepCreationResult(deps, elapsed)
+        columns = ActionColumns.from_actions(actions)
+        marshalling_time = toc()
+        result = self.get_type2_dependencies_from_columns(columns, dep_creation_type, num_threads)
+        result.marshalling_time += marshalling_time
+        return result
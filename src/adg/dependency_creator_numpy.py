@@ -0,0 +1,83 @@
+from typing import List, Tuple
+
+import numpy as np
+from ttictoc import tic, toc
+
+from src.adg.dependency_creator_cpp_wrapper import DepCreationType, DepCreationResult, ActionColumns
+from src.common.action import Action
+
+
+class DependencyCreatorNumpy:
+    # Vectorized fallback for the compiled dependency_creator module. Actions are lexsorted by
+    # (start cell, time step) and every action's (goal cell, time step) key is searched in that
+    # order, which yields all relevant candidates of all actions in one batch.
+
+    @staticmethod
+    def _sorted_candidates(columns: ActionColumns) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        min_x = min(columns.start_x.min(), columns.goal_x.min())
+        min_y = min(columns.start_y.min(), columns.goal_y.min())
+        width = max(columns.start_y.max(), columns.goal_y.max()) - min_y + 1
+        start_cell = (columns.start_x - min_x).astype(np.int64) * width + (columns.start_y - min_y)
+        goal_cell = (columns.goal_x - min_x).astype(np.int64) * width + (columns.goal_y - min_y)
+
+        min_t = columns.time_step_t.min()
+        num_time_steps = columns.time_step_t.max() - min_t + 1
+        time_offset = (columns.time_step_t - min_t).astype(np.int64)
+
+        order = np.lexsort((columns.time_step_t, start_cell))
+        candidate_keys = (start_cell * num_time_steps + time_offset)[order]
+        query_keys = goal_cell * num_time_steps + time_offset
+        cell_start_keys = goal_cell * num_time_steps
+        return order, candidate_keys, query_keys, cell_start_keys
+
+    @staticmethod
+    def _cp_dependencies(columns: ActionColumns) -> np.ndarray:
+        order, candidate_keys, query_keys, cell_start_keys = DependencyCreatorNumpy._sorted_candidates(columns)
+        first = np.searchsorted(candidate_keys, cell_start_keys, side='left')
+        last = np.searchsorted(candidate_keys, query_keys, side='right')
+        counts = last - first
+
+        actions = np.repeat(np.arange(len(counts)), counts)
+        group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = order[np.repeat(first, counts) + np.arange(len(actions)) - group_starts]
+
+        other_shuttle = columns.shuttle_R[candidates] != columns.shuttle_R[actions]
+        return np.stack((columns.related_vertex_id[candidates[other_shuttle]],
+                         columns.related_vertex_id[actions[other_shuttle]]), axis=1)
+
+    @staticmethod
+    def _scp_dependencies(columns: ActionColumns) -> np.ndarray:
+        order, candidate_keys, query_keys, cell_start_keys = DependencyCreatorNumpy._sorted_candidates(columns)
+        # Latest candidate in the goal cell that starts no later than the action, as in find_rel_candidate.
+        position = np.searchsorted(candidate_keys, query_keys, side='right') - 1
+        has_candidate = position >= 0
+        has_candidate[has_candidate] = candidate_keys[position[has_candidate]] >= cell_start_keys[has_candidate]
+
+        actions = np.flatnonzero(has_candidate)
+        candidates = order[position[has_candidate]]
+        other_shuttle = columns.shuttle_R[candidates] != columns.shuttle_R[actions]
+        return np.stack((columns.related_vertex_id[candidates[other_shuttle]],
+                         columns.related_vertex_id[actions[other_shuttle]]), axis=1)
+
+    # num_threads is accepted for interface parity with DependencyCreatorCpp and ignored.
+    def get_type2_dependencies_from_columns(self, columns: ActionColumns, dep_creation_type: DepCreationType,
+                                            num_threads: int = 1) -> DepCreationResult:
+        tic()
+        if len(columns.start_x) == 0:
+            deps = np.zeros((0, 2), dtype=np.int32)
+        elif dep_creation_type in (DepCreationType.EXHAUSTIVE, DepCreationType.CP):
+            # The exhaustive search creates the same dependency set as CP, only slower.
+            deps = self._cp_dependencies(columns)
+        else:
+            deps = self._scp_dependencies(columns)
+        elapsed = toc()
+        return DepCreationResult(deps.astype(np.int32, copy=False), elapsed)
+
+    def get_type2_dependencies(self, actions: List[Action], dep_creation_type: DepCreationType,
+                               num_threads: int = 1) -> DepCreationResult:
+        tic()
+        columns = ActionColumns.from_actions(actions)
+        marshalling_time = toc()
+        result = self.get_type2_dependencies_from_columns(columns, dep_creation_type, num_threads)
+        result.marshalling_time = marshalling_time
+        return result
@@ -0,0 +1,76 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from src.adg.adg import ADG
+from src.adg.create_adg import ADGBackend, new_adg
+from src.adg.vertex_action import VertexAction
+from src.common.action import Action
+
+
+class IncrementalADGBuilder:
+    # Builds the same ADG as ADGBuilder().build(..., SparseCandidatePartitioningDepCreator()) from actions that
+    # are appended over time (rolling horizon). Per cell it keeps the actions starting there ("visitors") and
+    # the actions ending there, both ordered by time step. The SCP candidate of an action is the latest visitor
+    # of its goal cell that is not later than the action itself, so an appended action only creates its own
+    # type-2 dependency and re-targets the dependencies of actions that arrive at its start cell between its
+    # time step and the next visitor. With appends in time order the second part never finds any action.
+
+    def __init__(self, skip_wait_actions=False, adg_backend: ADGBackend = ADGBackend.NETWORKX):
+        self.adg = new_adg(adg_backend)
+        self.skip_wait_actions = skip_wait_actions
+        self.last_action_per_shuttle: Dict[int, Action] = {}
+        self.visitors: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
+        self.arrivals: Dict[Tuple[int, int], List[Tuple[int, int]]] = defaultdict(list)
+        self.candidate_of: Dict[int, int] = {}
+
+    def _set_candidate(self, action: Action, candidate: Action) -> None:
+        old_candidate_id = self.candidate_of.get(action.related_vertex_id)
+        if old_candidate_id is not None:
+            if self.adg.get_action(old_candidate_id).shuttle_R != action.shuttle_R:
+                self.adg.remove_dependency(old_candidate_id, action.related_vertex_id)
+
+        self.candidate_of[action.related_vertex_id] = candidate.related_vertex_id
+        if candidate.shuttle_R != action.shuttle_R:
+            self.adg.add_dependency(candidate.related_vertex_id, action.related_vertex_id)
+
+    def append_action(self, action: Action) -> None:
+        if action.start_s == action.goal_g and self.skip_wait_actions:
+            return
+
+        previous_action = self.last_action_per_shuttle.get(action.shuttle_R)
+        if previous_action is not None and previous_action.time_step_t >= action.time_step_t:
+            raise ValueError(f"Actions of shuttle {action.shuttle_R} must be appended in time order.")
+
+        action = VertexAction(action)
+        vertex_id = self.adg.add_action(action)
+        if previous_action is not None:
+            self.adg.add_dependency(previous_action.related_vertex_id, vertex_id)
+        self.last_action_per_shuttle[action.shuttle_R] = action
+
+        visitors = self.visitors[action.start_s]
+        visitor_idx = bisect.bisect_left(visitors, (action.time_step_t, vertex_id))
+        visitors.insert(visitor_idx, (action.time_step_t, vertex_id))
+
+        # Actions arriving at this cell between this and the next visitor now have this action as candidate.
+        next_visitor_t = visitors[visitor_idx + 1][0] if visitor_idx + 1 < len(visitors) else None
+        arrivals = self.arrivals[action.start_s]
+        for arrival_idx in range(bisect.bisect_left(arrivals, (action.time_step_t, -1)), len(arrivals)):
+            arrival_t, arrival_id = arrivals[arrival_idx]
+            if next_visitor_t is not None and arrival_t >= next_visitor_t:
+                break
+            self._set_candidate(self.adg.get_action(arrival_id), action)
+
+        goal_visitors = self.visitors[action.goal_g]
+        candidate_idx = bisect.bisect_right(goal_visitors, (action.time_step_t, float('inf'))) - 1
+        if candidate_idx >= 0:
+            self._set_candidate(action, self.adg.get_action(goal_visitors[candidate_idx][1]))
+        bisect.insort(self.arrivals[action.goal_g], (action.time_step_t, vertex_id))
+
+    def append_actions(self, actions: List[Action]) -> 'IncrementalADGBuilder':
+        for action in sorted(actions, key=lambda a: a.time_step_t):
+            self.append_action(action)
+        return self
+
+    def get_adg(self) -> ADG:
+        return self.adg
@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.adg.transitive_reduction import (REDUCTION_BLOCK_ELEMENTS, UNREACHABLE, HeightOrderedDependencies,
+                                          shuttle_chains)
+from src.common.action import Action
+
+# Up to this many (V, shuttles) entries the index is a dense matrix, above it the compressed per-chain layout.
+DENSE_REACHABILITY_ELEMENTS = 2 ** 22
+# A compressed index is rebuilt once this many dependencies were added to it.
+MAX_PENDING_DEPENDENCIES = 32
+
+
+@dataclass
+class ChainDependencies:
+    # Dependencies of an acyclic ADG whose actions of each shuttle form a chain of type-1 dependencies.
+    shuttle_idx: np.ndarray
+    chain_position: np.ndarray
+    edges_from: np.ndarray
+    edges_to: np.ndarray
+    ordered: HeightOrderedDependencies
+
+    @staticmethod
+    def from_dependencies(actions: List[Action], dependencies: np.ndarray) -> Optional['ChainDependencies']:
+        # The actions are ordered by vertex id, as returned by ADG.get_all_actions. Returns None if the
+        # chains are incomplete or the ADG has a cycle.
+        edges_from, edges_to = dependencies[:, 0].astype(np.int64), dependencies[:, 1].astype(np.int64)
+        num_vertices = len(actions)
+        shuttle_idx, chain_position = shuttle_chains(actions)
+
+        chain_order = np.lexsort((chain_position, shuttle_idx))
+        chain_links = (shuttle_idx[chain_order[1:]] == shuttle_idx[chain_order[:-1]])
+        chain_keys = chain_order[:-1][chain_links] * num_vertices + chain_order[1:][chain_links]
+        if not np.isin(chain_keys, edges_from * num_vertices + edges_to).all():
+            return None
+        try:
+            ordered = HeightOrderedDependencies.from_dependencies(num_vertices, edges_from, edges_to)
+        except ValueError:
+            return None
+        return ChainDependencies(shuttle_idx, chain_position, edges_from, edges_to, ordered)
+
+    def num_vertices(self) -> int:
+        return len(self.shuttle_idx)
+
+    def num_shuttles(self) -> int:
+        return int(self.shuttle_idx.max()) + 1 if self.num_vertices() else 0
+
+
+class ChainReachabilityIndex:
+    # earliest[v, s] is the first position in the chain of shuttle s that vertex v reaches, or UNREACHABLE.
+    # This only describes reachability while the actions of each shuttle form a chain of type-1 dependencies,
+    # from_dependencies returns None otherwise. A dense (V, shuttles) int32 matrix for small ADGs, see
+    # CompressedChainReachabilityIndex for large ones. Built in one pass over the vertex heights and kept up
+    # to date when dependencies are added.
+
+    def __init__(self, shuttle_idx: np.ndarray, chain_position: np.ndarray, earliest: np.ndarray,
+                 predecessors: List[List[int]]):
+        self.shuttle_idx = shuttle_idx
+        self.chain_position = chain_position
+        self.earliest = earliest
+        self.predecessors = predecessors
+
+    @staticmethod
+    def from_dependencies(actions: List[Action], dependencies: np.ndarray) -> Optional['ChainReachabilityIndex']:
+        chains = ChainDependencies.from_dependencies(actions, dependencies)
+        return ChainReachabilityIndex.from_chains(chains) if chains is not None else None
+
+    @staticmethod
+    def from_chains(chains: ChainDependencies) -> 'ChainReachabilityIndex':
+        earliest = chains.ordered.earliest_reachable_positions(chains.shuttle_idx, chains.chain_position,
+                                                               slice(0, chains.num_shuttles()))
+        predecessors = [[] for _ in range(chains.num_vertices())]
+        for vertex_from, vertex_to in zip(chains.edges_from.tolist(), chains.edges_to.tolist()):
+            predecessors[vertex_to].append(vertex_from)
+        return ChainReachabilityIndex(chains.shuttle_idx, chains.chain_position, earliest, predecessors)
+
+    def is_reachable(self, source_id: int, target_id: int) -> bool:
+        return bool(self.earliest[source_id, self.shuttle_idx[target_id]] <= self.chain_position[target_id])
+
+    def add_dependency(self, source_id: int, target_id: int) -> bool:
+        # Returns False if the dependency closes a cycle, the index is not valid anymore then.
+        if self.is_reachable(target_id, source_id):
+            return False
+        self.predecessors[target_id].append(source_id)
+
+        # Only the ancestors of the source whose vectors improve are updated. The vectors of their
+        # predecessors are at most as large, so the search stops at the first vertex that does not improve.
+        reach = self.earliest[target_id]
+        frontier = np.array([source_id])
+        while len(frontier):
+            rows = self.earliest[frontier]
+            improved = (reach < rows).any(axis=1)
+            frontier = frontier[improved]
+            self.earliest[frontier] = np.minimum(rows[improved], reach)
+            frontier = np.unique([predecessor for vertex in frontier.tolist()
+                                  for predecessor in self.predecessors[vertex]]).astype(np.int64)
+        return True
+
+
+class CompressedChainReachabilityIndex:
+    # The earliest vectors of ChainReachabilityIndex stored per shuttle chain. A vertex reaches everything
+    # its chain successor reaches, so along a chain the vectors only decrease towards its start. For every
+    # (chain, shuttle) pair only the chain positions where the entry changes are kept, sorted by position in
+    # change_keys = (chain * shuttles + shuttle) * chain_length + position, with the new entry in
+    # change_values. A query is a binary search for the first change at or after the source. The own chain of
+    # a vertex is answered from the chain positions.
+    # Dependencies added later are kept in pending and searched on top of the index, until it is rebuilt.
+
+    def __init__(self, chains: ChainDependencies):
+        self.shuttle_idx = chains.shuttle_idx
+        self.chain_position = chains.chain_position
+        self.edges_from = chains.edges_from
+        self.edges_to = chains.edges_to
+        self.num_shuttles = chains.num_shuttles()
+        self.chain_length = int(chains.chain_position.max()) + 1 if chains.num_vertices() else 1
+        self.pending: List[Tuple[int, int]] = []
+        self.change_keys, self.change_values = self._chain_changes(chains.ordered)
+
+    @staticmethod
+    def from_dependencies(actions: List[Action],
+                          dependencies: np.ndarray) -> Optional['CompressedChainReachabilityIndex']:
+        chains = ChainDependencies.from_dependencies(actions, dependencies)
+        return CompressedChainReachabilityIndex(chains) if chains is not None else None
+
+    def _chain_changes(self, ordered: HeightOrderedDependencies) -> Tuple[np.ndarray, np.ndarray]:
+        num_vertices = len(self.shuttle_idx)
+        chain_order = np.lexsort((self.chain_position, self.shuttle_idx))
+        chain_shuttles = self.shuttle_idx[chain_order]
+        chain_positions = self.chain_position[chain_order]
+        # Rows in chain order that are followed by the row of their chain successor.
+        linked = np.flatnonzero(chain_shuttles[1:] == chain_shuttles[:-1])
+
+        # The (V, shuttles in block) vectors are computed for a block of shuttles at a time.
+        block_size = int(max(1, min(self.num_shuttles, REDUCTION_BLOCK_ELEMENTS // max(num_vertices, 1))))
+        change_keys, change_values = [], []
+        for first_shuttle in range(0, self.num_shuttles, block_size):
+            block = slice(first_shuttle, min(first_shuttle + block_size, self.num_shuttles))
+            rows = ordered.earliest_reachable_positions(self.shuttle_idx, self.chain_position, block)[chain_order]
+            own_rows = np.flatnonzero((chain_shuttles >= block.start) & (chain_shuttles < block.stop))
+            rows[own_rows, chain_shuttles[own_rows] - block.start] = UNREACHABLE
+
+            changed = rows != UNREACHABLE
+            changed[linked] = rows[linked] != rows[linked + 1]
+            row_idx, column_idx = np.nonzero(changed)
+            change_keys.append((chain_shuttles[row_idx].astype(np.int64) * self.num_shuttles + block.start
+                                + column_idx) * self.chain_length + chain_positions[row_idx])
+            change_values.append(rows[row_idx, column_idx])
+
+        change_keys = np.concatenate(change_keys) if change_keys else np.zeros(0, dtype=np.int64)
+        change_values = np.concatenate(change_values) if change_values else np.zeros(0, dtype=np.int32)
+        key_order = np.argsort(change_keys, kind='stable')
+        return change_keys[key_order], change_values[key_order]
+
+    def _rebuild(self) -> None:
+        pending_from, pending_to = np.array(self.pending, dtype=np.int64).reshape(-1, 2).T
+        self.edges_from = np.concatenate((self.edges_from, pending_from))
+        self.edges_to = np.concatenate((self.edges_to, pending_to))
+        self.pending = []
+        ordered = HeightOrderedDependencies.from_dependencies(len(self.shuttle_idx), self.edges_from, self.edges_to)
+        self.change_keys, self.change_values = self._chain_changes(ordered)
+
+    def _is_reachable_indexed(self, source_id: int, target_id: int) -> bool:
+        source_shuttle, target_shuttle = int(self.shuttle_idx[source_id]), int(self.shuttle_idx[target_id])
+        if source_shuttle == target_shuttle:
+            return bool(self.chain_position[source_id] <= self.chain_position[target_id])
+        pair_key = source_shuttle * self.num_shuttles + target_shuttle
+        change = int(np.searchsorted(self.change_keys, pair_key * self.chain_length
+                                     + int(self.chain_position[source_id])))
+        return (change < len(self.change_keys) and int(self.change_keys[change]) // self.chain_length == pair_key
+                and bool(self.change_values[change] <= self.chain_position[target_id]))
+
+    def is_reachable(self, source_id: int, target_id: int) -> bool:
+        if self._is_reachable_indexed(source_id, target_id):
+            return True
+        # Otherwise a path has to use pending dependencies, they are searched breadth first.
+        frontier = [source_id]
+        open_dependencies = self.pending
+        while frontier and open_dependencies:
+            reached = [any(self._is_reachable_indexed(vertex_id, dependency_from) for vertex_id in frontier)
+                       for dependency_from, _ in open_dependencies]
+            frontier = [dependency_to for (_, dependency_to), is_reached in zip(open_dependencies, reached)
+                        if is_reached]
+            if any(self._is_reachable_indexed(vertex_id, target_id) for vertex_id in frontier):
+                return True
+            open_dependencies = [dependency for dependency, is_reached in zip(open_dependencies, reached)
+                                 if not is_reached]
+        return False
+
+    def add_dependency(self, source_id: int, target_id: int) -> bool:
+        # Returns False if the dependency closes a cycle, the index is not valid anymore then.
+        if self.is_reachable(target_id, source_id):
+            return False
+        if not self._is_reachable_indexed(source_id, target_id):
+            self.pending.append((source_id, target_id))
+            if len(self.pending) >= MAX_PENDING_DEPENDENCIES:
+                self._rebuild()
+        return True
+
+
+def chain_reachability_index(actions: List[Action], dependencies: np.ndarray) -> Optional[
+        Union[ChainReachabilityIndex, CompressedChainReachabilityIndex]]:
+    chains = ChainDependencies.from_dependencies(actions, dependencies)
+    if chains is None:
+        return None
+    if chains.num_vertices() * chains.num_shuttles() <= DENSE_REACHABILITY_ELEMENTS:
+        return ChainReachabilityIndex.from_chains(chains)
+    return CompressedChainReachabilityIndex(chains)
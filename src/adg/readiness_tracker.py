@@ -0,0 +1,77 @@
+from collections import deque
+from typing import List
+
+from src.adg.adg import ADG
+from src.common.action import Action, STATUS_CODE_COMPLETED, STATUS_CODE_ENQUEUED, STATUS_CODE_PENDING
+
+
+class ReadinessTracker:
+    # Incremental replacement for ADG.enqueue_actions_bfs. Every vertex counts its same-shuttle (type-1)
+    # predecessors that are still PENDING and its cross-shuttle (type-2) predecessors that are not yet
+    # COMPLETED. A status change only touches the out-edges of the changed vertex, and a vertex whose
+    # counters both drop to zero is pushed onto the ready queue exactly once.
+
+    def __init__(self, adg: ADG):
+        self.adg = adg
+        # Indexed by vertex id.
+        all_actions = adg.get_all_actions()
+        self.pending_type1_predecessors: List[int] = [0] * len(all_actions)
+        self.unsatisfied_type2_predecessors: List[int] = [0] * len(all_actions)
+        self.type1_successors: List[List[Action]] = [[] for _ in all_actions]
+        self.type2_successors: List[List[Action]] = [[] for _ in all_actions]
+        self.ready_actions = deque()
+
+        for action in all_actions:
+            for successor_id in adg.get_successors(action.related_vertex_id):
+                successor = adg.get_action(successor_id)
+                if successor.shuttle_R == action.shuttle_R:
+                    self.type1_successors[action.related_vertex_id].append(successor)
+                    if action.status_code == STATUS_CODE_PENDING:
+                        self.pending_type1_predecessors[successor.related_vertex_id] += 1
+                else:
+                    self.type2_successors[action.related_vertex_id].append(successor)
+                    if action.status_code != STATUS_CODE_COMPLETED:
+                        self.unsatisfied_type2_predecessors[successor.related_vertex_id] += 1
+
+        for action in all_actions:
+            self._push_if_ready(action)
+
+    def _push_if_ready(self, action: Action) -> None:
+        vertex_id = action.related_vertex_id
+        if (action.status_code == STATUS_CODE_PENDING and self.pending_type1_predecessors[vertex_id] == 0
+                and self.unsatisfied_type2_predecessors[vertex_id] == 0):
+            self.ready_actions.append(action)
+
+    def is_action_equable(self, action: Action) -> bool:
+        vertex_id = action.related_vertex_id
+        return (action.status_code == STATUS_CODE_PENDING and self.pending_type1_predecessors[vertex_id] == 0
+                and self.unsatisfied_type2_predecessors[vertex_id] == 0)
+
+    def mark_completed(self, action: Action) -> None:
+        if action.status_code != STATUS_CODE_ENQUEUED:
+            raise ValueError(f"Action {action} is not in ENQUEUED status.")
+        action.move_status_forward()
+
+        for successor in self.type2_successors[action.related_vertex_id]:
+            self.unsatisfied_type2_predecessors[successor.related_vertex_id] -= 1
+            self._push_if_ready(successor)
+
+    def enqueue_ready_actions(self) -> List[Action]:
+        # Drains every ready action, not only the ones freed by the latest completion. Completions at the same
+        # instant are therefore drained together by whichever caller runs first, while ADG.enqueue_actions_bfs
+        # enqueues the actions freed by each completion separately.
+        enqueued_actions = []
+        while self.ready_actions:
+            action = self.ready_actions.popleft()
+            action.move_status_forward()
+            enqueued_actions.append(action)
+
+            for successor in self.type1_successors[action.related_vertex_id]:
+                self.pending_type1_predecessors[successor.related_vertex_id] -= 1
+                self._push_if_ready(successor)
+
+        return enqueued_actions
+
+    def complete_action(self, action: Action) -> List[Action]:
+        self.mark_completed(action)
+        return self.enqueue_ready_actions()
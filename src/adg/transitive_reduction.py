@@ -0,0 +1,148 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from src.common.action import Action
+
+# Upper bound of the (edges, shuttles) reachability entries held at once.
+REDUCTION_BLOCK_ELEMENTS = 2 ** 24
+
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+def _segment_gather(ptr: np.ndarray, values: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+    # values[ptr[v]:ptr[v + 1]] of all the vertices, concatenated.
+    starts = ptr[vertices]
+    counts = ptr[vertices + 1] - starts
+    return values[np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+
+
+def peel_sinks(num_vertices: int, edges_from: np.ndarray, edges_to: np.ndarray) -> np.ndarray:
+    # Length of the longest path from every vertex to a sink, by peeling off the sinks level by level (Kahn's
+    # algorithm on the reversed graph). Vertices on a cycle or with a path into one keep the height -1.
+    pred_order = np.argsort(edges_to, kind='stable')
+    pred_ptr = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges_to, minlength=num_vertices), out=pred_ptr[1:])
+    predecessors = edges_from[pred_order]
+
+    open_successors = np.bincount(edges_from, minlength=num_vertices)
+    heights = np.full(num_vertices, -1, dtype=np.int64)
+    frontier = np.flatnonzero(open_successors == 0)
+    height = 0
+    while len(frontier):
+        heights[frontier] = height
+        frontier_predecessors = _segment_gather(pred_ptr, predecessors, frontier)
+        np.subtract.at(open_successors, frontier_predecessors, 1)
+        frontier = np.unique(frontier_predecessors[open_successors[frontier_predecessors] == 0])
+        height += 1
+    return heights
+
+
+def vertex_heights(num_vertices: int, edges_from: np.ndarray, edges_to: np.ndarray) -> np.ndarray:
+    heights = peel_sinks(num_vertices, edges_from, edges_to)
+    if np.any(heights < 0):
+        raise ValueError("Transitive reduction is only defined for directed acyclic graphs (DAGs).")
+    return heights
+
+
+def shuttle_chains(actions: List[Action]) -> Tuple[np.ndarray, np.ndarray]:
+    # Dense shuttle index of every action and its position in the time ordered chain of its shuttle.
+    _, shuttle_idx = np.unique([action.shuttle_R for action in actions], return_inverse=True)
+    shuttle_idx = shuttle_idx.reshape(-1)
+    time_step_t = np.array([action.time_step_t for action in actions], dtype=np.int64)
+    chain_order = np.lexsort((time_step_t, shuttle_idx))
+    chain_starts = np.searchsorted(shuttle_idx[chain_order], np.arange(shuttle_idx.max() + 1 if len(actions) else 0))
+    chain_position = np.empty(len(actions), dtype=np.int32)
+    chain_position[chain_order] = np.arange(len(actions)) - chain_starts[shuttle_idx[chain_order]]
+    return shuttle_idx, chain_position
+
+
+@dataclass
+class HeightOrderedDependencies:
+    # Dependencies sorted by the height of their source, so the sources of each height and their
+    # dependencies are consecutive.
+    num_vertices: int
+    edge_order: np.ndarray
+    edges_from: np.ndarray
+    edges_to: np.ndarray
+    segment_starts: np.ndarray
+    sources: np.ndarray
+    source_of_edge: np.ndarray
+    height_starts: np.ndarray
+
+    @staticmethod
+    def from_dependencies(num_vertices: int, edges_from: np.ndarray,
+                          edges_to: np.ndarray) -> 'HeightOrderedDependencies':
+        heights = vertex_heights(num_vertices, edges_from, edges_to)
+        edge_order = np.lexsort((edges_to, edges_from, heights[edges_from]))
+        edges_from = edges_from[edge_order]
+        edges_to = edges_to[edge_order]
+        is_first_edge = np.ones(len(edges_from), dtype=bool)
+        is_first_edge[1:] = edges_from[1:] != edges_from[:-1]
+        segment_starts = np.flatnonzero(is_first_edge)
+        sources = edges_from[segment_starts]
+        source_heights = heights[sources]
+        height_starts = np.searchsorted(source_heights, np.arange(source_heights.max(initial=0) + 2))
+        return HeightOrderedDependencies(num_vertices=num_vertices, edge_order=edge_order, edges_from=edges_from,
+                                         edges_to=edges_to, segment_starts=segment_starts, sources=sources,
+                                         source_of_edge=np.cumsum(is_first_edge) - 1, height_starts=height_starts)
+
+    def earliest_reachable_positions(self, shuttle_idx: np.ndarray, chain_position: np.ndarray,
+                                     block: slice) -> np.ndarray:
+        # Every vertex reaches a suffix of each chain, so reachability is one "earliest reachable chain
+        # position per shuttle" vector per vertex, the minimum over the vectors of its successors. Returns the
+        # (V, shuttles in block) vectors, computed in one pass over increasing heights.
+        in_block = (shuttle_idx >= block.start) & (shuttle_idx < block.stop)
+        own_vertices = np.flatnonzero(in_block)
+        segment_bounds = np.append(self.segment_starts, len(self.edges_from))
+
+        reachable = np.full((self.num_vertices, block.stop - block.start), UNREACHABLE, dtype=np.int32)
+        reachable[own_vertices, shuttle_idx[own_vertices] - block.start] = chain_position[own_vertices]
+        for height in range(1, len(self.height_starts) - 1):
+            first_source, last_source = self.height_starts[height], self.height_starts[height + 1]
+            first_edge = segment_bounds[first_source]
+            level_sources = self.sources[first_source:last_source]
+            reachable[level_sources] = np.minimum.reduceat(
+                reachable[self.edges_to[first_edge:segment_bounds[last_source]]],
+                self.segment_starts[first_source:last_source] - first_edge, axis=0)
+            level_own = level_sources[in_block[level_sources]]
+            reachable[level_own, shuttle_idx[level_own] - block.start] = chain_position[level_own]
+        return reachable
+
+
+def find_redundant_type2_dependencies(shuttle_idx: np.ndarray, chain_position: np.ndarray, edges_from: np.ndarray,
+                                      edges_to: np.ndarray) -> np.ndarray:
+    # Vertices are 0..V-1, shuttle_idx is dense in 0..S-1 and chain_position is the index of a vertex in the
+    # chain of its shuttle. The reachability vectors are computed for a block of shuttles at a time. A type-2
+    # dependency u -> v is redundant if another successor of u reaches the chain of v at v or before it.
+    # Type-1 dependencies are never reported. Returns a mask over the given dependencies.
+    num_vertices = len(shuttle_idx)
+    num_shuttles = int(shuttle_idx.max()) + 1 if num_vertices else 0
+    redundant = np.zeros(len(edges_from), dtype=bool)
+    if len(edges_from) == 0:
+        return redundant
+
+    ordered = HeightOrderedDependencies.from_dependencies(num_vertices, edges_from, edges_to)
+    edges_from, edges_to = ordered.edges_from, ordered.edges_to
+    type2_edges = np.flatnonzero(shuttle_idx[edges_from] != shuttle_idx[edges_to])
+    type2_shuttles = shuttle_idx[edges_to[type2_edges]]
+
+    block_size = int(max(1, min(num_shuttles, REDUCTION_BLOCK_ELEMENTS // max(len(edges_from), num_vertices))))
+    for first_shuttle in range(0, num_shuttles, block_size):
+        block = slice(first_shuttle, min(first_shuttle + block_size, num_shuttles))
+        block_edges = type2_edges[(type2_shuttles >= block.start) & (type2_shuttles < block.stop)]
+        if len(block_edges) == 0:
+            continue
+
+        reachable = ordered.earliest_reachable_positions(shuttle_idx, chain_position, block)
+        successor_reach = reachable[edges_to]
+        earliest = np.minimum.reduceat(successor_reach, ordered.segment_starts, axis=0)
+        num_earliest = np.add.reduceat((successor_reach == earliest[ordered.source_of_edge]).astype(np.int32),
+                                       ordered.segment_starts, axis=0)
+        columns = shuttle_idx[edges_to[block_edges]] - block.start
+        block_sources = ordered.source_of_edge[block_edges]
+        position = chain_position[edges_to[block_edges]]
+        redundant[ordered.edge_order[block_edges]] = ((earliest[block_sources, columns] < position)
+                                                      | (num_earliest[block_sources, columns] > 1))
+    return redundant
@@ -0,0 +1,42 @@
+from typing import Union
+
+from src.common.action import Action, ActionStatus, CompactAction, ACTION_STATUSES
+
+
+class VertexAction:
+    # The per-vertex state (status, vertex id) an ADG keeps for one plan action, in the layout of CompactAction.
+    # The plan fields are small tuples and ints, so they are copied into slots for direct reads instead of
+    # forwarding to the plan action, and several ADGs built from the same parsed solution share nothing mutable.
+    __slots__ = ('start_s', 'goal_g', 'time_step_t', 'shuttle_R', 'status_code', 'related_vertex_id')
+
+    def __init__(self, action: Union[Action, CompactAction]):
+        self.start_s = action.start_s
+        self.goal_g = action.goal_g
+        self.time_step_t = action.time_step_t
+        self.shuttle_R = action.shuttle_R
+        self.status_code = action.status_code
+        self.related_vertex_id = -1
+
+    @property
+    def status(self) -> ActionStatus:
+        return ACTION_STATUSES[self.status_code]
+
+    @status.setter
+    def status(self, status: ActionStatus):
+        self.status_code = ACTION_STATUSES.index(status)
+
+    def move_status_forward(self):
+        if self.status_code >= len(ACTION_STATUSES) - 1:
+            raise ValueError(f"Action {self} already completed.")
+        self.status_code += 1
+
+    def is_move_action(self):
+        return self.start_s != self.goal_g
+
+    def __repr__(self):
+        return f"Action({self.start_s}, {self.goal_g}, {self.time_step_t}, {self.shuttle_R}, {self.status})"
+
+    def __lt__(self, other):
+        if isinstance(other, (VertexAction, Action, CompactAction)):
+            return self.time_step_t < other.time_step_t
+        return NotImplemented
@@ -1,26 +1,86 @@
+from enum import Enum
+from collections import defaultdict
+from typing import Dict, List, Optional
+
 import simpy
 
-from src.adg.create_adg import ADGBuilder, Type2DepCreator
-from src.adg_simulation.shuttle import Shuttle, FPS
+from src.adg.adg import ADG
+from src.adg.create_adg import ADGBuilder, Type2DepCreator, ADGBackend
+from src.adg_simulation.event_executor import ADGEventExecutor
+from src.adg_simulation.monte_carlo import ExecutionUncertaintyConfig, adg_monte_carlo
+from src.adg_simulation.shuttle import Shuttle, FPS, EPS, EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME
 from src.adg_simulation.shuttle_supervisor import ShuttleSupervisor
 from src.common.resources import PATH_DATA_OUT
+from src.common.segment_collision import find_segment_collisions, PathSegment
 from src.config.mapf_solution import MapfSolution
-from src.config.simulation_result_config import SimulationResultConfig
+from src.config.simulation_result_config import SimulationResultConfig, RESULT_FILE_SUFFIX
+
+
+class SimulationExecutor(Enum):
+    SIMPY = 1
+    # Makespan-only execution in ADGEventExecutor, it does not interpolate shuttle paths.
+    EVENT_LOOP = 2
+    # Makespan from ADG.compute_execution_schedule, a single pass over the ADG without any events.
+    SCHEDULE = 3
+
+
+def check_collisions_in_segments(path_segments: Dict[int, List[PathSegment]], log_output=False):
+    collisions = find_segment_collisions(path_segments)
+    if collisions:
+        if log_output:
+            print(f"!! FAIL: Collisions detected: {collisions}")
+        assert not collisions
+    else:
+        if log_output:
+            print("!! SUCCESS: No collisions detected")
+
+
+def schedule_path_segments(adg: ADG, start_times: Dict[int, float],
+                           durations: Dict[int, float]) -> Dict[int, List[PathSegment]]:
+    path_segments: Dict[int, List[PathSegment]] = defaultdict(list)
+    for action in sorted(adg.get_all_actions(), key=lambda a: start_times[a.related_vertex_id]):
+        start_time = start_times[action.related_vertex_id]
+        path_segments[action.shuttle_R].append((start_time, start_time + durations[action.related_vertex_id],
+                                                action.start_s, action.goal_g))
+    return path_segments
 
 
 def adg_simulation(mapf_solution: MapfSolution, dep_creator: Type2DepCreator, log_output=False,
-                   check_collision=True, skip_wait_actions=False, store_shuttle_path_results=True) -> float:
-    env = simpy.Environment()
+                   check_collision=True, skip_wait_actions=False, store_shuttle_path_results=True,
+                   adg_backend: ADGBackend = ADGBackend.NETWORKX,
+                   executor: SimulationExecutor = SimulationExecutor.SIMPY) -> float:
+    if executor != SimulationExecutor.SIMPY and store_shuttle_path_results:
+        raise ValueError(f"The {executor.name} executor does not store shuttle paths, use SimulationExecutor.SIMPY.")
 
     grid_map = mapf_solution.grid_map
     actions = mapf_solution.get_all_actions()
     adg_ = ADGBuilder().build(actions, skip_wait_actions=skip_wait_actions,
-                              type2_dep_creator=dep_creator)
+                              type2_dep_creator=dep_creator, adg_backend=adg_backend)
+
+    if executor == SimulationExecutor.SCHEDULE:
+        # Assumes the supervisor forwards completions and queue updates without delay, as it does.
+        schedule = adg_.compute_execution_schedule(EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME, FPS, EPS)
+        if log_output:
+            print("Simulation finished in {:.2f} seconds".format(schedule.makespan))
+        if check_collision:
+            check_collisions_in_segments(schedule_path_segments(adg_, schedule.start_times, schedule.durations),
+                                         log_output)
+        return schedule.makespan
 
+    if executor == SimulationExecutor.EVENT_LOOP:
+        execution_result = ADGEventExecutor(adg_, mapf_solution.robot_actions.keys(),
+                                            store_path_segments=check_collision).run()
+        if log_output:
+            print("Simulation finished in {:.2f} seconds".format(execution_result.sim_end_time))
+        if check_collision:
+            check_collisions_in_segments(execution_result.path_segments, log_output)
+        return execution_result.sim_end_time
+
+    env = simpy.Environment()
     shuttles = []
     for shuttle_id in mapf_solution.robot_actions.keys():
         shuttle = Shuttle(env, shuttle_id=shuttle_id, log_output=log_output,
-                          store_path_positions=check_collision or store_shuttle_path_results)
+                          store_path_positions=store_shuttle_path_results, store_path_segments=check_collision)
         shuttles.append(shuttle)
     supervisor = ShuttleSupervisor(env, shuttles, adg_, log_output=log_output)
 
@@ -33,29 +93,31 @@ def adg_simulation(mapf_solution: MapfSolution, dep_creator: Type2DepCreator, lo
 
     result = {}
     for shuttle in shuttles:
-        result[shuttle.shuttle_id] = shuttle.path_positions
+        result[shuttle.shuttle_id] = shuttle.path_positions.to_array()
 
     result_config = SimulationResultConfig(paths=result, fps=FPS, grid_map=grid_map)
     if store_shuttle_path_results:
-        result_config.save(PATH_DATA_OUT / "simulation_result.pkl")
+        result_config.save(PATH_DATA_OUT / f"simulation_result{RESULT_FILE_SUFFIX}")
 
     if check_collision:
-        collisions = result_config.check_collisions_in_paths()
-        if collisions:
-            if log_output:
-                print(f"!! FAIL: Collisions detected: {collisions}")
-            assert not collisions
-        else:
-            if log_output:
-                print("!! SUCCESS: No collisions detected")
+        check_collisions_in_segments({shuttle.shuttle_id: shuttle.path_segments for shuttle in shuttles}, log_output)
 
     return sim_end_time
 
 
 def adg_simulation_from_file(f_p: str, dep_creator: Type2DepCreator,
                              use_execution_uncertainty=False, log_output=False,
-                             check_collision=True, skip_wait_actions=False) -> float:
+                             check_collision=True, skip_wait_actions=False,
+                             uncertainty_config: Optional[ExecutionUncertaintyConfig] = None) -> float:
+    # With execution uncertainty, the mean makespan of the sampled executions is returned.
     mapf_solution = MapfSolution.from_file(f_p)
-    adg_simulation(mapf_solution, dep_creator, use_execution_uncertainty, log_output, check_collision,
-                   skip_wait_actions)
+    if use_execution_uncertainty:
+        monte_carlo_result = adg_monte_carlo(mapf_solution, dep_creator, skip_wait_actions=skip_wait_actions,
+                                             config=uncertainty_config)
+        if log_output:
+            print("Mean makespan {:.2f} seconds, percentiles: {}".format(monte_carlo_result.mean_makespan,
+                                                                       monte_carlo_result.percentiles))
+        return monte_carlo_result.mean_makespan
 
+    return adg_simulation(mapf_solution, dep_creator, log_output=log_output, check_collision=check_collision,
+                          skip_wait_actions=skip_wait_actions)
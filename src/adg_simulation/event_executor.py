@@ -0,0 +1,132 @@
+import heapq
+import itertools
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List
+
+from pydantic import BaseModel
+
+from src.adg.adg import ADG
+from src.adg.readiness_tracker import ReadinessTracker
+from src.adg_simulation.shuttle import (ShuttleState, EPS, EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME,
+                                        sync_time_and_path_interpolation)
+from src.adg_simulation.shuttle_supervisor import ACTION_COMPLETED_DELAY, QUEUE_NEW_ACTION_DELAY
+from src.common.action import Action
+from src.common.segment_collision import PathSegment
+
+# Event priorities of simpy: a new process starts before timeouts that end at the same time.
+URGENT = 0
+NORMAL = 1
+
+
+class EventExecutionResult(BaseModel):
+    sim_end_time: float = -1.0
+    idle_times: Dict[int, float] = {}
+    path_segments: Dict[int, List[PathSegment]] = {}
+
+
+class _ExecutorShuttle:
+    __slots__ = ('shuttle_id', 'action_queue', 'busy_executing_action', 'state', 'prev_state', 'went_idle_at',
+                 'execution_time', 'path_segments')
+
+    def __init__(self, shuttle_id: int):
+        self.shuttle_id = shuttle_id
+        self.action_queue = deque()
+        self.busy_executing_action = False
+        self.state = ShuttleState.IDLE
+        self.prev_state = ShuttleState.IDLE
+        self.went_idle_at = 0.0
+        self.execution_time = 0.0
+        self.path_segments: List[PathSegment] = []
+
+
+class ADGEventExecutor:
+    # Executes an ADG like ShuttleSupervisor and Shuttle on simpy, but in one heap-based event loop without simpy
+    # events and pubsub messages. Processes are generators that yield their timeout delays. Events are ordered by
+    # (time, priority, insertion order) as in simpy, so equal-time completions and queue updates interleave the
+    # same way and the makespan is identical.
+
+    def __init__(self, adg: ADG, shuttle_ids: Iterable[int], store_path_segments=False):
+        self.now = 0.0
+        self.store_path_segments = store_path_segments
+        self.readiness_tracker = ReadinessTracker(adg)
+        self.shuttles = {shuttle_id: _ExecutorShuttle(shuttle_id) for shuttle_id in shuttle_ids}
+        self._events = []
+        self._event_ids = itertools.count()
+
+    def _start_process(self, process):
+        heapq.heappush(self._events, (self.now, URGENT, next(self._event_ids), process))
+
+    def run(self) -> EventExecutionResult:
+        self._start_process(self._start_simulation())
+        events = self._events
+        event_ids = self._event_ids
+        while events:
+            self.now, _, _, process = heapq.heappop(events)
+            delay = next(process, None)
+            if delay is not None:
+                heapq.heappush(events, (self.now + delay, NORMAL, next(event_ids), process))
+
+        return EventExecutionResult(
+            sim_end_time=self.now,
+            idle_times={shuttle_id: self.now - shuttle.execution_time for shuttle_id, shuttle in self.shuttles.items()},
+            path_segments={shuttle_id: shuttle.path_segments for shuttle_id, shuttle in self.shuttles.items()}
+            if self.store_path_segments else {},
+        )
+
+    def _start_simulation(self):
+        yield from self._notify_shuttles_for_queue_update(self.readiness_tracker.enqueue_ready_actions())
+
+    def _process_action_completed(self, action: Action):
+        self.readiness_tracker.mark_completed(action)
+        yield ACTION_COMPLETED_DELAY
+        yield from self._notify_shuttles_for_queue_update(self.readiness_tracker.enqueue_ready_actions())
+
+    def _notify_shuttles_for_queue_update(self, enqueued_actions: List[Action]):
+        shuttle_action_map: Dict[int, List[Action]] = defaultdict(list)
+        for action in enqueued_actions:
+            shuttle_action_map[action.shuttle_R].append(action)
+
+        for shuttle_id, actions in shuttle_action_map.items():
+            actions.sort()
+            shuttle = self.shuttles[shuttle_id]
+            shuttle.action_queue.extend(actions)
+            yield QUEUE_NEW_ACTION_DELAY
+            if not shuttle.busy_executing_action and shuttle.action_queue:
+                self._start_process(self._execute_actions(shuttle))
+
+    @staticmethod
+    def _change_state(shuttle: _ExecutorShuttle, new_state: ShuttleState, now: float):
+        shuttle.state = new_state
+        if shuttle.state == ShuttleState.IDLE and shuttle.prev_state != ShuttleState.IDLE:
+            shuttle.went_idle_at = now
+        shuttle.prev_state = shuttle.state
+
+    def _execute_actions(self, shuttle: _ExecutorShuttle):
+        shuttle.busy_executing_action = True
+        while shuttle.action_queue:
+            action = shuttle.action_queue.popleft()
+            action_duration = EXECUTION_TIME
+
+            if len(shuttle.action_queue) > 0:
+                next_action = shuttle.action_queue[0]
+                if action.is_move_action() and next_action.is_move_action():
+                    action_duration = CONSECUTIVE_MOVE_EXECUTION_TIME
+
+            if shuttle.state == ShuttleState.IDLE:
+                idle_duration = self.now - shuttle.went_idle_at
+                if idle_duration >= EPS:
+                    _, time_diff_to_yield = sync_time_and_path_interpolation(idle_duration)
+                    if time_diff_to_yield > 0:
+                        yield time_diff_to_yield
+
+            self._change_state(shuttle, ShuttleState.MOVING, self.now)
+            _, time_diff_to_yield = sync_time_and_path_interpolation(action_duration)
+            if self.store_path_segments:
+                shuttle.path_segments.append((self.now, self.now + action_duration, action.start_s, action.goal_g))
+
+            shuttle.execution_time += action_duration + time_diff_to_yield
+            yield action_duration + time_diff_to_yield
+            self._start_process(self._process_action_completed(action))
+
+        shuttle.busy_executing_action = False
+        self._change_state(shuttle, ShuttleState.IDLE, self.now)
@@ -0,0 +1,220 @@
+import multiprocessing
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.adg.adg import ADG
+from src.adg.create_adg import ADGBuilder, Type2DepCreator
+from src.adg_simulation.shuttle import FPS, EPS, EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME
+from src.config.mapf_solution import MapfSolution
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class DelayDistribution(Enum):
+    # Mean scale.
+    EXPONENTIAL = 1
+    # Between 0 and scale.
+    UNIFORM = 2
+    # Median scale, lognormal_sigma in log space.
+    LOGNORMAL = 3
+
+
+class ExecutionUncertaintyConfig(BaseModel):
+    distribution: DelayDistribution = DelayDistribution.EXPONENTIAL
+    # Every action is delayed with this probability by a sample of the distribution, in seconds.
+    delay_probability: float = 0.1
+    delay_scale: float = 0.5
+    lognormal_sigma: float = 0.5
+    num_samples: int = 1000
+    # The batch holds a (samples, vertices) matrix of finish times.
+    samples_per_batch: int = 32
+    num_processes: int = 1
+    seed: int = 0
+
+
+class MonteCarloResult(BaseModel):
+    nominal_makespan: float = -1.0
+    makespans: List[float] = []
+    mean_makespan: float = -1.0
+    std_makespan: float = -1.0
+    percentiles: Dict[int, float] = {}
+    # Mean over the samples of how much later the last action of a shuttle finishes than without delays.
+    mean_shuttle_delay: Dict[int, float] = {}
+
+
+@dataclass
+class ScheduleGraph:
+    # The ADG in topological levels: the vertices of level l are order[level_starts[l]:level_starts[l + 1]], the
+    # edges into them edge_sources[edge_starts[l]:edge_starts[l + 1]], sorted by target. edge_segments holds the
+    # first edge of every target relative to the level and edge_targets the position of that target in the level.
+    order: np.ndarray
+    level_starts: np.ndarray
+    edge_sources: np.ndarray
+    edge_starts: np.ndarray
+    edge_segments: List[np.ndarray]
+    edge_targets: List[np.ndarray]
+    nominal_durations: np.ndarray
+    shuttle_ids: np.ndarray
+    last_vertex_per_shuttle: np.ndarray
+
+    @staticmethod
+    def from_adg(adg: ADG, nominal_durations: Dict[int, float]) -> 'ScheduleGraph':
+        actions = adg.get_all_actions()
+        predecessors = [[int(predecessor_id) for predecessor_id in adg.get_predecessors(action.related_vertex_id)]
+                        for action in actions]
+        successors = [[] for _ in actions]
+        for idx, predecessor_indices in enumerate(predecessors):
+            for predecessor_idx in predecessor_indices:
+                successors[predecessor_idx].append(idx)
+
+        # Kahn's algorithm, the level of a vertex is the length of the longest edge path to it.
+        level = np.zeros(len(actions), dtype=np.int64)
+        open_predecessors = [len(predecessor_indices) for predecessor_indices in predecessors]
+        ready = deque(idx for idx, count in enumerate(open_predecessors) if count == 0)
+        num_visited = 0
+        while ready:
+            idx = ready.popleft()
+            num_visited += 1
+            for successor_idx in successors[idx]:
+                level[successor_idx] = max(level[successor_idx], level[idx] + 1)
+                open_predecessors[successor_idx] -= 1
+                if open_predecessors[successor_idx] == 0:
+                    ready.append(successor_idx)
+        if num_visited != len(actions):
+            raise ValueError("ADG contains a Cycle!")
+
+        order = np.argsort(level, kind='stable')
+        num_levels = int(level.max()) + 1 if len(actions) else 0
+        level_starts = np.searchsorted(level[order], np.arange(num_levels + 1))
+        position_in_level = np.empty(len(actions), dtype=np.int64)
+        position_in_level[order] = np.arange(len(actions)) - level_starts[level[order]]
+
+        edge_counts = np.array([len(predecessor_indices) for predecessor_indices in predecessors], dtype=np.int64)
+        edge_targets = np.repeat(np.arange(len(actions)), edge_counts)
+        edge_sources = np.fromiter((idx for predecessor_indices in predecessors for idx in predecessor_indices),
+                                   dtype=np.int64, count=int(edge_counts.sum()))
+        edge_order = np.lexsort((edge_targets, level[edge_targets]))
+        edge_targets = edge_targets[edge_order]
+        edge_sources = edge_sources[edge_order]
+        edge_starts = np.searchsorted(level[edge_targets], np.arange(num_levels + 1))
+
+        edge_segments = []
+        level_edge_targets = []
+        for level_idx in range(num_levels):
+            targets = edge_targets[edge_starts[level_idx]:edge_starts[level_idx + 1]]
+            is_first = np.ones(len(targets), dtype=bool)
+            is_first[1:] = targets[1:] != targets[:-1]
+            edge_segments.append(np.flatnonzero(is_first))
+            level_edge_targets.append(position_in_level[targets[is_first]])
+
+        shuttle_R = np.array([action.shuttle_R for action in actions], dtype=np.int64)
+        time_step_t = np.array([action.time_step_t for action in actions], dtype=np.int64)
+        last_of_shuttle = np.lexsort((time_step_t, shuttle_R))
+        is_last = np.ones(len(actions), dtype=bool)
+        is_last[:-1] = shuttle_R[last_of_shuttle][1:] != shuttle_R[last_of_shuttle][:-1]
+        last_vertex_per_shuttle = last_of_shuttle[is_last]
+
+        return ScheduleGraph(order=order, level_starts=level_starts, edge_sources=edge_sources,
+                             edge_starts=edge_starts, edge_segments=edge_segments, edge_targets=level_edge_targets,
+                             nominal_durations=np.array([nominal_durations[action.related_vertex_id]
+                                                         for action in actions], dtype=float),
+                             shuttle_ids=shuttle_R[last_vertex_per_shuttle],
+                             last_vertex_per_shuttle=last_vertex_per_shuttle)
+
+    def finish_times(self, durations: np.ndarray) -> np.ndarray:
+        # Longest path for every row of the (samples, vertices) durations, one level at a time.
+        finish = np.empty_like(durations)
+        for level_idx in range(len(self.level_starts) - 1):
+            vertices = self.order[self.level_starts[level_idx]:self.level_starts[level_idx + 1]]
+            start = np.zeros((len(durations), len(vertices)))
+            sources = self.edge_sources[self.edge_starts[level_idx]:self.edge_starts[level_idx + 1]]
+            if len(sources):
+                start[:, self.edge_targets[level_idx]] = np.maximum.reduceat(finish[:, sources],
+                                                                             self.edge_segments[level_idx], axis=1)
+            finish[:, vertices] = start + durations[:, vertices]
+        return finish
+
+
+def sample_delays(config: ExecutionUncertaintyConfig, rng: np.random.Generator, shape) -> np.ndarray:
+    match config.distribution:
+        case DelayDistribution.EXPONENTIAL:
+            delays = rng.exponential(config.delay_scale, size=shape)
+        case DelayDistribution.UNIFORM:
+            delays = rng.uniform(0.0, config.delay_scale, size=shape)
+        case DelayDistribution.LOGNORMAL:
+            delays = rng.lognormal(np.log(config.delay_scale), config.lognormal_sigma, size=shape)
+    return np.where(rng.random(shape) < config.delay_probability, delays, 0.0)
+
+
+def evaluate_batch(graph: ScheduleGraph, config: ExecutionUncertaintyConfig, num_samples: int,
+                   seed_sequence: np.random.SeedSequence):
+    rng = np.random.default_rng(seed_sequence)
+    durations = graph.nominal_durations + sample_delays(config, rng, (num_samples, len(graph.nominal_durations)))
+    finish = graph.finish_times(durations)
+    return finish.max(axis=1, initial=0.0), finish[:, graph.last_vertex_per_shuttle]
+
+
+_worker_graph: Optional[ScheduleGraph] = None
+
+
+def _init_worker(graph: ScheduleGraph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _evaluate_batch_in_worker(config: ExecutionUncertaintyConfig, num_samples: int,
+                              seed_sequence: np.random.SeedSequence):
+    return evaluate_batch(_worker_graph, config, num_samples, seed_sequence)
+
+
+def run_monte_carlo(adg: ADG, config: ExecutionUncertaintyConfig) -> MonteCarloResult:
+    # Delays are added to the durations of the execution without them (ADG.compute_execution_schedule), which
+    # include the wait of an idle shuttle for the next frame; the decision for the shorter consecutive move is
+    # kept. Samples are drawn per batch from seeds spawned from config.seed, so the result does not depend on
+    # the number of processes.
+    schedule = adg.compute_execution_schedule(EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME, FPS, EPS)
+    nominal_durations = {}
+    for vertex_id, finish_time in schedule.finish_times.items():
+        ready_time = max((schedule.finish_times[int(predecessor_id)]
+                          for predecessor_id in adg.get_predecessors(vertex_id)), default=0.0)
+        nominal_durations[vertex_id] = finish_time - ready_time
+    graph = ScheduleGraph.from_adg(adg, nominal_durations)
+    nominal_finish = graph.finish_times(graph.nominal_durations[None, :])[0]
+
+    batch_sizes = [min(config.samples_per_batch, config.num_samples - first_sample)
+                   for first_sample in range(0, config.num_samples, config.samples_per_batch)]
+    tasks = [(config, batch_size, seed_sequence) for batch_size, seed_sequence in
+             zip(batch_sizes, np.random.SeedSequence(config.seed).spawn(len(batch_sizes)))]
+    if config.num_processes > 1:
+        with multiprocessing.Pool(processes=config.num_processes, initializer=_init_worker,
+                                  initargs=(graph,)) as pool:
+            batch_results = pool.starmap(_evaluate_batch_in_worker, tasks)
+    else:
+        batch_results = [evaluate_batch(graph, *task) for task in tasks]
+
+    makespans = np.concatenate([makespans for makespans, _ in batch_results])
+    shuttle_finish = np.concatenate([shuttle_finish for _, shuttle_finish in batch_results])
+    shuttle_delay = (shuttle_finish - nominal_finish[graph.last_vertex_per_shuttle]).mean(axis=0)
+    return MonteCarloResult(
+        nominal_makespan=float(nominal_finish.max(initial=0.0)),
+        makespans=makespans.tolist(),
+        mean_makespan=float(makespans.mean()),
+        std_makespan=float(makespans.std()),
+        percentiles={percentile: float(value) for percentile, value in
+                     zip(PERCENTILES, np.percentile(makespans, PERCENTILES))},
+        mean_shuttle_delay=dict(zip(graph.shuttle_ids.tolist(), shuttle_delay.tolist())),
+    )
+
+
+def adg_monte_carlo(mapf_solution: MapfSolution, dep_creator: Type2DepCreator, skip_wait_actions=False,
+                    config: Optional[ExecutionUncertaintyConfig] = None) -> MonteCarloResult:
+    if config is None:
+        config = ExecutionUncertaintyConfig()
+    adg_ = ADGBuilder().build(mapf_solution.get_all_actions(), skip_wait_actions=skip_wait_actions,
+                              type2_dep_creator=dep_creator)
+    return run_monte_carlo(adg_, config)
@@ -1,13 +1,15 @@
 from collections import deque
 from enum import Enum
-from typing import Tuple
+from typing import List, Tuple
 
 import simpy
 
 from src.adg_simulation.communication import CommunicationPubs
 from src.adg_simulation.communication import CommunicationSubs
 from src.common.action import Action
-from src.common.math_util import lerp_a_to_b
+from src.common.math_util import lerp_a_to_b, frames_and_time_to_next_frame
+from src.common.path_buffer import PathBuffer
+from src.common.segment_collision import PathSegment
 
 FPS = 60
 EPS = 1e-8
@@ -15,6 +17,10 @@ EXECUTION_TIME = 1.0
 CONSECUTIVE_MOVE_EXECUTION_TIME = 0.8
 
 
+def sync_time_and_path_interpolation(duration: float) -> Tuple[int, float]:
+    return frames_and_time_to_next_frame(duration, FPS)
+
+
 class ShuttleState(Enum):
     IDLE = 0
     MOVING = 1
@@ -23,19 +29,20 @@ class ShuttleState(Enum):
 class Shuttle(CommunicationSubs.IShuttleQueueUpdatedSubscriber):
 
     def __init__(self, env: simpy.Environment, shuttle_id: int,
-                 log_output: bool = False, store_path_positions=True):
+                 log_output: bool = False, store_path_positions=True, store_path_segments=False):
         self.store_path_positions = store_path_positions
+        self.store_path_segments = store_path_segments
         self.log_output = log_output
         CommunicationSubs.IShuttleQueueUpdatedSubscriber.__init__(self, shuttle_id)
         self.shuttle_id = shuttle_id
-        self.path_positions = []
+        self.path_positions = PathBuffer()
         self.action_queue = deque()
         self.env = env
         self.busy_executing_action = False
         self.prev_state = ShuttleState.IDLE
         self._change_state(ShuttleState.IDLE)
         self.went_idle_at = 0.0
-        self.path_positions = []
+        self.path_segments: List[PathSegment] = []
 
     def _change_state(self, new_state: ShuttleState):
         self.state = new_state
@@ -55,14 +62,7 @@ class Shuttle(CommunicationSubs.IShuttleQueueUpdatedSubscriber):
             self.env.process(self.execute_actions())
 
     def sync_time_and_path_interpolation(self, duration: float) -> Tuple[int, float]:
-        frames_to_wait = duration * FPS
-        frames_to_interpolate = int(frames_to_wait)
-
-        if frames_to_interpolate < frames_to_wait:
-            frames_to_interpolate += 1
-
-        time_to_yield = (frames_to_interpolate - frames_to_wait) / FPS
-        return frames_to_interpolate, time_to_yield
+        return sync_time_and_path_interpolation(duration)
 
     def assert_time_synced(self, process_time: float):
         interpolated_time_progression = len(self.path_positions) / FPS
@@ -83,21 +83,22 @@ class Shuttle(CommunicationSubs.IShuttleQueueUpdatedSubscriber):
                 idle_duration = self.env.now - self.went_idle_at
                 if idle_duration >= EPS:
                     frames_to_interpolate, time_diff_to_yield = self.sync_time_and_path_interpolation(idle_duration)
-                    wait_positions = lerp_a_to_b(action.start_s, action.start_s, frames_to_interpolate)
                     if time_diff_to_yield > 0:
                         yield self.env.timeout(time_diff_to_yield)
 
                     if self.store_path_positions:
-                        self.path_positions.extend(wait_positions)
+                        self.path_positions.extend(lerp_a_to_b(action.start_s, action.start_s, frames_to_interpolate))
                         self.assert_time_synced(self.env.now)
 
             self._change_state(ShuttleState.MOVING)
             frames_to_interpolate, time_diff_to_yield = self.sync_time_and_path_interpolation(action_duration)
-            movement_positions = lerp_a_to_b(action.start_s, action.goal_g, frames_to_interpolate)
+            if self.store_path_segments:
+                self.path_segments.append((self.env.now, self.env.now + action_duration,
+                                           action.start_s, action.goal_g))
 
             yield self.env.timeout(action_duration + time_diff_to_yield)
             if self.store_path_positions:
-                self.path_positions.extend(movement_positions)
+                self.path_positions.extend(lerp_a_to_b(action.start_s, action.goal_g, frames_to_interpolate))
                 self.assert_time_synced(self.env.now)
             self.finish_action(action)
 
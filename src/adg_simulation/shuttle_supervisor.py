@@ -5,9 +5,10 @@ import simpy
 from pubsub import pub
 
 from src.adg.adg import ADG
+from src.adg.readiness_tracker import ReadinessTracker
 from src.adg_simulation.communication import CommunicationSubs, CommMsgBuilder, CommunicationPubs
 from src.adg_simulation.shuttle import Shuttle
-from src.common.action import Action, ActionStatus
+from src.common.action import Action, STATUS_CODE_COMPLETED
 from src.visualize.visualize_adg import visualize_adg
 
 # This (realistic) delays would add to the contrast even further.
@@ -22,6 +23,7 @@ class ShuttleSupervisor(CommunicationSubs.IActionCompletedSubscriber):
         CommunicationSubs.IActionCompletedSubscriber.__init__(self, shuttle_ids)
         self.env = env
         self.adg = adg
+        self.readiness_tracker = ReadinessTracker(adg)
         self.shuttles = {}
 
         for shuttle in shuttles:
@@ -32,18 +34,16 @@ class ShuttleSupervisor(CommunicationSubs.IActionCompletedSubscriber):
         self.env.process(self.process_action_completed(shuttle_id, action))
             
     def process_action_completed(self, shuttle_id: int, action: Action):
-        if action.status == ActionStatus.COMPLETED:
+        if action.status_code == STATUS_CODE_COMPLETED:
             raise ValueError(f"Action {action} already completed. DOUBLE - COMPLETE")
         
-        if action.status != ActionStatus.ENQUEUED:
-            raise ValueError(f"Action {action} is not in ENQUEUED status.")
-        action.move_status_forward()
-        assert action.status == ActionStatus.COMPLETED
+        self.readiness_tracker.mark_completed(action)
+        assert action.status_code == STATUS_CODE_COMPLETED
         yield self.env.timeout(ACTION_COMPLETED_DELAY)
         if self.log_output:
             print(f"Shuttle {shuttle_id} completed action [{action.start_s}, {action.goal_g}] at t= {self.env.now}")
         
-        enqueued_actions = self.adg.enqueue_actions_bfs(action)
+        enqueued_actions = self.readiness_tracker.enqueue_ready_actions()
         shuttle_action_map: Dict[int, Action] = defaultdict(list)
         for a in enqueued_actions:
             shuttle_action_map[a.shuttle_R].append(a)
@@ -59,21 +59,8 @@ class ShuttleSupervisor(CommunicationSubs.IActionCompletedSubscriber):
             CommunicationPubs.publish_shuttle_queue_updated(shuttle_id)
 
     def start_simulation(self):
-        first_actions_for_shuttles = {}
-        for action in self.adg.get_all_actions():
-            if first_actions_for_shuttles.get(action.shuttle_R) is None:
-                first_actions_for_shuttles[action.shuttle_R] = action
-                continue
-
-            curr_action_for_shuttle = first_actions_for_shuttles[action.shuttle_R]
-            assert curr_action_for_shuttle.time_step_t != action.time_step_t
-            if curr_action_for_shuttle.time_step_t > action.time_step_t:
-                first_actions_for_shuttles[action.shuttle_R] = action
-        
         enqueued_actions_per_shuttle: Dict[int, Action] = defaultdict(list)
-        for shuttle_id, action in first_actions_for_shuttles.items():
-            enqueued_actions = self.adg.enqueue_actions_bfs(action)
-            for e in enqueued_actions:
-                enqueued_actions_per_shuttle[e.shuttle_R].append(e)
+        for e in self.readiness_tracker.enqueue_ready_actions():
+            enqueued_actions_per_shuttle[e.shuttle_R].append(e)
 
         yield from self.notify_shuttles_for_queue_update(enqueued_actions_per_shuttle)
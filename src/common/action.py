@@ -1,4 +1,5 @@
 import json
+from dataclasses import dataclass
 from pydantic import BaseModel
 from enum import Enum
 from typing import List, Tuple, Dict
@@ -34,7 +35,64 @@ class Action(BaseModel):
         return f"Action({self.start_s}, {self.goal_g}, {self.time_step_t}, {self.shuttle_R}, {self.status})"
 
     def __lt__(self, other):
-        if isinstance(other, Action):
+        if isinstance(other, (Action, CompactAction)):
+            return self.time_step_t < other.time_step_t
+        return NotImplemented
+
+    def is_move_action(self):
+        return self.start_s != self.goal_g
+
+    @property
+    def status_code(self) -> int:
+        return ACTION_STATUSES.index(self.status)
+
+    def to_compact_action(self) -> 'CompactAction':
+        return CompactAction(self.start_s, self.goal_g, self.time_step_t, self.shuttle_R, self.status_code,
+                             self.related_vertex_id)
+
+
+# Index of a status is its status_code in CompactAction.
+ACTION_STATUSES = (ActionStatus.PENDING, ActionStatus.ENQUEUED, ActionStatus.COMPLETED)
+STATUS_CODE_PENDING, STATUS_CODE_ENQUEUED, STATUS_CODE_COMPLETED = range(len(ACTION_STATUSES))
+
+
+@dataclass(slots=True)
+class CompactAction:
+    # Validation-free counterpart of Action for the hot paths (parsing, ADG building, simulation).
+    # Action stays the type for JSON I/O.
+    start_s: Tuple[int, int]
+    goal_g: Tuple[int, int]
+    time_step_t: int
+    shuttle_R: int
+    status_code: int = 0
+    related_vertex_id: int = -1
+
+    @property
+    def status(self) -> ActionStatus:
+        return ACTION_STATUSES[self.status_code]
+
+    @status.setter
+    def status(self, status: ActionStatus):
+        self.status_code = ACTION_STATUSES.index(status)
+
+    @staticmethod
+    def from_action(action: Action) -> 'CompactAction':
+        return action.to_compact_action()
+
+    def to_action(self) -> Action:
+        return Action(start_s=self.start_s, goal_g=self.goal_g, time_step_t=self.time_step_t,
+                      shuttle_R=self.shuttle_R, status=self.status, related_vertex_id=self.related_vertex_id)
+
+    def move_status_forward(self):
+        if self.status_code >= len(ACTION_STATUSES) - 1:
+            raise ValueError(f"Action {self} already completed.")
+        self.status_code += 1
+
+    def __repr__(self):
+        return f"Action({self.start_s}, {self.goal_g}, {self.time_step_t}, {self.shuttle_R}, {self.status})"
+
+    def __lt__(self, other):
+        if isinstance(other, (CompactAction, Action)):
             return self.time_step_t < other.time_step_t
         return NotImplemented
 
@@ -10,5 +10,15 @@ def lerp_a_to_b(a: Tuple[int, int], b: Tuple[int, int], steps: int) -> np.ndarra
         return np.vstack((x_values, y_values)).T
     except ValueError as e:
         print(f"Error: {e}")
-    
 
+
+def frames_and_time_to_next_frame(duration: float, fps: int) -> Tuple[int, float]:
+    # Whole frames covering the duration and the time left until the last of them ends.
+    frames_to_wait = duration * fps
+    frames_to_interpolate = int(frames_to_wait)
+
+    if frames_to_interpolate < frames_to_wait:
+        frames_to_interpolate += 1
+
+    time_to_yield = (frames_to_interpolate - frames_to_wait) / fps
+    return frames_to_interpolate, time_to_yield
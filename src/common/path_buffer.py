@@ -0,0 +1,33 @@
+import numpy as np
+
+PATH_DTYPE = np.float32
+
+
+class PathBuffer:
+    # Growable (frames, 2) position buffer of a shuttle. The capacity doubles when it runs full, so appends are
+    # amortized O(1) and every frame costs 8 bytes instead of a boxed float64 row.
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._positions = np.empty((initial_capacity, 2), dtype=PATH_DTYPE)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        return self.to_array()[index]
+
+    def _reserve(self, capacity: int):
+        if capacity > len(self._positions):
+            positions = np.empty((max(capacity, 2 * len(self._positions)), 2), dtype=PATH_DTYPE)
+            positions[:self._size] = self._positions[:self._size]
+            self._positions = positions
+
+    def extend(self, positions: np.ndarray):
+        self._reserve(self._size + len(positions))
+        self._positions[self._size:self._size + len(positions)] = positions
+        self._size += len(positions)
+
+    def to_array(self) -> np.ndarray:
+        # A view on the stored frames, it stays valid until the next append.
+        return self._positions[:self._size]
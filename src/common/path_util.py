@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime
 from pathlib import Path
 from typing import Union
@@ -19,3 +20,15 @@ def append_timestamp_to_filename(file_path: Path) -> Path:
     suffix = file_path.suffix
     new_file_name = f"{stem}_{timestamp}{suffix}"
     return file_path.with_name(new_file_name)
+
+
+def cache_file_for(source_file: Path, cache_dir: Path, suffix: str) -> Path:
+    # Named after the resolved path and the modification time, so a changed source file misses the cache.
+    path_hash = hashlib.sha1(str(source_file.resolve()).encode()).hexdigest()[:16]
+    return cache_dir / f"{source_file.stem}-{path_hash}-{source_file.stat().st_mtime_ns}{suffix}"
+
+
+def remove_stale_cache_files(cache_file: Path):
+    # Entries of older versions of the same source file are never read again.
+    for stale_file in cache_file.parent.glob(f"{cache_file.stem.rsplit('-', 1)[0]}-*{cache_file.suffix}"):
+        stale_file.unlink(missing_ok=True)
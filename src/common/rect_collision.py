@@ -1,24 +1,66 @@
 from typing import Tuple, Dict, List
-from shapely.geometry import box
 
+import numpy as np
 
-def check_rectangle_collision(rect_positions: Dict[int, Tuple[float, float]],
-                              rect_size_x: float, rect_size_y: float, eps: float = 1e-8) -> List[Tuple[int, int]]:
-    collisions = []
-    robot_rectangles = {}
+# Overlapping rectangles lie in the same or in neighbouring buckets of a grid with the rectangle size.
+NEIGHBOR_BUCKET_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def find_rectangle_collisions(positions: np.ndarray, rect_size_x: float, rect_size_y: float,
+                              eps: float = 1e-8) -> np.ndarray:
+    # positions is a (frames, robots, 2) array of lower left corners. Returns the (frame, robot_idx_1, robot_idx_2)
+    # rows with robot_idx_1 < robot_idx_2 of all overlapping rectangles, shrunk by eps, sorted like the pairwise loop.
+    num_frames, num_robots, _ = positions.shape
+    x = positions[..., 0].ravel()
+    y = positions[..., 1].ravel()
+    frame = np.repeat(np.arange(num_frames), num_robots)
+    robot = np.tile(np.arange(num_robots), num_frames)
+    if len(x) == 0:
+        return np.zeros((0, 3), dtype=np.int64)
+
+    # Buckets start at 1, so the neighbour of a border bucket never wraps into another row or frame.
+    bucket_x = np.floor(x / rect_size_x).astype(np.int64)
+    bucket_y = np.floor(y / rect_size_y).astype(np.int64)
+    bucket_x -= bucket_x.min() - 1
+    bucket_y -= bucket_y.min() - 1
+    width_x = int(bucket_x.max()) + 2
+    width_y = int(bucket_y.max()) + 2
+    keys = (frame * width_x + bucket_x) * width_y + bucket_y
 
-    # Create rectangles using shapely's box and shrink them using a negative epsilon
-    for robot_id, (robot_x, robot_y) in rect_positions.items():
-        rect = box(robot_x, robot_y, robot_x + rect_size_x, robot_y + rect_size_y).buffer(-eps)  # Shrink with -eps
-        robot_rectangles[robot_id] = rect
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    candidates_1 = []
+    candidates_2 = []
+    for dx, dy in NEIGHBOR_BUCKET_OFFSETS:
+        query_keys = keys + dx * width_y + dy
+        first = np.searchsorted(sorted_keys, query_keys, side='left')
+        counts = np.searchsorted(sorted_keys, query_keys, side='right') - first
 
-    robot_ids = list(robot_rectangles.keys())
-    for i in range(len(robot_ids)):
-        for j in range(i + 1, len(robot_ids)):
-            rect1 = robot_rectangles[robot_ids[i]]
-            rect2 = robot_rectangles[robot_ids[j]]
+        entries_1 = np.repeat(np.arange(len(keys)), counts)
+        group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        entries_2 = order[np.repeat(first, counts) + np.arange(len(entries_1)) - group_starts]
+        # Every pair is found from both sides, only the ordered one is kept.
+        ordered = robot[entries_1] < robot[entries_2]
+        candidates_1.append(entries_1[ordered])
+        candidates_2.append(entries_2[ordered])
 
-            if rect1.intersects(rect2):  # Check if rectangles overlap
-                collisions.append((robot_ids[i], robot_ids[j]))
+    entries_1 = np.concatenate(candidates_1)
+    entries_2 = np.concatenate(candidates_2)
+    # Same comparison as intersecting the closed boxes [x + eps, x + size - eps].
+    overlap = ((x[entries_1] + eps <= x[entries_2] + rect_size_x - eps)
+               & (x[entries_2] + eps <= x[entries_1] + rect_size_x - eps)
+               & (y[entries_1] + eps <= y[entries_2] + rect_size_y - eps)
+               & (y[entries_2] + eps <= y[entries_1] + rect_size_y - eps))
+    entries_1 = entries_1[overlap]
+    entries_2 = entries_2[overlap]
 
-    return collisions
+    collisions = np.stack((frame[entries_1], robot[entries_1], robot[entries_2]), axis=1)
+    return collisions[np.lexsort((collisions[:, 2], collisions[:, 1], collisions[:, 0]))]
+
+
+def check_rectangle_collision(rect_positions: Dict[int, Tuple[float, float]],
+                              rect_size_x: float, rect_size_y: float, eps: float = 1e-8) -> List[Tuple[int, int]]:
+    robot_ids = list(rect_positions.keys())
+    positions = np.array([rect_positions[robot_id] for robot_id in robot_ids], dtype=float).reshape(1, -1, 2)
+    return [(robot_ids[robot_idx_1], robot_ids[robot_idx_2])
+            for _, robot_idx_1, robot_idx_2 in find_rectangle_collisions(positions, rect_size_x, rect_size_y, eps).tolist()]
@@ -27,6 +27,8 @@ PATH_MAPF_BENCHMARK_SOLUTIONS = PATH_MAPF_BENCHMARK / "precomputed_solutions"
 PATH_MAPF_BENCHMARK_ADG_RESULTS = PATH_MAPF_BENCHMARK / "adg_results"
 PATH_MAPF_BENCHMARK_SIMULATION_RESULTS = PATH_MAPF_BENCHMARK / "simulation_results"
 PATH_MAPF_BENCHMARK_PRECOMPUTED_SOLUTIONS = PATH_MAPF_BENCHMARK / "precomputed_solutions"
+PATH_MAPF_BENCHMARK_SOLUTION_CACHE = PATH_MAPF_BENCHMARK / "solution_cache"
+PATH_MAPF_BENCHMARK_MAP_CACHE = PATH_MAPF_BENCHMARK / "map_cache"
 
 PATH_DATA_OUT = PATH_DATA / "out"
 
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from pydantic import BaseModel, ValidationError
+
+RESULT_STORE_SUFFIX = ".jsonl"
+
+ResultKey = Tuple[str, int, str, int, str]
+
+
+class ResultRecord(BaseModel):
+    map_name: str
+    num_agents: int
+    solution_file: str
+    iteration: int
+    method: str
+    result: Union[float, Dict[str, Union[int, float]]]
+
+    def key(self) -> ResultKey:
+        return self.map_name, self.num_agents, self.solution_file, self.iteration, self.method
+
+
+class JsonlResultStore:
+    # Append-only JSON Lines file with one ResultRecord per line, so a finished result is never rewritten. A
+    # line cut off by a crash is skipped when reading, and the next append starts on a new line.
+
+    def __init__(self, file_path: Union[str, os.PathLike]):
+        self.file_path = Path(file_path)
+
+    def read_records(self) -> List[ResultRecord]:
+        if not self.file_path.exists():
+            return []
+
+        records = []
+        with open(self.file_path, 'r') as file:
+            for line in file:
+                try:
+                    records.append(ResultRecord.model_validate_json(line))
+                except ValidationError:
+                    continue
+        return records
+
+    def completed_keys(self) -> Set[ResultKey]:
+        return {record.key() for record in self.read_records()}
+
+    def append(self, records: Iterable[ResultRecord]):
+        lines = "".join(record.model_dump_json() + "\n" for record in records)
+        with open(self.file_path, 'a+b') as file:
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    file.write(b"\n")
+            file.write(lines.encode())
+            file.flush()
+            os.fsync(file.fileno())
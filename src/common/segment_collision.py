@@ -0,0 +1,141 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.common.rect_collision import NEIGHBOR_BUCKET_OFFSETS
+
+# (t_start, t_end, from, to) of a straight motion, the position is held in between two segments.
+PathSegment = Tuple[float, float, Tuple[int, int], Tuple[int, int]]
+
+
+def _pieces_from_segments(segments_per_robot: List[List[PathSegment]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Covers [0, inf) per robot: it holds the start of its first segment before it, the goal of a segment until the
+    # next one starts and the goal of its last segment forever.
+    robots = []
+    times = []
+    positions = []
+    for robot_idx, segments in enumerate(segments_per_robot):
+        if not segments:
+            continue
+        prev_t, prev_pos = 0.0, segments[0][2]
+        for t_start, t_end, start, goal in segments:
+            if t_start > prev_t:
+                robots.append(robot_idx)
+                times.append((prev_t, t_start))
+                positions.append((prev_pos, prev_pos))
+            robots.append(robot_idx)
+            times.append((t_start, t_end))
+            positions.append((start, goal))
+            prev_t, prev_pos = t_end, goal
+        robots.append(robot_idx)
+        times.append((prev_t, np.inf))
+        positions.append((prev_pos, prev_pos))
+
+    return (np.array(robots, dtype=np.int64), np.array(times, dtype=float).reshape(-1, 2),
+            np.array(positions, dtype=float).reshape(-1, 2, 2))
+
+
+def _candidate_pairs(robot: np.ndarray, times: np.ndarray, positions: np.ndarray, rect_size_x: float,
+                     rect_size_y: float, time_bucket: float) -> Tuple[np.ndarray, np.ndarray]:
+    # Every piece is entered into all (time, x, y) buckets its time interval and bounding box touch. Pieces
+    # that overlap at some time share a time bucket and lie in the same or in neighbouring spatial buckets.
+    horizon = max(np.max(times[:, 0]), np.max(times[np.isfinite(times[:, 1]), 1], initial=0.0))
+    first_t = np.floor(times[:, 0] / time_bucket).astype(np.int64)
+    last_t = np.floor(np.minimum(times[:, 1], horizon) / time_bucket).astype(np.int64)
+    first_x = np.floor(positions[:, :, 0].min(axis=1) / rect_size_x).astype(np.int64)
+    last_x = np.floor(positions[:, :, 0].max(axis=1) / rect_size_x).astype(np.int64)
+    first_y = np.floor(positions[:, :, 1].min(axis=1) / rect_size_y).astype(np.int64)
+    last_y = np.floor(positions[:, :, 1].max(axis=1) / rect_size_y).astype(np.int64)
+
+    num_x = last_x - first_x + 1
+    num_y = last_y - first_y + 1
+    counts = (last_t - first_t + 1) * num_x * num_y
+    pieces = np.repeat(np.arange(len(robot)), counts)
+    local_idx = np.arange(len(pieces)) - np.repeat(np.cumsum(counts) - counts, counts)
+    num_xy = (num_x * num_y)[pieces]
+    bucket_t = first_t[pieces] + local_idx // num_xy
+    bucket_x = first_x[pieces] + (local_idx % num_xy) // num_y[pieces]
+    bucket_y = first_y[pieces] + local_idx % num_y[pieces]
+
+    # Buckets start at 1, so the neighbour of a border bucket never wraps into another row or time bucket.
+    bucket_x -= bucket_x.min() - 1
+    bucket_y -= bucket_y.min() - 1
+    width_x = int(bucket_x.max()) + 2
+    width_y = int(bucket_y.max()) + 2
+    keys = (bucket_t * width_x + bucket_x) * width_y + bucket_y
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    pair_keys = []
+    for dx, dy in NEIGHBOR_BUCKET_OFFSETS:
+        query_keys = keys + dx * width_y + dy
+        first = np.searchsorted(sorted_keys, query_keys, side='left')
+        matches = np.searchsorted(sorted_keys, query_keys, side='right') - first
+
+        entries_1 = np.repeat(np.arange(len(keys)), matches)
+        group_starts = np.repeat(np.cumsum(matches) - matches, matches)
+        entries_2 = order[np.repeat(first, matches) + np.arange(len(entries_1)) - group_starts]
+        pieces_1 = pieces[entries_1]
+        pieces_2 = pieces[entries_2]
+        ordered = robot[pieces_1] < robot[pieces_2]
+        pair_keys.append(pieces_1[ordered] * len(robot) + pieces_2[ordered])
+
+    # Pieces that share several buckets are checked once.
+    pair_keys = np.unique(np.concatenate(pair_keys))
+    return pair_keys // len(robot), pair_keys % len(robot)
+
+
+def _axis_overlap_interval(offset: np.ndarray, rate: np.ndarray, max_distance: float) -> Tuple[np.ndarray, np.ndarray]:
+    # Interval of tau >= 0 with |offset + rate * tau| <= max_distance.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau_1 = (-max_distance - offset) / rate
+        tau_2 = (max_distance - offset) / rate
+    moving = rate != 0
+    static_overlap = np.abs(offset) <= max_distance
+    lower = np.where(moving, np.minimum(tau_1, tau_2), np.where(static_overlap, 0.0, np.inf))
+    upper = np.where(moving, np.maximum(tau_1, tau_2), np.where(static_overlap, np.inf, -np.inf))
+    return lower, upper
+
+
+def find_segment_collisions(segments_per_robot: Dict[int, List[PathSegment]], rect_size_x: float = 1.0,
+                            rect_size_y: float = 1.0, eps: float = 1e-8,
+                            time_bucket: float = 1.0) -> List[Tuple[float, int, int]]:
+    # Exact counterpart of SimulationResultConfig.check_collisions_in_paths on the motion segments. Returns the
+    # first time the rectangles, shrunk by eps, of each pair of robots overlap, as (time, robot_id_1, robot_id_2).
+    robot_ids = list(segments_per_robot.keys())
+    robot, times, positions = _pieces_from_segments([segments_per_robot[robot_id] for robot_id in robot_ids])
+    if len(robot) == 0:
+        return []
+
+    durations = times[:, 1] - times[:, 0]
+    moving = np.isfinite(durations) & (durations > 0)
+    velocities = np.zeros((len(robot), 2))
+    velocities[moving] = (positions[moving, 1] - positions[moving, 0]) / durations[moving, None]
+
+    pieces_1, pieces_2 = _candidate_pairs(robot, times, positions, rect_size_x, rect_size_y, time_bucket)
+    start = np.maximum(times[pieces_1, 0], times[pieces_2, 0])
+    end = np.minimum(times[pieces_1, 1], times[pieces_2, 1])
+    offset = ((positions[pieces_1, 0] + velocities[pieces_1] * (start - times[pieces_1, 0])[:, None])
+              - (positions[pieces_2, 0] + velocities[pieces_2] * (start - times[pieces_2, 0])[:, None]))
+    rate = velocities[pieces_1] - velocities[pieces_2]
+
+    # Shrunk closed boxes overlap while both axis distances are at most the size minus 2 * eps.
+    lower_x, upper_x = _axis_overlap_interval(offset[:, 0], rate[:, 0], rect_size_x - 2 * eps)
+    lower_y, upper_y = _axis_overlap_interval(offset[:, 1], rate[:, 1], rect_size_y - 2 * eps)
+    lower = np.maximum(np.maximum(lower_x, lower_y), 0.0)
+    upper = np.minimum(np.minimum(upper_x, upper_y), end - start)
+    colliding = lower <= upper
+
+    robots_1 = robot[pieces_1[colliding]]
+    robots_2 = robot[pieces_2[colliding]]
+    collision_times = (start + lower)[colliding]
+    order = np.lexsort((collision_times, robots_2, robots_1))
+    pair_keys = robots_1[order] * len(robot_ids) + robots_2[order]
+    _, first_of_pair = np.unique(pair_keys, return_index=True)
+    first_collisions = order[first_of_pair]
+    first_collisions = first_collisions[np.lexsort((robots_2[first_collisions], robots_1[first_collisions],
+                                                    collision_times[first_collisions]))]
+    return [(collision_time, robot_ids[robot_idx_1], robot_ids[robot_idx_2])
+            for collision_time, robot_idx_1, robot_idx_2 in zip(collision_times[first_collisions].tolist(),
+                                                                robots_1[first_collisions].tolist(),
+                                                                robots_2[first_collisions].tolist())]
@@ -1,16 +1,25 @@
-from typing import Dict, List
+from typing import Dict, List, Union
 
-from src.common.action import Action
+from pydantic import field_serializer
+
+from src.common.action import Action, CompactAction
 from src.common.pydantic_util import BaseConfig
 from src.common.grid_map import GridMap
 
 
 class MapfSolution(BaseConfig):
     grid_map: GridMap
-    robot_actions: Dict[int, List[Action]]
+    # CompactAction first, so parsed plans pass validation with a cheap isinstance check.
+    robot_actions: Dict[int, List[Union[CompactAction, Action]]]
 
     class Config:
         arbitrary_types_allowed = True
-        
-    def get_all_actions(self) -> List[Action]:
+
+    @field_serializer('robot_actions')
+    def serialize_robot_actions(self, robot_actions: Dict[int, List[Union[CompactAction, Action]]]):
+        return {shuttle_id: [action.to_action() if isinstance(action, CompactAction) else action
+                             for action in actions]
+                for shuttle_id, actions in robot_actions.items()}
+
+    def get_all_actions(self) -> List[Union[CompactAction, Action]]:
         return [act for actions in self.robot_actions.values() for act in actions]
@@ -1,25 +1,83 @@
 import pickle
+from pathlib import Path
 import numpy as np
-from typing import Dict, Tuple, List
-from src.common.rect_collision import check_rectangle_collision 
+from typing import Dict, Tuple, List, Optional, Union
+from src.common.path_buffer import PATH_DTYPE
+from src.common.rect_collision import find_rectangle_collisions
 from tqdm import tqdm
 from src.common.grid_map import GridMap
 
+# Number of (frame, robot) positions checked for collisions at once.
+COLLISION_CHECK_CHUNK_SIZE = 2 ** 20
+
+# Binary result file: header, robot ids, per-robot offsets into the positions, the grid as uint8 (int8 cell values)
+# and all positions as one contiguous little-endian (positions, 2) float32 array.
+RESULT_FILE_MAGIC = b"ADGSIMR1"
+RESULT_FILE_SUFFIX = ".simres"
+_RESULT_HEADER_DTYPE = np.dtype([('magic', 'S8'), ('fps', '<u4'), ('grid_size_x', '<u4'), ('grid_size_y', '<u4'),
+                                 ('num_robots', '<u4'), ('num_positions', '<u8')])
+_RESULT_POSITION_DTYPE = np.dtype('<f4')
+_RESULT_ALIGNMENT = 64
+
 
 class SimulationResultConfig:
     def __init__(self, paths: Dict[int, np.ndarray], fps: int, grid_map: GridMap):
-        self.paths = paths
+        # Results stored before paths were arrays hold a list of position rows per robot.
+        self.paths = {robot_id: np.asarray(path, dtype=PATH_DTYPE).reshape(-1, 2) for robot_id, path in paths.items()}
         self.fps = fps
         self.grid_map = grid_map
 
-    def save(self, filepath: str):
+    def save(self, filepath: Union[str, Path]):
+        path_lengths = np.array([len(path) for path in self.paths.values()], dtype='<u8')
+        offsets = np.concatenate(([0], np.cumsum(path_lengths))).astype('<u8')
+        header = np.array([(RESULT_FILE_MAGIC, self.fps, self.grid_map.grid_size_x, self.grid_map.grid_size_y,
+                            len(self.paths), offsets[-1])], dtype=_RESULT_HEADER_DTYPE)
+        grid = np.asarray(self.grid_map.MAP, dtype=np.int8).reshape(self.grid_map.grid_size_x,
+                                                                     self.grid_map.grid_size_y).view(np.uint8)
+
         with open(filepath, 'wb') as f:
-            pickle.dump({'paths': self.paths,
-                         'fps': self.fps,
-                         'grid_map': self.grid_map}, f)
+            f.write(header.tobytes())
+            f.write(np.array(list(self.paths.keys()), dtype='<i8').tobytes())
+            f.write(offsets.tobytes())
+            f.write(grid.tobytes())
+            f.write(bytes(-f.tell() % _RESULT_ALIGNMENT))
+            for path in self.paths.values():
+                f.write(np.ascontiguousarray(path, dtype=_RESULT_POSITION_DTYPE).tobytes())
 
     @classmethod
-    def load(cls, filepath: str):
+    def load(cls, filepath: Union[str, Path]):
+        # Paths are memory-mapped, frames are only read from disk when they are accessed.
+        with open(filepath, 'rb') as f:
+            is_result_file = f.read(len(RESULT_FILE_MAGIC)) == RESULT_FILE_MAGIC
+        if not is_result_file:
+            return cls.load_pickle(filepath)
+
+        header = np.fromfile(filepath, dtype=_RESULT_HEADER_DTYPE, count=1)[0]
+        num_robots = int(header['num_robots'])
+        grid_size_x, grid_size_y = int(header['grid_size_x']), int(header['grid_size_y'])
+        offset = _RESULT_HEADER_DTYPE.itemsize
+        robot_ids = np.memmap(filepath, dtype='<i8', mode='r', offset=offset, shape=(num_robots,))
+        offset += robot_ids.nbytes
+        path_offsets = np.memmap(filepath, dtype='<u8', mode='r', offset=offset, shape=(num_robots + 1,))
+        offset += path_offsets.nbytes
+        grid = np.memmap(filepath, dtype=np.uint8, mode='r', offset=offset, shape=(grid_size_x, grid_size_y))
+        offset += grid.nbytes
+        offset += -offset % _RESULT_ALIGNMENT
+
+        paths = {}
+        if header['num_positions'] > 0:
+            positions = np.memmap(filepath, dtype=_RESULT_POSITION_DTYPE, mode='r', offset=offset,
+                                  shape=(int(header['num_positions']), 2))
+            for robot_id, first, last in zip(robot_ids.tolist(), path_offsets[:-1].tolist(), path_offsets[1:].tolist()):
+                paths[robot_id] = positions[first:last]
+        else:
+            paths = {robot_id: np.zeros((0, 2), dtype=PATH_DTYPE) for robot_id in robot_ids.tolist()}
+
+        grid_map = GridMap(grid_size_x=grid_size_x, grid_size_y=grid_size_y, MAP=grid.view(np.int8).tolist())
+        return cls(paths, int(header['fps']), grid_map)
+
+    @classmethod
+    def load_pickle(cls, filepath: Union[str, Path]):
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
             paths = data['paths']
@@ -27,17 +85,44 @@ class SimulationResultConfig:
             grid_map = data['grid_map']
         return cls(paths, fps, grid_map)
 
+    def num_frames(self) -> int:
+        return max((len(path) for path in self.paths.values()), default=0)
+
+    def stacked_paths(self, first_frame: int = 0, last_frame: Optional[int] = None) -> np.ndarray:
+        # (robots, frames, 2) positions in the order of self.paths. A robot holds its last position after its path
+        # ended, a robot without any position is NaN.
+        last_frame = self.num_frames() if last_frame is None else last_frame
+        stacked = np.full((len(self.paths), last_frame - first_frame, 2), np.nan, dtype=PATH_DTYPE)
+        for robot_idx, path in enumerate(self.paths.values()):
+            if len(path) == 0:
+                continue
+            path_chunk = path[first_frame:last_frame]
+            stacked[robot_idx, :len(path_chunk)] = path_chunk
+            stacked[robot_idx, len(path_chunk):] = path[-1]
+        return stacked
+
     def check_collisions_in_paths(self, rect_size_x: float = 1.0, rect_size_y: float = 1.0, eps: float = 1e-8) -> List[Tuple[int, int, int]]:
-        total_frames = max(len(path) for path in self.paths.values())
+        robot_ids = list(self.paths.keys())
+        has_path = np.array([len(path) > 0 for path in self.paths.values()], dtype=bool)
+        if not has_path.any():
+            return []
+        total_frames = self.num_frames()
+        frames_per_chunk = max(1, COLLISION_CHECK_CHUNK_SIZE // len(robot_ids))
+        robot_idx_with_path = np.flatnonzero(has_path)
         collisions_found = []
 
-        for frame in tqdm(range(total_frames), desc="Checking frames for collisions"):
-            robot_positions = {robot_id: path[min(frame, len(path) - 1)] for robot_id, path in self.paths.items()}
-            collisions = check_rectangle_collision(robot_positions, rect_size_x, rect_size_y, eps)
-
-            if collisions:
-                for (shuttle_id_1, shuttle_id_2) in collisions:
-                    collisions_found.append((frame, shuttle_id_1, shuttle_id_2))
+        for first_frame in tqdm(range(0, total_frames, frames_per_chunk), desc="Checking frames for collisions"):
+            last_frame = min(first_frame + frames_per_chunk, total_frames)
+            positions = self.stacked_paths(first_frame, last_frame)[has_path].transpose(1, 0, 2).astype(float)
+            collisions = find_rectangle_collisions(positions, rect_size_x, rect_size_y, eps)
+            for frame, robot_idx_1, robot_idx_2 in collisions.tolist():
+                collisions_found.append((first_frame + frame, robot_ids[robot_idx_with_path[robot_idx_1]],
+                                         robot_ids[robot_idx_with_path[robot_idx_2]]))
 
         return collisions_found
 
+
+def convert_pickle_result(pickle_file: Union[str, Path], result_file: Optional[Union[str, Path]] = None) -> Path:
+    result_file = Path(pickle_file).with_suffix(RESULT_FILE_SUFFIX) if result_file is None else Path(result_file)
+    SimulationResultConfig.load_pickle(pickle_file).save(result_file)
+    return result_file
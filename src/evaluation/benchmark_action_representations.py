@@ -0,0 +1,65 @@
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+
+from pydantic import BaseModel
+
+from src.common.action import Action, CompactAction
+
+
+class ActionRepresentationBenchmarkResult(BaseModel):
+    representation: str
+    num_actions: int = 0
+    creation_time: float = -1.0
+    attribute_access_ns: float = -1.0
+    memory_mb: float = -1.0
+
+
+def create_plan(create_action: Callable, num_shuttles: int, num_time_steps: int) -> List:
+    return [create_action((shuttle_id, time_step), (shuttle_id, time_step + 1), time_step, shuttle_id)
+            for shuttle_id in range(num_shuttles) for time_step in range(num_time_steps)]
+
+
+def create_pydantic_action(start_s, goal_g, time_step_t, shuttle_R) -> Action:
+    return Action(start_s=start_s, goal_g=goal_g, time_step_t=time_step_t, shuttle_R=shuttle_R)
+
+
+def benchmark_representation(name: str, create_action: Callable, num_shuttles: int,
+                             num_time_steps: int) -> ActionRepresentationBenchmarkResult:
+    gc.collect()
+    start = time.perf_counter()
+    actions = create_plan(create_action, num_shuttles, num_time_steps)
+    creation_time = time.perf_counter() - start
+
+    # The attributes read per action when building the ADG and simulating it.
+    start = time.perf_counter()
+    for action in actions:
+        action.start_s, action.goal_g, action.time_step_t, action.shuttle_R, action.status
+    attribute_access_ns = (time.perf_counter() - start) / len(actions) * 1e9
+    del actions
+
+    gc.collect()
+    tracemalloc.start()
+    actions = create_plan(create_action, num_shuttles, num_time_steps)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return ActionRepresentationBenchmarkResult(
+        representation=name,
+        num_actions=len(actions),
+        creation_time=creation_time,
+        attribute_access_ns=attribute_access_ns,
+        memory_mb=memory / 2 ** 20,
+    )
+
+
+if __name__ == "__main__":
+    NUM_SHUTTLES = 1000
+    NUM_TIME_STEPS = 1000
+
+    for name, create_action in [("pydantic", create_pydantic_action), ("compact", CompactAction)]:
+        result = benchmark_representation(name, create_action, NUM_SHUTTLES, NUM_TIME_STEPS)
+        print(f"{result.representation:>10} - {result.num_actions} actions - "
+              f"creation: {result.creation_time:.2f}s, attribute access: {result.attribute_access_ns:.0f}ns/action, "
+              f"memory: {result.memory_mb:.0f}MB")
@@ -0,0 +1,83 @@
+import gc
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Tuple
+
+from pydantic import BaseModel
+
+from mapf_benchmark.parse_precomputed_solutions import parse_precomputed_solution_from_file
+from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
+from src.adg.adg import ADG
+from src.adg.create_adg import ADGBuilder, ADGBackend, SparseCandidatePartitioningDepCreator
+from src.common.action import Action
+
+
+class ADGBackendBenchmarkResult(BaseModel):
+    backend: str
+    num_vertices: int = 0
+    memory_mb: float = -1.0
+    get_action_ns: float = -1.0
+    get_successors_ns: float = -1.0
+    get_predecessors_ns: float = -1.0
+
+
+def build_adg_traced(actions: List[Action], adg_backend: ADGBackend) -> Tuple[ADG, int]:
+    gc.collect()
+    tracemalloc.start()
+    adg = ADGBuilder().build(actions, SparseCandidatePartitioningDepCreator(), skip_wait_actions=True,
+                             adg_backend=adg_backend)
+    # Forces the array backend to compact its adjacency before the memory is read.
+    adg.get_successors(adg.get_all_actions()[0].related_vertex_id)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return adg, memory
+
+
+def time_per_call_ns(method, node_ids: List[int], repetitions: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for node_id in node_ids:
+            method(node_id)
+    return (time.perf_counter() - start) / (repetitions * len(node_ids)) * 1e9
+
+
+def benchmark_backend(actions: List[Action], adg_backend: ADGBackend, repetitions: int) -> ADGBackendBenchmarkResult:
+    adg, memory = build_adg_traced(actions, adg_backend)
+    node_ids = [action.related_vertex_id for action in adg.get_all_actions()]
+
+    return ADGBackendBenchmarkResult(
+        backend=adg_backend.name,
+        num_vertices=len(node_ids),
+        memory_mb=memory / 2 ** 20,
+        get_action_ns=time_per_call_ns(adg.get_action, node_ids, repetitions),
+        get_successors_ns=time_per_call_ns(adg.get_successors, node_ids, repetitions),
+        get_predecessors_ns=time_per_call_ns(adg.get_predecessors, node_ids, repetitions),
+    )
+
+
+def run_backend_benchmark(solutions_per_agent_count: int = 1, repetitions: int = 3):
+    for scenario in prepare_benchmark_scenarios():
+        for num_robots, solution_files in sorted(scenario.solution_files.items()):
+            for solution_file in solution_files[:solutions_per_agent_count]:
+                shuttle_actions = parse_precomputed_solution_from_file(solution_file)
+                actions = [action for actions in shuttle_actions.values() for action in actions]
+
+                print(f"{Path(scenario.map_file).stem} - {num_robots} agents - {Path(solution_file).stem}")
+                for adg_backend in ADGBackend:
+                    try:
+                        result = benchmark_backend(actions, adg_backend, repetitions)
+                    except ValueError as e:
+                        print(f"  {adg_backend.name}: skipped ({e})")
+                        continue
+                    print(f"  {result.backend:>8}: V={result.num_vertices} memory={result.memory_mb:.1f}MB "
+                          f"get_action={result.get_action_ns:.0f}ns "
+                          f"get_successors={result.get_successors_ns:.0f}ns "
+                          f"get_predecessors={result.get_predecessors_ns:.0f}ns")
+
+
+if __name__ == "__main__":
+    SOLUTIONS_PER_AGENT_COUNT = 1
+    REPETITIONS = 3
+
+    run_backend_benchmark(SOLUTIONS_PER_AGENT_COUNT, REPETITIONS)
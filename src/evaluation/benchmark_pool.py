@@ -0,0 +1,83 @@
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.common.grid_map import GridMap
+
+
+@dataclass(frozen=True)
+class SharedGridMapHandle:
+    # A grid map published as (grid_size_x, grid_size_y) uint8 views of the int8 cell values.
+    name: str
+    grid_size_x: int
+    grid_size_y: int
+
+
+# Grid maps a worker has already read, by shared memory name.
+_attached_grid_maps: Dict[str, GridMap] = {}
+
+
+def attach_grid_map(handle: SharedGridMapHandle) -> GridMap:
+    grid_map = _attached_grid_maps.get(handle.name)
+    if grid_map is None:
+        shared_memory = SharedMemory(name=handle.name)
+        cells = np.ndarray((handle.grid_size_x, handle.grid_size_y), dtype=np.uint8, buffer=shared_memory.buf)
+        grid_map = GridMap(grid_size_x=handle.grid_size_x, grid_size_y=handle.grid_size_y,
+                           MAP=cells.view(np.int8).astype(int))
+        del cells
+        shared_memory.close()
+        _attached_grid_maps[handle.name] = grid_map
+    return grid_map
+
+
+def _run_indexed_task(function_and_task):
+    function, task_idx, task = function_and_task
+    return task_idx, function(*task)
+
+
+class BenchmarkPool:
+    # One process pool for a whole benchmark sweep. Grid maps are published once into shared memory and
+    # tasks only carry their handles.
+
+    def __init__(self, num_processes: Optional[int] = None):
+        # Workers share the resource tracker of this process, so attaching in a worker does not make its own
+        # tracker unlink the memory when the worker exits.
+        resource_tracker.ensure_running()
+        self.pool = multiprocessing.Pool(processes=num_processes)
+        self.shared_memories: List[SharedMemory] = []
+
+    def share_grid_map(self, grid_map: GridMap) -> SharedGridMapHandle:
+        cells = np.asarray(grid_map.MAP, dtype=np.int8).reshape(grid_map.grid_size_x, grid_map.grid_size_y)
+        shared_memory = SharedMemory(create=True, size=max(cells.size, 1))
+        np.ndarray(cells.shape, dtype=np.uint8, buffer=shared_memory.buf)[:] = cells.view(np.uint8)
+        self.shared_memories.append(shared_memory)
+        return SharedGridMapHandle(name=shared_memory.name, grid_size_x=grid_map.grid_size_x,
+                                   grid_size_y=grid_map.grid_size_y)
+
+    def imap_largest_first(self, function: Callable, tasks: Sequence[tuple], task_sizes: Sequence[int]) -> Iterator:
+        # The largest tasks start first so no worker picks up a long one at the end of the sweep. Results
+        # are yielded as (task index, result) in the order they finish.
+        order = sorted(range(len(tasks)), key=lambda task_idx: -task_sizes[task_idx])
+        yield from self.pool.imap_unordered(_run_indexed_task,
+                                            [(function, task_idx, tasks[task_idx]) for task_idx in order])
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        for shared_memory in self.shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+        self.shared_memories = []
+
+    def __enter__(self) -> 'BenchmarkPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.pool.terminate()
+        self.close()
+
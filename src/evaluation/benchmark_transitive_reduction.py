@@ -0,0 +1,58 @@
+import time
+from pathlib import Path
+
+import networkx as nx
+
+from mapf_benchmark.parse_precomputed_solutions import parse_precomputed_solution_from_file
+from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
+from src.adg.adg import ADG
+from src.adg.create_adg import ADGBuilder, NaiveDepCreator, SparseCandidatePartitioningDepCreator
+
+
+def path_search_reduction(adg: ADG) -> int:
+    # The previous reduction: one path search per type-2 dependency, on a copy of the graph.
+    graph = adg.graph.copy()
+    num_dependencies = 0
+    for u, v in list(graph.edges()):
+        if adg.get_action(u).shuttle_R != adg.get_action(v).shuttle_R:
+            graph.remove_edge(u, v)
+            has_path = nx.has_path(graph, u, v)
+            graph.add_edge(u, v)
+            if has_path:
+                continue
+        num_dependencies += 1
+    return num_dependencies
+
+
+def run_reduction_benchmark(solutions_per_agent_count: int = 1, max_path_search_dependencies: int = 20000):
+    for scenario in prepare_benchmark_scenarios():
+        for num_robots, solution_files in sorted(scenario.solution_files.items()):
+            for solution_file in solution_files[:solutions_per_agent_count]:
+                shuttle_actions = parse_precomputed_solution_from_file(solution_file)
+                actions = [action for actions in shuttle_actions.values() for action in actions]
+
+                adg_naive = ADGBuilder().build(actions, NaiveDepCreator(), skip_wait_actions=True)
+                adg_scp = ADGBuilder().build(actions, SparseCandidatePartitioningDepCreator(), skip_wait_actions=True)
+                print(f"{Path(scenario.map_file).stem} - {num_robots} agents - {Path(solution_file).stem}")
+                if not adg_naive.is_acyclic():
+                    print("  skipped (ADG contains a Cycle)")
+                    continue
+
+                start = time.perf_counter()
+                reduced_adg = adg_naive.transitive_reduction()
+                reduction_time = time.perf_counter() - start
+                print(f"  naive edges: {len(adg_naive.get_dependencies())}, "
+                      f"reduced: {len(reduced_adg.get_dependencies())} in {reduction_time:.3f}s, "
+                      f"SCP edges: {len(adg_scp.get_dependencies())}")
+
+                if len(adg_naive.get_dependencies()) <= max_path_search_dependencies:
+                    start = time.perf_counter()
+                    num_dependencies = path_search_reduction(adg_naive)
+                    print(f"  path search reduced: {num_dependencies} in {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    SOLUTIONS_PER_AGENT_COUNT = 1
+    MAX_PATH_SEARCH_DEPENDENCIES = 20000
+
+    run_reduction_benchmark(SOLUTIONS_PER_AGENT_COUNT, MAX_PATH_SEARCH_DEPENDENCIES)
@@ -1,5 +1,3 @@
-import copy
-import multiprocessing
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List
@@ -9,15 +7,16 @@ from pydantic import BaseModel, Field
 
 from mapf_benchmark.parse_map_file import parse_map_file
 from mapf_benchmark.parse_precomputed_solutions import (
-    parse_precomputed_solution_from_file,
+    load_precomputed_solution_columns,
 )
 from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
 from src.adg.create_adg import SparseCandidatePartitioningDepCreator
 from src.adg_simulation.adg_simulation import adg_simulation
-from src.common.path_util import append_timestamp_to_filename
 from src.common.pydantic_util import BaseConfig
 from src.common.resources import PATH_MAPF_BENCHMARK_SIMULATION_RESULTS
+from src.common.result_store import JsonlResultStore, ResultRecord, RESULT_STORE_SUFFIX
 from src.config.mapf_solution import MapfSolution
+from src.evaluation.benchmark_pool import BenchmarkPool, attach_grid_map
 
 
 class WaitActionRemovalComparisonResult(BaseModel):
@@ -36,6 +35,28 @@ class WaitActionRemovalAcrossMaps(BaseConfig):
         str, WaitActionRemovalAcrossShuttles
     ] = Field(default_factory=lambda: defaultdict(WaitActionRemovalAcrossShuttles))
 
+    @classmethod
+    def from_result_store(cls, result_store: JsonlResultStore) -> 'WaitActionRemovalAcrossMaps':
+        results_per_run = defaultdict(dict)
+        for record in result_store.read_records():
+            results_per_run[record.key()[:-1]][record.method] = record.result
+
+        results_across_maps = cls()
+        for (map_name, num_agents, _, _), results in sorted(results_per_run.items()):
+            results_across_maps.results_per_map[map_name].results_per_shuttle[num_agents].append(
+                WaitActionRemovalComparisonResult(**results))
+        return results_across_maps
+
+
+# One stored makespan per ADG variant and run.
+METHODS = list(WaitActionRemovalComparisonResult.model_fields)
+
+
+def load_wait_action_removal_results(file_path: Path) -> WaitActionRemovalAcrossMaps:
+    if file_path.suffix == RESULT_STORE_SUFFIX:
+        return WaitActionRemovalAcrossMaps.from_result_store(JsonlResultStore(file_path))
+    return WaitActionRemovalAcrossMaps.from_file(file_path)
+
 
 def run_comparison(mapf_solution: MapfSolution, log_output=False, check_collision=False, store_shuttle_path_results=False) -> WaitActionRemovalComparisonResult:
     result = WaitActionRemovalComparisonResult()
@@ -49,7 +70,7 @@ def run_comparison(mapf_solution: MapfSolution, log_output=False, check_collisio
         store_shuttle_path_results=store_shuttle_path_results
     )
     result.without_wait = adg_simulation(
-        copy.deepcopy(mapf_solution),
+        mapf_solution,
         SparseCandidatePartitioningDepCreator(),
         log_output=log_output,
         check_collision=check_collision,
@@ -61,73 +82,77 @@ def run_comparison(mapf_solution: MapfSolution, log_output=False, check_collisio
 ITERATIONS = 1
 
 
-def process_solution_file(args):
-    solution_file, grid_map, num_robots, scenario_stem = args
+def process_solution_file(solution_file, grid_map_handle, iterations):
     file_name = Path(solution_file).name
     try:
         comp_results = []
         print(f"Processing solution file: {file_name}")
-        for _ in range(ITERATIONS):
-            shuttle_actions = parse_precomputed_solution_from_file(solution_file)
-            mapf_solution = MapfSolution(
-                grid_map=copy.deepcopy(grid_map), robot_actions=shuttle_actions
-            )
-            comp_results.append(run_comparison(mapf_solution))
-        return num_robots, scenario_stem, comp_results, solution_file
+        grid_map = attach_grid_map(grid_map_handle)
+        for iteration in iterations:
+            shuttle_actions = load_precomputed_solution_columns(solution_file).to_shuttle_actions()
+            mapf_solution = MapfSolution(grid_map=grid_map, robot_actions=shuttle_actions)
+            comp_results.append((iteration, run_comparison(mapf_solution)))
+        return comp_results
     except Exception as e:
         print(f"Error in {file_name}: {e}")
-        return None, None, None, solution_file
+        return None
 
 
-def process_scenario_multiprocess(
-        scenario, results_across_maps, out_fp, failed_scenarios
+def process_scenarios_multiprocess(
+        benchmark_scenarios, result_store: JsonlResultStore, failed_scenarios, num_processes=None
 ):
-    print(f"Running for Map: {scenario.map_file}")
-    grid_map = parse_map_file(scenario.map_file)
-    scenario_stem = scenario.map_file.stem
-
-    for num_robots, solution_files in scenario.solution_files.items():
-        print(
-            f"Processing {len(solution_files)} solution files for {num_robots} robots."
-        )
-        tasks = [
-            (solution_file, grid_map, num_robots, scenario_stem)
-            for solution_file in solution_files
-        ]
-
-        ttictoc.tic()
-        pool = multiprocessing.Pool(processes=6)
-        all_results = pool.map(process_solution_file, tasks)
-
-        for num_robots_result, scenario_stem_result, comp_results, solution_file in all_results:
-            if num_robots_result is not None:
-                results_across_maps.results_per_map[
-                    scenario_stem_result
-                ].results_per_shuttle[num_robots_result].extend(comp_results)
+    # Runs whose results are all in the store already are skipped, so an interrupted sweep resumes.
+    ttictoc.tic()
+    completed_keys = result_store.completed_keys()
+    with BenchmarkPool(num_processes) as pool:
+        tasks = []
+        task_keys = []
+        for scenario in benchmark_scenarios:
+            print(f"Adding Map: {scenario.map_file}")
+            grid_map_handle = pool.share_grid_map(parse_map_file(scenario.map_file))
+            for num_robots, solution_files in scenario.solution_files.items():
+                print(
+                    f"Adding {len(solution_files)} solution files for {num_robots} robots."
+                )
+                for solution_file in solution_files:
+                    missing_iterations = [
+                        iteration for iteration in range(ITERATIONS)
+                        if any((scenario.map_file.stem, num_robots, Path(solution_file).name, iteration, method)
+                               not in completed_keys for method in METHODS)
+                    ]
+                    if missing_iterations:
+                        tasks.append((solution_file, grid_map_handle, missing_iterations))
+                        task_keys.append((scenario.map_file.stem, num_robots))
+
+        task_sizes = [num_robots for _, num_robots in task_keys]
+        for task_idx, comp_results in pool.imap_largest_first(process_solution_file, tasks, task_sizes):
+            scenario_stem, num_robots = task_keys[task_idx]
+            solution_file_name = Path(tasks[task_idx][0]).name
+            if comp_results is not None:
+                result_store.append(
+                    ResultRecord(map_name=scenario_stem, num_agents=num_robots, solution_file=solution_file_name,
+                                 iteration=iteration, method=method, result=getattr(comp_result, method))
+                    for iteration, comp_result in comp_results for method in METHODS
+                )
             else:
-                failed_scenarios.append(solution_file)
-
-        pool.close()
-        pool.join()
+                failed_scenarios.append(tasks[task_idx][0])
 
-        print(" === Results saved. === ")
-        results_across_maps.to_file(out_fp)
-        print(
-            f"Processing of {len(solution_files)} solution files took: {ttictoc.toc()} seconds."
-        )
+    print(" === Results saved. === ")
+    print(
+        f"Processing of {len(tasks)} solution files took: {ttictoc.toc()} seconds."
+    )
 
 if __name__ == "__main__":
-    out_fp = PATH_MAPF_BENCHMARK_SIMULATION_RESULTS / "wait_action_compare.json"
-    out_fp = append_timestamp_to_filename(out_fp)
+    # Without a timestamp, so running the comparison again continues it.
+    out_fp = PATH_MAPF_BENCHMARK_SIMULATION_RESULTS / f"wait_action_compare{RESULT_STORE_SUFFIX}"
+    NUM_PROCESSES = 6
 
     benchmark_scenarios = prepare_benchmark_scenarios()
-    results_across_maps = WaitActionRemovalAcrossMaps()
     failed_scenarios = []
 
-    for scenario in benchmark_scenarios:
-        process_scenario_multiprocess(
-            scenario, results_across_maps, out_fp, failed_scenarios
-        )
+    process_scenarios_multiprocess(
+        benchmark_scenarios, JsonlResultStore(out_fp), failed_scenarios, num_processes=NUM_PROCESSES
+    )
 
     print("Failed scenarios:")
     print(failed_scenarios)
@@ -1,59 +1,93 @@
 import collections
 import logging
-import multiprocessing
 from pathlib import Path
 from typing import Dict
 
 from ttictoc import tic, toc
 
 from mapf_benchmark.parse_map_file import parse_map_file
-from mapf_benchmark.parse_precomputed_solutions import parse_precomputed_solution_from_file
+from mapf_benchmark.parse_precomputed_solutions import load_precomputed_solution_columns
 from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
-from src.common.path_util import append_timestamp_to_filename
 from src.common.pydantic_util import BaseConfig
 from src.common.resources import PATH_MAPF_BENCHMARK_ADG_RESULTS
+from src.common.result_store import JsonlResultStore, ResultRecord, RESULT_STORE_SUFFIX
 from src.config.mapf_solution import MapfSolution
-from src.evaluation.evaluate_adg_construction_performance import ADGPerformanceResultAcrossShuttles, run_comparison
+from src.evaluation.benchmark_pool import BenchmarkPool, attach_grid_map
+from src.evaluation.evaluate_adg_construction_performance import ADGPerformanceComparisonResult, \
+    ADGPerformanceResultAcrossShuttles, run_comparison
 
 
 class ADGPerformanceResultAcrossMaps(BaseConfig):
     results_per_map: Dict[str, ADGPerformanceResultAcrossShuttles] = collections.defaultdict(ADGPerformanceResultAcrossShuttles)
 
+    @classmethod
+    def from_result_store(cls, result_store: JsonlResultStore) -> 'ADGPerformanceResultAcrossMaps':
+        results_per_run = collections.defaultdict(dict)
+        for record in result_store.read_records():
+            results_per_run[record.key()[:-1]][record.method] = record.result
 
-def process_solution_file(solution_file, grid_map, iterations, skip_wait_actions, skip_exhaustive=False):
-    print(f"Processing solution file: {Path(solution_file).stem}")
-    shuttle_actions = parse_precomputed_solution_from_file(solution_file)
-    mapf_solution = MapfSolution(grid_map=grid_map, robot_actions=shuttle_actions)
+        performance_result = cls()
+        for (map_name, num_agents, _, _), results in sorted(results_per_run.items()):
+            performance_result.results_per_map[map_name].results_per_shuttle[num_agents].append(
+                ADGPerformanceComparisonResult(**results))
+        return performance_result
 
-    results = []
-    for _ in range(iterations):
-        result = run_comparison(mapf_solution.get_all_actions(), skip_wait_actions, skip_exhaustive=skip_exhaustive)
-        results.append(result)
-    return results
 
+# One stored result per dependency creator and run.
+METHODS = list(ADGPerformanceComparisonResult.model_fields)
 
-def process_scenario_multiprocess(scenario, iterations, skip_wait_actions, performance_result, out_file_path, skip_exhaustive=False):
-    print(f"Running for Map: {scenario.map_file}")
-    grid_map = parse_map_file(scenario.map_file)
 
-    for num_robots, solution_files in scenario.solution_files.items():
-        tic()
-        pool = multiprocessing.Pool(processes=12)
+def load_performance_results(file_path: Path) -> ADGPerformanceResultAcrossMaps:
+    if file_path.suffix == RESULT_STORE_SUFFIX:
+        return ADGPerformanceResultAcrossMaps.from_result_store(JsonlResultStore(file_path))
+    return ADGPerformanceResultAcrossMaps.from_file(file_path)
 
-        tasks = [(solution_file, grid_map, iterations, skip_wait_actions, skip_exhaustive)
-                 for solution_file in solution_files]
 
-        all_results = pool.starmap(process_solution_file, tasks)
-        logging.info(f"Finished processing {len(solution_files)} solutions for {num_robots} robots.")
+def process_solution_file(solution_file, grid_map_handle, iterations, skip_wait_actions, skip_exhaustive=False):
+    print(f"Processing solution file: {Path(solution_file).stem}")
+    shuttle_actions = load_precomputed_solution_columns(solution_file).to_shuttle_actions()
+    mapf_solution = MapfSolution(grid_map=attach_grid_map(grid_map_handle), robot_actions=shuttle_actions)
 
-        for result_list in all_results:
-            performance_result.results_per_map[scenario.map_file.stem].results_per_shuttle[num_robots].extend(result_list)
-        performance_result.to_file(out_file_path)
+    results = []
+    for iteration in iterations:
+        result = run_comparison(mapf_solution.get_all_actions(), skip_wait_actions, skip_exhaustive=skip_exhaustive)
+        results.append((iteration, result))
+    return results
 
-        pool.close()
-        pool.join()
 
-        print(f"The pool took {toc()} seconds.")
+def process_scenarios_multiprocess(benchmark_scenarios, iterations, skip_wait_actions, result_store: JsonlResultStore,
+                                   num_processes=None, skip_exhaustive=False):
+    # Runs whose results are all in the store already are skipped, so an interrupted sweep resumes.
+    tic()
+    completed_keys = result_store.completed_keys()
+    with BenchmarkPool(num_processes) as pool:
+        tasks = []
+        task_keys = []
+        for scenario in benchmark_scenarios:
+            print(f"Adding Map: {scenario.map_file}")
+            grid_map_handle = pool.share_grid_map(parse_map_file(scenario.map_file))
+            for num_robots, solution_files in scenario.solution_files.items():
+                for solution_file in solution_files:
+                    missing_iterations = [
+                        iteration for iteration in range(iterations)
+                        if any((scenario.map_file.stem, num_robots, Path(solution_file).name, iteration, method)
+                               not in completed_keys for method in METHODS)]
+                    if missing_iterations:
+                        tasks.append((solution_file, grid_map_handle, missing_iterations, skip_wait_actions,
+                                      skip_exhaustive))
+                        task_keys.append((scenario.map_file.stem, num_robots))
+
+        task_sizes = [num_robots for _, num_robots in task_keys]
+        for task_idx, result_list in pool.imap_largest_first(process_solution_file, tasks, task_sizes):
+            map_stem, num_robots = task_keys[task_idx]
+            solution_file_name = Path(tasks[task_idx][0]).name
+            logging.info(f"Finished processing {solution_file_name} for {num_robots} robots.")
+            result_store.append(
+                ResultRecord(map_name=map_stem, num_agents=num_robots, solution_file=solution_file_name,
+                             iteration=iteration, method=method, result=getattr(result, method).model_dump())
+                for iteration, result in result_list for method in METHODS)
+
+    print(f"The pool took {toc()} seconds.")
 
 
 if __name__ == "__main__":
@@ -62,13 +96,13 @@ if __name__ == "__main__":
     ITERATIONS = 1
     SKIP_WAIT_ACTIONS = True
     SKIP_EXHAUSTIVE = False # It just takes too long, aint nobody got time for that
+    NUM_PROCESSES = 12
 
-    out_file_path_ = PATH_MAPF_BENCHMARK_ADG_RESULTS / f"iter_{ITERATIONS}_skip_wait_{SKIP_WAIT_ACTIONS}.json"
-    out_file_path_ = append_timestamp_to_filename(out_file_path_)
+    # Without a timestamp, so running the sweep again continues it.
+    out_file_path_ = PATH_MAPF_BENCHMARK_ADG_RESULTS / f"iter_{ITERATIONS}_skip_wait_{SKIP_WAIT_ACTIONS}{RESULT_STORE_SUFFIX}"
 
     benchmark_scenarios = prepare_benchmark_scenarios()
-    performance_result_ = ADGPerformanceResultAcrossMaps()
 
-    for scenario in benchmark_scenarios:
-        process_scenario_multiprocess(scenario, ITERATIONS, SKIP_WAIT_ACTIONS, performance_result_, out_file_path_, skip_exhaustive=SKIP_EXHAUSTIVE)
+    process_scenarios_multiprocess(benchmark_scenarios, ITERATIONS, SKIP_WAIT_ACTIONS, JsonlResultStore(out_file_path_),
+                                   num_processes=NUM_PROCESSES, skip_exhaustive=SKIP_EXHAUSTIVE)
 
@@ -5,7 +5,7 @@ from typing import List, Dict
 from pydantic import BaseModel
 
 from src.adg.create_adg import ADGBuilder, NaiveDepCreator, CandidatePartitioningDepCreator, \
-    SparseCandidatePartitioningDepCreator, ADGCreationResult
+    SparseCandidatePartitioningDepCreator, ADGCreationResult, DenseSparseCandidatePartitioningDepCreator
 from src.common.action import Action
 from src.common.path_util import append_timestamp_to_filename
 from src.common.pydantic_util import BaseConfig
@@ -16,11 +16,17 @@ class ADGPerformanceComparisonResult(BaseModel):
     naive: ADGCreationResult = ADGCreationResult()
     cp: ADGCreationResult = ADGCreationResult()
     scp: ADGCreationResult = ADGCreationResult()
+    scp_dense: ADGCreationResult = ADGCreationResult()
 
     def log(self):
-        print(f"NaiveDepCreator took {self.naive.elapsed_time} seconds.")
-        print(f"CandidatePartitioningDepCreator took {self.cp.elapsed_time} seconds.")
-        print(f"SparseCandidatePartitioningDepCreator took {self.scp.elapsed_time} seconds.")
+        print(f"NaiveDepCreator took {self.naive.elapsed_time} seconds "
+              f"(+ {self.naive.marshalling_time} seconds marshalling).")
+        print(f"CandidatePartitioningDepCreator took {self.cp.elapsed_time} seconds "
+              f"(+ {self.cp.marshalling_time} seconds marshalling).")
+        print(f"SparseCandidatePartitioningDepCreator took {self.scp.elapsed_time} seconds "
+              f"(+ {self.scp.marshalling_time} seconds marshalling).")
+        print(f"DenseSparseCandidatePartitioningDepCreator took {self.scp_dense.elapsed_time} seconds "
+              f"(+ {self.scp_dense.marshalling_time} seconds marshalling).")
 
 
 class ADGPerformanceResultAcrossShuttles(BaseConfig):
@@ -36,6 +42,9 @@ def run_comparison(actions: List[Action], skip_wait_actions: bool = True,
         return comparison_result
     comparison_result.scp = SparseCandidatePartitioningDepCreator().create_type2_dependencies(adg_scp)
 
+    adg_scp_dense = ADGBuilder().create_adg(actions, skip_wait_actions=skip_wait_actions).get_adg()
+    comparison_result.scp_dense = DenseSparseCandidatePartitioningDepCreator().create_type2_dependencies(adg_scp_dense)
+
     adg_cp = ADGBuilder().create_adg(actions, skip_wait_actions=skip_wait_actions).get_adg()
     comparison_result.cp = CandidatePartitioningDepCreator().create_type2_dependencies(adg_cp)
     if not adg_cp.is_acyclic():
@@ -44,11 +53,13 @@ def run_comparison(actions: List[Action], skip_wait_actions: bool = True,
     if not skip_exhaustive:
         adg_naive = ADGBuilder().create_adg(actions, skip_wait_actions=skip_wait_actions).get_adg()
         comparison_result.naive = NaiveDepCreator().create_type2_dependencies(adg_naive)
-        # if not adg_naive.is_acyclic():
-        #     return comparison_result
-        #
-        # reduced_graph = adg_naive.transitive_reduction()
-        #
-        # print(f"Comparing ADG results - Naive: {len(adg_naive.graph.edges())}, reduced: {len(reduced_graph.graph.edges)}, SCP edges: {len(adg_scp.graph.edges())}, cp edges: {len(adg_cp.graph.edges())}")
+        if not adg_naive.is_acyclic():
+            return comparison_result
+
+        reduced_graph = adg_naive.transitive_reduction()
+
+        print(f"Comparing ADG results - Naive: {len(adg_naive.get_dependencies())}, "
+              f"reduced: {len(reduced_graph.get_dependencies())}, SCP edges: {len(adg_scp.get_dependencies())}, "
+              f"cp edges: {len(adg_cp.get_dependencies())}")
 
     return comparison_result
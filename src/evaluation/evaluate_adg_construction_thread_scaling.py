@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from mapf_benchmark.parse_precomputed_solutions import load_precomputed_solution_columns
+from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
+from src.adg.dependency_creator_cpp_wrapper import DepCreationType, DependencyCreatorCpp, ActionColumns
+from src.common.resources import PATH_ROOT_DIR
+
+
+def measure_thread_scaling(columns: ActionColumns, dep_creation_type: DepCreationType,
+                           thread_counts: List[int], iterations: int) -> Dict[int, float]:
+    dep_creator_cpp = DependencyCreatorCpp(PATH_ROOT_DIR)
+    runtimes = {}
+    for num_threads in thread_counts:
+        elapsed = [dep_creator_cpp.get_type2_dependencies_from_columns(columns, dep_creation_type,
+                                                                       num_threads).elapsed_time
+                   for _ in range(iterations)]
+        runtimes[num_threads] = min(elapsed)
+    return runtimes
+
+
+def run_thread_scaling(min_agents: int, dep_creation_types: List[DepCreationType], thread_counts: List[int],
+                       iterations: int, skip_wait_actions: bool):
+    for scenario in prepare_benchmark_scenarios():
+        for num_robots, solution_files in sorted(scenario.solution_files.items()):
+            if num_robots < min_agents:
+                continue
+
+            solution_file = solution_files[0]
+            columns = load_precomputed_solution_columns(solution_file).to_action_columns(skip_wait_actions)
+
+            print(f"{Path(scenario.map_file).stem} - {num_robots} agents - {len(columns.time_step_t)} actions")
+            for dep_creation_type in dep_creation_types:
+                runtimes = measure_thread_scaling(columns, dep_creation_type, thread_counts, iterations)
+                single_threaded = runtimes[thread_counts[0]]
+                scaling = ", ".join(f"{num_threads}: {runtime:.4f}s (x{single_threaded / runtime:.2f})"
+                                    for num_threads, runtime in runtimes.items())
+                print(f"  {dep_creation_type.name:>10} - {scaling}")
+
+
+if __name__ == "__main__":
+    MIN_AGENTS = 1000
+    ITERATIONS = 3
+    SKIP_WAIT_ACTIONS = True
+    DEP_CREATION_TYPES = [DepCreationType.CP, DepCreationType.SCP, DepCreationType.SCP_DENSE]  # EXHAUSTIVE takes minutes per instance
+    THREAD_COUNTS = sorted({1, 2, 4, 8, os.cpu_count() or 1})
+
+    run_thread_scaling(MIN_AGENTS, DEP_CREATION_TYPES, THREAD_COUNTS, ITERATIONS, SKIP_WAIT_ACTIONS)
@@ -0,0 +1,47 @@
+import time
+from pathlib import Path
+
+from mapf_benchmark.parse_map_file import parse_map_file
+from mapf_benchmark.parse_precomputed_solutions import load_precomputed_solution_columns
+from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
+from src.adg.create_adg import SparseCandidatePartitioningDepCreator
+from src.adg_simulation.adg_simulation import adg_simulation, SimulationExecutor
+from src.config.mapf_solution import MapfSolution
+
+
+def run_executor_validation(max_agents: int, skip_wait_actions: bool):
+    mismatches = []
+    for scenario in prepare_benchmark_scenarios():
+        grid_map = parse_map_file(scenario.map_file)
+        for num_robots, solution_files in sorted(scenario.solution_files.items()):
+            if num_robots > max_agents:
+                continue
+
+            for solution_file in solution_files:
+                shuttle_actions = load_precomputed_solution_columns(solution_file).to_shuttle_actions()
+                mapf_solution = MapfSolution(grid_map=grid_map, robot_actions=shuttle_actions)
+
+                makespans = {}
+                runtimes = {}
+                for executor in SimulationExecutor:
+                    start = time.perf_counter()
+                    makespans[executor] = adg_simulation(mapf_solution, SparseCandidatePartitioningDepCreator(),
+                                                         check_collision=False, skip_wait_actions=skip_wait_actions,
+                                                         store_shuttle_path_results=False, executor=executor)
+                    runtimes[executor] = time.perf_counter() - start
+
+                reference = makespans[SimulationExecutor.SIMPY]
+                if any(makespan != reference for makespan in makespans.values()):
+                    mismatches.append(solution_file)
+                print(f"{Path(solution_file).stem} - " + ", ".join(
+                    f"{executor.name.lower()}: {makespans[executor]:.3f} in {runtimes[executor]:.2f}s"
+                    for executor in SimulationExecutor))
+
+    print(f"{len(mismatches)} solutions with different makespans: {mismatches}")
+
+
+if __name__ == "__main__":
+    MAX_AGENTS = 1000
+    SKIP_WAIT_ACTIONS = True
+
+    run_executor_validation(MAX_AGENTS, SKIP_WAIT_ACTIONS)
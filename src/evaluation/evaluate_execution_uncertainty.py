@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from mapf_benchmark.parse_map_file import parse_map_file
+from mapf_benchmark.parse_precomputed_solutions import load_precomputed_solution_columns
+from mapf_benchmark.prepare_benchmark_scenarios import prepare_benchmark_scenarios
+from src.adg.create_adg import SparseCandidatePartitioningDepCreator
+from src.adg_simulation.monte_carlo import ExecutionUncertaintyConfig, adg_monte_carlo
+from src.config.mapf_solution import MapfSolution
+
+
+def run_uncertainty_comparison(max_agents: int, config: ExecutionUncertaintyConfig):
+    for scenario in prepare_benchmark_scenarios():
+        grid_map = parse_map_file(scenario.map_file)
+        for num_robots, solution_files in sorted(scenario.solution_files.items()):
+            if num_robots > max_agents:
+                continue
+
+            for solution_file in solution_files:
+                shuttle_actions = load_precomputed_solution_columns(solution_file).to_shuttle_actions()
+                mapf_solution = MapfSolution(grid_map=grid_map, robot_actions=shuttle_actions)
+                for skip_wait_actions in [False, True]:
+                    result = adg_monte_carlo(mapf_solution, SparseCandidatePartitioningDepCreator(),
+                                             skip_wait_actions=skip_wait_actions, config=config)
+                    percentiles = ", ".join(f"p{percentile}: {value:.2f}"
+                                            for percentile, value in result.percentiles.items())
+                    print(f"{Path(solution_file).stem} - {'without' if skip_wait_actions else 'with'} wait - "
+                          f"nominal {result.nominal_makespan:.2f}, mean {result.mean_makespan:.2f} "
+                          f"(std {result.std_makespan:.2f}), {percentiles}, "
+                          f"max mean shuttle delay {max(result.mean_shuttle_delay.values()):.2f}")
+
+
+if __name__ == "__main__":
+    MAX_AGENTS = 200
+    CONFIG = ExecutionUncertaintyConfig(delay_probability=0.1, delay_scale=0.5, num_samples=1000, num_processes=4)
+
+    run_uncertainty_comparison(MAX_AGENTS, CONFIG)
@@ -1,6 +1,7 @@
 import collections
 import os
 from enum import Enum
+from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -12,7 +13,7 @@ from src.common.plotting_common import NAIVE_LABEL, \
     CP_LIGHT_COLOR, NAIVE_LIGHT_COLOR, Y_AXIS_TYPE2_DEP_LABEL, get_short_map_name, AXIS_LABELS_FONT_SIZE, \
     LEGEND_FONT_SIZE, FONT_WEIGHT, AXIS_NUMBER_FONT_SIZE, AXIS_LABEL_PAD, USE_GRID_LINES, TITLE_FONT_SIZE
 from src.common.resources import PATH_MAPF_BENCHMARK_ADG_RESULTS, PATH_MAPF_BENCHMARK_MAPS_PICS
-from src.evaluation.evaluate_adg_construction_benchmark_performance import ADGPerformanceResultAcrossMaps
+from src.evaluation.evaluate_adg_construction_benchmark_performance import load_performance_results
 
 
 class PlotType(Enum):
@@ -24,7 +25,7 @@ class PlotType(Enum):
 
 
 def extract_data_for_plotting(f_p, plot_type):
-    eval_results = ADGPerformanceResultAcrossMaps.from_file(f_p)
+    eval_results = load_performance_results(Path(f_p))
 
     data_per_map = {}
 
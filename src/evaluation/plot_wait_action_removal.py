@@ -6,7 +6,8 @@ import matplotlib.patches as mpatches
 import numpy as np
 from src.common.resources import PATH_MAPF_BENCHMARK_SIMULATION_RESULTS
 
-from src.evaluation.eval_wait_action_removal_on_execution import WaitActionRemovalAcrossMaps
+from src.evaluation.eval_wait_action_removal_on_execution import WaitActionRemovalAcrossMaps, \
+    load_wait_action_removal_results
 from src.common.plotting_common import get_short_map_name, AXIS_LABELS_FONT_SIZE, TITLE_FONT_SIZE, LEGEND_FONT_SIZE, \
     FONT_WEIGHT, X_AXIS_LABEL, USE_GRID_LINES, AXIS_NUMBER_FONT_SIZE, AXIS_LABEL_PAD
 
@@ -93,5 +94,5 @@ def plot_wait_action_removal_comparison(results_across_maps: WaitActionRemovalAc
 
 if __name__ == "__main__":
     f_p = PATH_MAPF_BENCHMARK_SIMULATION_RESULTS / "consecutive_move_2.json" # "very_fast_agents.json" # "new_wait_compare_without_supervisor_yields.json"  # "wait_compare_to_use.json" #
-    results_across_maps = WaitActionRemovalAcrossMaps.from_file(f_p)
+    results_across_maps = load_wait_action_removal_results(f_p)
     plot_wait_action_removal_comparison(results_across_maps)
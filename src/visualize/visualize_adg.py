@@ -10,7 +10,7 @@ adg_counter = itertools.count()
 
 
 def visualize_adg(adg: ADG, show_id=False, view=True, file_path: Path = None):
-    if not adg.graph.nodes:
+    if adg.num_vertices() == 0:
         print("Empty graph, cannot generate visualization.")
         return
 
@@ -19,13 +19,14 @@ def visualize_adg(adg: ADG, show_id=False, view=True, file_path: Path = None):
 
     shuttle_clusters = {}
 
-    vertex_color_map = {}
+    # Edge color per vertex id.
+    vertex_color_map = [None] * adg.num_vertices()
     edge_colors = [
         "darkred", "darkgreen", "darkblue", "darkorange", "indigo", "deeppink", "gold", "darkcyan", "darkmagenta"
     ]
     color_index = 0
     
-    all_actions = [adg.get_action(node_id) for node_id in adg.graph.nodes]
+    all_actions = adg.get_all_actions()
     
     for action in all_actions:
         shuttle_id = action.shuttle_R
@@ -35,7 +36,7 @@ def visualize_adg(adg: ADG, show_id=False, view=True, file_path: Path = None):
             shuttle_clusters[shuttle_id] = cluster
 
         # Assign an edge color for each vertex
-        if action.related_vertex_id not in vertex_color_map:
+        if vertex_color_map[action.related_vertex_id] is None:
             vertex_color_map[action.related_vertex_id] = edge_colors[color_index]
             color_index = (color_index + 1) % len(edge_colors)
 
@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.common.action import CompactAction
+from src.common.grid_map import GridMap
+from src.config.mapf_solution import MapfSolution
+
+MOVES = [(0, 0), (0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+def create_random_solution(seed: int, num_shuttles: int, num_steps: int, grid_size: int) -> MapfSolution:
+    # Shuttles only move into cells that are free at the current and at the next time step, so the plan
+    # has neither vertex nor swap conflicts.
+    rng = np.random.default_rng(seed)
+    cells = rng.choice(grid_size * grid_size, size=num_shuttles, replace=False)
+    positions = [(int(cell) // grid_size, int(cell) % grid_size) for cell in cells]
+    robot_actions = {shuttle_id: [] for shuttle_id in range(num_shuttles)}
+    for time_step in range(num_steps):
+        occupied = set(positions)
+        claimed = set()
+        for shuttle_id, position in enumerate(positions):
+            move = MOVES[rng.integers(len(MOVES))]
+            goal = (position[0] + move[0], position[1] + move[1])
+            if (not (0 <= goal[0] < grid_size and 0 <= goal[1] < grid_size)
+                    or (goal != position and (goal in occupied or goal in claimed))):
+                goal = position
+            claimed.add(goal)
+            robot_actions[shuttle_id].append(CompactAction(position, goal, time_step, shuttle_id))
+            positions[shuttle_id] = goal
+    return MapfSolution(grid_map=GridMap(grid_size_x=grid_size, grid_size_y=grid_size), robot_actions=robot_actions)
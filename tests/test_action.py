@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.vertex_action import VertexAction
+from src.common.action import Action, ActionStatus, CompactAction, STATUS_CODE_COMPLETED, STATUS_CODE_ENQUEUED
+from src.config.mapf_solution import MapfSolution
+from tests.random_solution import create_random_solution
+
+
+def action_fields(action):
+    return (tuple(action.start_s), tuple(action.goal_g), action.time_step_t, action.shuttle_R, action.status,
+            action.related_vertex_id)
+
+
+class TestCompactAction(unittest.TestCase):
+    def test_round_trip_through_action(self):
+        for status in ActionStatus:
+            action = Action(start_s=(1, 2), goal_g=(1, 3), time_step_t=4, shuttle_R=5, status=status,
+                            related_vertex_id=6)
+            compact_action = CompactAction.from_action(action)
+            self.assertEqual(compact_action.status, status)
+            self.assertEqual(compact_action.status_code, action.status_code)
+            self.assertEqual(action_fields(compact_action), action_fields(action))
+
+            restored_action = compact_action.to_action()
+            self.assertIsInstance(restored_action, Action)
+            self.assertEqual(restored_action, action)
+
+    def test_move_status_forward(self):
+        compact_action = CompactAction((0, 0), (0, 1), 0, 0)
+        compact_action.move_status_forward()
+        self.assertEqual(compact_action.status, ActionStatus.ENQUEUED)
+        compact_action.move_status_forward()
+        self.assertEqual(compact_action.status, ActionStatus.COMPLETED)
+        with self.assertRaises(ValueError):
+            compact_action.move_status_forward()
+
+    def test_vertex_action_copies_plan_fields(self):
+        compact_action = CompactAction((0, 0), (0, 1), 3, 2, STATUS_CODE_ENQUEUED, 7)
+        vertex_action = VertexAction(compact_action)
+        self.assertEqual(action_fields(vertex_action)[:5], action_fields(compact_action)[:5])
+        self.assertEqual(vertex_action.related_vertex_id, -1)
+
+        vertex_action.move_status_forward()
+        self.assertEqual(vertex_action.status_code, STATUS_CODE_COMPLETED)
+        self.assertEqual(compact_action.status_code, STATUS_CODE_ENQUEUED)
+        with self.assertRaises(ValueError):
+            vertex_action.move_status_forward()
+
+
+class TestMapfSolutionSerialization(unittest.TestCase):
+    def test_json_round_trip(self):
+        solution = create_random_solution(seed=0, num_shuttles=4, num_steps=6, grid_size=5)
+        solution.robot_actions[0][2].status = ActionStatus.COMPLETED
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "solution.json")
+            solution.to_file(file_path)
+            restored_solution = MapfSolution.from_file(file_path)
+
+        self.assertEqual(restored_solution.grid_map, solution.grid_map)
+        self.assertEqual(list(restored_solution.robot_actions), list(solution.robot_actions))
+        for shuttle_id, actions in solution.robot_actions.items():
+            restored_actions = restored_solution.robot_actions[shuttle_id]
+            self.assertTrue(all(isinstance(action, Action) for action in restored_actions))
+            self.assertEqual([action_fields(action) for action in restored_actions],
+                             [action_fields(action) for action in actions])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, ADGBackend, NaiveDepCreator, SparseCandidatePartitioningDepCreator
+from src.adg.dependency_creator_cpp_wrapper import DepCreationType
+from tests.random_solution import create_random_solution
+
+
+def dependency_set(adg):
+    return set(map(tuple, adg.get_dependencies().tolist()))
+
+
+class TestADGDependencies(unittest.TestCase):
+    def test_bulk_matches_single_insertion(self):
+        mapf_solution = create_random_solution(7, num_shuttles=10, num_steps=20, grid_size=5)
+        for adg_backend in ADGBackend:
+            adg_single = ADGBuilder().create_adg(mapf_solution.get_all_actions(), adg_backend=adg_backend).get_adg()
+            adg_bulk = ADGBuilder().create_adg(mapf_solution.get_all_actions(), adg_backend=adg_backend).get_adg()
+            result = NaiveDepCreator().dep_creator.get_type2_dependencies(adg_single.get_all_actions(),
+                                                                          DepCreationType.EXHAUSTIVE, 1)
+            for vertex_from, vertex_to in result.dependencies.tolist():
+                adg_single.add_dependency(vertex_from, vertex_to)
+
+            adg_bulk.add_dependencies_bulk(result.dependencies)
+            self.assertEqual(dependency_set(adg_bulk), dependency_set(adg_single))
+
+    def test_bulk_rejects_unknown_vertices(self):
+        mapf_solution = create_random_solution(8, num_shuttles=4, num_steps=5, grid_size=4)
+        for adg_backend in ADGBackend:
+            adg = ADGBuilder().create_adg(mapf_solution.get_all_actions(), adg_backend=adg_backend).get_adg()
+            vertex_ids = [action.related_vertex_id for action in adg.get_all_actions()]
+            dependencies = dependency_set(adg)
+            for unknown_id in [-1, max(vertex_ids) + 1]:
+                with self.assertRaises(ValueError):
+                    adg.add_dependencies_bulk(np.array([[vertex_ids[0], vertex_ids[1]], [vertex_ids[0], unknown_id]]))
+            self.assertEqual(dependency_set(adg), dependencies)
+            adg.add_dependencies_bulk(np.zeros((0, 2), dtype=np.int64))
+            self.assertEqual(dependency_set(adg), dependencies)
+
+    def test_dense_vertex_ids(self):
+        mapf_solution = create_random_solution(9, num_shuttles=6, num_steps=10, grid_size=4)
+        adgs = [ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                   adg_backend=adg_backend) for adg_backend in [*ADGBackend, ADGBackend.NETWORKX]]
+        for adg in adgs:
+            self.assertEqual([action.related_vertex_id for action in adg.get_all_actions()],
+                             list(range(adg.num_vertices())))
+        self.assertTrue(adgs[0].has_same_edges(adgs[1]) and adgs[0].has_same_edges(adgs[2]))
+
+        # Vertices added in another order get other ids, the canonical dependencies are the same.
+        reversed_actions = [action for shuttle_R in reversed(list(mapf_solution.robot_actions))
+                            for action in mapf_solution.robot_actions[shuttle_R]]
+        adg_reordered = ADGBuilder().build(reversed_actions, SparseCandidatePartitioningDepCreator())
+        self.assertNotEqual(dependency_set(adg_reordered), dependency_set(adgs[0]))
+        self.assertTrue(adg_reordered.has_same_edges(adgs[0]))
+        adg_reordered.remove_dependency(*adg_reordered.get_dependencies()[0].tolist())
+        self.assertFalse(adg_reordered.has_same_edges(adgs[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
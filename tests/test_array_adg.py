@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+import networkx as nx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, ADGBackend, SparseCandidatePartitioningDepCreator
+from tests.random_solution import create_random_solution
+
+
+def build_both_backends(mapf_solution, skip_wait_actions=False):
+    return [ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                               skip_wait_actions=skip_wait_actions, adg_backend=adg_backend)
+            for adg_backend in ADGBackend]
+
+
+class TestArrayADG(unittest.TestCase):
+    def test_same_api_as_networkx_backend(self):
+        mapf_solution = create_random_solution(10, num_shuttles=8, num_steps=15, grid_size=5)
+        for skip_wait_actions in [False, True]:
+            adg_nx, adg_array = build_both_backends(mapf_solution, skip_wait_actions)
+            self.assertEqual(adg_nx.num_vertices(), adg_array.num_vertices())
+            for vertex_id in range(adg_nx.num_vertices()):
+                action_nx, action_array = adg_nx.get_action(vertex_id), adg_array.get_action(vertex_id)
+                self.assertEqual((action_nx.start_s, action_nx.goal_g, action_nx.time_step_t, action_nx.shuttle_R),
+                                 (action_array.start_s, action_array.goal_g, action_array.time_step_t,
+                                  action_array.shuttle_R))
+                for method in ['get_successors', 'get_predecessors', 'get_neighbors']:
+                    result_nx = getattr(adg_nx, method)(vertex_id)
+                    result_array = getattr(adg_array, method)(vertex_id)
+                    self.assertIsInstance(result_array, list)
+                    self.assertTrue(all(type(neighbor_id) is int for neighbor_id in result_array))
+                    self.assertEqual(sorted(result_nx), sorted(result_array))
+            self.assertTrue(adg_nx.is_acyclic() and adg_array.is_acyclic())
+
+            reversed_nx, reversed_array = adg_nx.reverse_graph(), adg_array.reverse_graph()
+            for vertex_id in range(adg_nx.num_vertices()):
+                self.assertEqual(sorted(reversed_array.get_successors(vertex_id)),
+                                 sorted(adg_nx.get_predecessors(vertex_id)))
+                self.assertEqual(sorted(reversed_nx.get_successors(vertex_id)),
+                                 sorted(reversed_array.get_successors(vertex_id)))
+
+    def test_errors_and_read_only_graph(self):
+        mapf_solution = create_random_solution(11, num_shuttles=4, num_steps=6, grid_size=4)
+        adg_nx, adg_array = build_both_backends(mapf_solution)
+        for adg in [adg_nx, adg_array]:
+            with self.assertRaises(ValueError):
+                adg.add_dependency(0, adg.num_vertices())
+            with self.assertRaises(ValueError):
+                adg.get_successors(adg.num_vertices())
+
+        # Both adjacency structures are only changed through the ADG methods.
+        self.assertEqual(set(adg_array.graph.edges()), set(adg_nx.graph.edges()))
+        with self.assertRaises(nx.NetworkXError):
+            adg_array.graph.add_edge(0, 1)
+
+        # A cycle is found by both backends.
+        last_vertex_id = adg_nx.num_vertices() - 1
+        for adg in [adg_nx, adg_array]:
+            adg.add_dependency(last_vertex_id, 0)
+            adg.add_dependency(0, last_vertex_id)
+            self.assertFalse(adg.is_acyclic())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.common.grid_map import GridMap, CELL_UNPASSABLE_VALUE
+from src.evaluation.benchmark_pool import BenchmarkPool, attach_grid_map
+
+
+def count_obstacles(grid_map_handle, scale):
+    return attach_grid_map(grid_map_handle).get_num_unpassable_cells() * scale
+
+
+class TestBenchmarkPool(unittest.TestCase):
+    def test_shared_grid_map(self):
+        grid_map = GridMap(grid_size_x=3, grid_size_y=5)
+        grid_map.update_pos(0, 4, CELL_UNPASSABLE_VALUE)
+        grid_map.update_pos(2, 1, CELL_UNPASSABLE_VALUE)
+        with BenchmarkPool(2) as pool:
+            grid_map_handle = pool.share_grid_map(grid_map)
+            self.assertEqual(attach_grid_map(grid_map_handle).MAP, grid_map.MAP)
+            results = dict(pool.imap_largest_first(count_obstacles, [(grid_map_handle, 1), (grid_map_handle, 10)],
+                                                   [1, 1]))
+        self.assertEqual(results, {0: 2, 1: 20})
+
+    def test_largest_first(self):
+        with BenchmarkPool(1) as pool:
+            grid_map_handle = pool.share_grid_map(GridMap(grid_size_x=2, grid_size_y=2))
+            task_sizes = [10, 80, 20, 40]
+            finished = [task_idx for task_idx, _ in
+                        pool.imap_largest_first(count_obstacles, [(grid_map_handle, 1)] * 4, task_sizes)]
+        self.assertEqual(finished, [1, 3, 2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
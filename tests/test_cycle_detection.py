@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+import networkx as nx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, ADGBackend, SparseCandidatePartitioningDepCreator
+from src.adg.cycle_detection import find_dependency_cycle
+from tests.random_solution import create_random_solution
+
+
+def assert_is_cycle(test_case, cycle, edges):
+    test_case.assertEqual(len(set(cycle)), len(cycle))
+    for vertex_from, vertex_to in zip(cycle, cycle[1:] + cycle[:1]):
+        test_case.assertIn((vertex_from, vertex_to), edges)
+
+
+class TestCycleDetection(unittest.TestCase):
+    def test_matches_networkx_with_witness(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            num_vertices = int(rng.integers(1, 12))
+            num_edges = int(rng.integers(0, 20))
+            edges_from = rng.integers(0, num_vertices, size=num_edges)
+            edges_to = rng.integers(0, num_vertices, size=num_edges)
+            # Mostly forward in time, sometimes with equal-time or backward dependencies.
+            time_step_t = rng.integers(0, 4, size=num_vertices)
+            for times in [None, time_step_t]:
+                graph = nx.DiGraph()
+                graph.add_nodes_from(range(num_vertices))
+                graph.add_edges_from(zip(edges_from.tolist(), edges_to.tolist()))
+                cycle = find_dependency_cycle(num_vertices, edges_from, edges_to, times)
+                self.assertEqual(cycle is None, nx.is_directed_acyclic_graph(graph))
+                if cycle is not None:
+                    assert_is_cycle(self, cycle, set(graph.edges()))
+
+    def test_build_reports_witness(self):
+        mapf_solution = create_random_solution(6, num_shuttles=8, num_steps=15, grid_size=5)
+        for adg_backend in ADGBackend:
+            adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                     adg_backend=adg_backend)
+            self.assertIsNone(adg.find_cycle())
+
+            # Two actions of different shuttles at the same time step that wait for each other.
+            first_id, second_id = [next(action.related_vertex_id for action in adg.get_all_actions()
+                                        if action.shuttle_R == shuttle_R and action.time_step_t == 3)
+                                   for shuttle_R in [0, 1]]
+            adg.add_dependency(first_id, second_id)
+            adg.add_dependency(second_id, first_id)
+            self.assertFalse(adg.is_acyclic())
+            assert_is_cycle(self, adg.find_cycle(), set(map(tuple, adg.get_dependencies().tolist())))
+
+
+if __name__ == '__main__':
+    unittest.main()
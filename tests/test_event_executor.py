@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, SparseCandidatePartitioningDepCreator
+from src.adg_simulation.adg_simulation import adg_simulation, SimulationExecutor, schedule_path_segments
+from src.adg_simulation.event_executor import ADGEventExecutor
+from src.adg_simulation.shuttle import FPS, EPS, EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME
+from tests.random_solution import create_random_solution
+
+
+class TestADGEventExecutor(unittest.TestCase):
+    def test_same_makespan_as_simpy(self):
+        for seed in range(4):
+            mapf_solution = create_random_solution(seed, num_shuttles=25, num_steps=30, grid_size=8)
+            for skip_wait_actions in [False, True]:
+                makespans = [adg_simulation(mapf_solution, SparseCandidatePartitioningDepCreator(),
+                                            check_collision=True, skip_wait_actions=skip_wait_actions,
+                                            store_shuttle_path_results=False, executor=executor)
+                             for executor in SimulationExecutor]
+                self.assertEqual(len(set(makespans)), 1)
+
+    def test_schedule_matches_event_loop(self):
+        for seed in range(20):
+            mapf_solution = create_random_solution(seed, num_shuttles=2 + seed % 10, num_steps=20, grid_size=4)
+            for skip_wait_actions in [False, True]:
+                adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                         skip_wait_actions=skip_wait_actions)
+                execution_result = ADGEventExecutor(adg, mapf_solution.robot_actions.keys(),
+                                                    store_path_segments=True).run()
+                schedule = adg.compute_execution_schedule(EXECUTION_TIME, CONSECUTIVE_MOVE_EXECUTION_TIME, FPS, EPS)
+                path_segments = schedule_path_segments(adg, schedule.start_times, schedule.durations)
+
+                self.assertEqual(schedule.makespan, execution_result.sim_end_time)
+                for shuttle_id, segments in execution_result.path_segments.items():
+                    self.assertEqual(path_segments.get(shuttle_id, []), segments)
+
+    def test_rejects_storing_paths(self):
+        mapf_solution = create_random_solution(0, num_shuttles=2, num_steps=3, grid_size=4)
+        for executor in [SimulationExecutor.EVENT_LOOP, SimulationExecutor.SCHEDULE]:
+            with self.assertRaises(ValueError):
+                adg_simulation(mapf_solution, SparseCandidatePartitioningDepCreator(), store_shuttle_path_results=True,
+                               executor=executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.array_adg import ArrayADG
+from src.adg.create_adg import ADGBuilder, ADGBackend, SparseCandidatePartitioningDepCreator
+from src.adg.incremental_adg_builder import IncrementalADGBuilder
+from tests.random_solution import create_random_solution
+
+CHUNK_TIME_STEPS = 4
+
+
+def append_batches(mapf_solution, order: str):
+    robot_actions = mapf_solution.robot_actions
+    match order:
+        case "time_ordered":
+            return [mapf_solution.get_all_actions()]
+        case "per_shuttle":
+            # Later shuttles append actions that arrive before actions of earlier shuttles.
+            return [robot_actions[shuttle_R] for shuttle_R in reversed(list(robot_actions))]
+        case "time_step_chunks":
+            all_actions = mapf_solution.get_all_actions()
+            last_time_step = max(action.time_step_t for action in all_actions)
+            return [[action for action in all_actions if first_t <= action.time_step_t < first_t + CHUNK_TIME_STEPS]
+                    for first_t in range(0, last_time_step + 1, CHUNK_TIME_STEPS)]
+
+
+class TestIncrementalADGBuilder(unittest.TestCase):
+    def test_same_edges_as_batch_build(self):
+        num_compared = 0
+        for seed in range(6):
+            mapf_solution = create_random_solution(20 + seed, num_shuttles=10, num_steps=16, grid_size=5)
+            for skip_wait_actions in [False, True]:
+                try:
+                    adg_batch = ADGBuilder().build(mapf_solution.get_all_actions(),
+                                                   SparseCandidatePartitioningDepCreator(),
+                                                   skip_wait_actions=skip_wait_actions)
+                except ValueError:
+                    continue
+                for adg_backend in ADGBackend:
+                    for order in ["time_ordered", "per_shuttle", "time_step_chunks"]:
+                        builder = IncrementalADGBuilder(skip_wait_actions=skip_wait_actions, adg_backend=adg_backend)
+                        for actions in append_batches(mapf_solution, order):
+                            builder.append_actions(actions)
+                        adg = builder.get_adg()
+                        self.assertEqual(adg.num_vertices(), adg_batch.num_vertices())
+                        self.assertTrue(adg.has_same_edges(adg_batch), f"{seed} {order} {adg_backend.name}")
+                        num_compared += 1
+        self.assertGreater(num_compared, 0)
+
+    def test_retargeting_does_not_compact_array_backend(self):
+        mapf_solution = create_random_solution(30, num_shuttles=10, num_steps=16, grid_size=5)
+        builder = IncrementalADGBuilder(adg_backend=ADGBackend.ARRAY)
+        with mock.patch.object(ArrayADG, '_ensure_adjacency', autospec=True,
+                               side_effect=ArrayADG._ensure_adjacency) as ensure_adjacency:
+            with mock.patch.object(ArrayADG, 'remove_dependency', autospec=True,
+                                   side_effect=ArrayADG.remove_dependency) as remove_dependency:
+                for actions in append_batches(mapf_solution, "per_shuttle"):
+                    builder.append_actions(actions)
+        # The first removal builds the dependency set once, later removals do not compact.
+        self.assertGreater(remove_dependency.call_count, 1)
+        self.assertEqual(ensure_adjacency.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
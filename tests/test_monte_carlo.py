@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+
+import networkx as nx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, SparseCandidatePartitioningDepCreator
+from src.adg_simulation.adg_simulation import adg_simulation, SimulationExecutor
+from src.adg_simulation.monte_carlo import (ExecutionUncertaintyConfig, DelayDistribution, ScheduleGraph,
+                                            adg_monte_carlo, run_monte_carlo)
+from tests.random_solution import create_random_solution
+
+
+def reference_finish_times(adg, durations):
+    finish = {}
+    for vertex_id in nx.topological_sort(adg.graph):
+        start = max((finish[predecessor_id] for predecessor_id in adg.get_predecessors(vertex_id)), default=0.0)
+        finish[vertex_id] = start + durations[vertex_id]
+    return finish
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def test_without_delays_matches_simulation(self):
+        mapf_solution = create_random_solution(1, num_shuttles=12, num_steps=25, grid_size=6)
+        config = ExecutionUncertaintyConfig(delay_probability=0.0, num_samples=5)
+        for skip_wait_actions in [False, True]:
+            makespan = adg_simulation(mapf_solution, SparseCandidatePartitioningDepCreator(), check_collision=False,
+                                      skip_wait_actions=skip_wait_actions, store_shuttle_path_results=False,
+                                      executor=SimulationExecutor.SCHEDULE)
+            result = adg_monte_carlo(mapf_solution, SparseCandidatePartitioningDepCreator(),
+                                     skip_wait_actions=skip_wait_actions, config=config)
+            self.assertAlmostEqual(result.nominal_makespan, makespan, places=6)
+            self.assertEqual(result.makespans, [result.nominal_makespan] * 5)
+            self.assertTrue(all(delay == 0.0 for delay in result.mean_shuttle_delay.values()))
+
+    def test_levels_match_sequential_longest_path(self):
+        mapf_solution = create_random_solution(2, num_shuttles=10, num_steps=20, grid_size=5)
+        adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator())
+        actions = adg.get_all_actions()
+        rng = np.random.default_rng(0)
+        durations = rng.uniform(0.5, 2.0, size=(3, len(actions)))
+        graph = ScheduleGraph.from_adg(adg, {action.related_vertex_id: 1.0 for action in actions})
+
+        finish = graph.finish_times(durations)
+        for sample in range(len(durations)):
+            expected = reference_finish_times(adg, {action.related_vertex_id: durations[sample, idx]
+                                                    for idx, action in enumerate(actions)})
+            np.testing.assert_allclose(finish[sample], [expected[action.related_vertex_id] for action in actions])
+
+    def test_result_does_not_depend_on_processes(self):
+        mapf_solution = create_random_solution(3, num_shuttles=8, num_steps=15, grid_size=5)
+        adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                 skip_wait_actions=True)
+        results = [run_monte_carlo(adg, ExecutionUncertaintyConfig(distribution=DelayDistribution.LOGNORMAL,
+                                                                   num_samples=50, samples_per_batch=8,
+                                                                   num_processes=num_processes, seed=7))
+                   for num_processes in [1, 2]]
+        self.assertEqual(results[0], results[1])
+        self.assertGreaterEqual(min(results[0].makespans), results[0].nominal_makespan)
+
+
+if __name__ == '__main__':
+    unittest.main()
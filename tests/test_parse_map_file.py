@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mapf_benchmark.parse_map_file import parse_map_file
+from src.common.grid_map import CELL_FREE_VALUE, CELL_UNPASSABLE_VALUE
+
+MAP_CONTENT = "type octile\nheight 3\nwidth 4\nmap\n..@.\nTGS.\n.W\n"
+EXPECTED_MAP = [[CELL_FREE_VALUE, CELL_FREE_VALUE, CELL_UNPASSABLE_VALUE, CELL_FREE_VALUE],
+                [CELL_UNPASSABLE_VALUE, CELL_FREE_VALUE, CELL_FREE_VALUE, CELL_FREE_VALUE],
+                [CELL_FREE_VALUE, CELL_UNPASSABLE_VALUE, CELL_FREE_VALUE, CELL_FREE_VALUE]]
+
+
+class TestParseMapFile(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.map_file = Path(temp_dir.name) / "test.map"
+        self.map_file.write_text(MAP_CONTENT)
+        self.cache_dir = Path(temp_dir.name) / "cache"
+
+    def test_parse(self):
+        grid_map = parse_map_file(self.map_file, use_cache=False)
+        self.assertEqual((grid_map.grid_size_x, grid_map.grid_size_y), (3, 4))
+        self.assertEqual(grid_map.MAP, EXPECTED_MAP)
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_cache_is_invalidated_by_mtime(self):
+        self.assertEqual(parse_map_file(self.map_file, cache_dir=self.cache_dir).MAP, EXPECTED_MAP)
+        self.assertEqual(parse_map_file(self.map_file, cache_dir=self.cache_dir).MAP, EXPECTED_MAP)
+        self.assertEqual(len(list(self.cache_dir.glob("*.npy"))), 1)
+
+        self.map_file.write_text(MAP_CONTENT.replace("..@.", "...."))
+        os.utime(self.map_file, ns=(0, self.map_file.stat().st_mtime_ns + 1))
+        self.assertEqual(parse_map_file(self.map_file, cache_dir=self.cache_dir).MAP[0], [CELL_FREE_VALUE] * 4)
+        self.assertEqual(len(list(self.cache_dir.glob("*.npy"))), 1)
+
+    def test_unknown_terrain(self):
+        self.map_file.write_text(MAP_CONTENT.replace("TGS.", "TGX."))
+        with self.assertRaises(ValueError):
+            parse_map_file(self.map_file, use_cache=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
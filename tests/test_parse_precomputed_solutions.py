@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from mapf_benchmark.parse_precomputed_solutions import (ColumnarPlan, load_precomputed_solution_columns,
+                                                        parse_precomputed_solution)
+
+# Shuttle ids out of order, with waits at the start, in the middle and at the end of a path.
+STORED_ACTIONS = {"3": [[0, 0], [0, 1], [0, 1], [1, 1]],
+                  "0": [[2, 2], [2, 2], [2, 3]],
+                  "7": [[4, 0], [3, 0], [3, 1], [3, 2], [3, 2]]}
+
+
+def action_fields(shuttle_actions):
+    return {int(shuttle_id): [(tuple(action.start_s), tuple(action.goal_g), action.time_step_t, action.shuttle_R)
+                              for action in actions]
+            for shuttle_id, actions in shuttle_actions.items()}
+
+
+def plan_columns(plan: ColumnarPlan):
+    return {name: column.tolist() for name, column in plan.__dict__.items()}
+
+
+class TestColumnarPlan(unittest.TestCase):
+    def test_matches_parse_precomputed_solution(self):
+        plan = ColumnarPlan.from_stored_actions(STORED_ACTIONS)
+        self.assertEqual(plan.num_actions(), 12)
+        self.assertEqual(plan.shuttle_ids.tolist(), [3, 0, 7])
+        self.assertEqual(action_fields(plan.to_shuttle_actions()),
+                         action_fields(parse_precomputed_solution(STORED_ACTIONS)))
+
+    def test_to_action_columns(self):
+        plan = ColumnarPlan.from_stored_actions(STORED_ACTIONS)
+        expected_actions = [action for actions in parse_precomputed_solution(STORED_ACTIONS).values()
+                            for action in actions]
+        for skip_wait_actions in (False, True):
+            with self.subTest(skip_wait_actions=skip_wait_actions):
+                columns = plan.to_action_columns(skip_wait_actions)
+                actions = [action for action in expected_actions
+                           if action.is_move_action() or not skip_wait_actions]
+                self.assertEqual(list(zip(*[column.tolist() for column in columns.as_tuple()])),
+                                 [(*action.start_s, *action.goal_g, action.time_step_t, action.shuttle_R, vertex_id)
+                                  for vertex_id, action in enumerate(actions)])
+
+
+class TestLoadPrecomputedSolutionColumns(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.solution_file = Path(temp_dir.name) / "solution.json"
+        self.solution_file.write_text(json.dumps(STORED_ACTIONS))
+        self.cache_dir = Path(temp_dir.name) / "cache"
+
+    def load(self):
+        return load_precomputed_solution_columns(self.solution_file, cache_dir=self.cache_dir)
+
+    def test_without_cache(self):
+        plan = load_precomputed_solution_columns(self.solution_file, use_cache=False, cache_dir=self.cache_dir)
+        self.assertEqual(plan_columns(plan), plan_columns(ColumnarPlan.from_stored_actions(STORED_ACTIONS)))
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_cache_hit(self):
+        plan = self.load()
+        self.assertEqual(len(list(self.cache_dir.glob("*.npz"))), 1)
+        with mock.patch.object(ColumnarPlan, 'from_stored_actions') as from_stored_actions:
+            cached_plan = self.load()
+        from_stored_actions.assert_not_called()
+        self.assertEqual(plan_columns(cached_plan), plan_columns(plan))
+        self.assertTrue(all(column.dtype == np.int32 for column in cached_plan.__dict__.values()))
+
+    def test_cache_is_invalidated_by_mtime(self):
+        first_plan = self.load()
+        stale_file = next(self.cache_dir.glob("*.npz"))
+
+        changed_actions = dict(STORED_ACTIONS, **{"0": [[2, 2], [1, 2]]})
+        self.solution_file.write_text(json.dumps(changed_actions))
+        os.utime(self.solution_file, ns=(0, self.solution_file.stat().st_mtime_ns + 1))
+        plan = self.load()
+        self.assertEqual(plan_columns(plan), plan_columns(ColumnarPlan.from_stored_actions(changed_actions)))
+        self.assertNotEqual(plan_columns(plan), plan_columns(first_plan))
+
+        # The entry of the previous version is removed when the new one is written.
+        cache_files = list(self.cache_dir.glob("*.npz"))
+        self.assertEqual(len(cache_files), 1)
+        self.assertNotEqual(cache_files[0], stale_file)
+        self.assertFalse(stale_file.exists())
+
+    def test_other_solution_files_are_kept(self):
+        self.load()
+        other_file = self.solution_file.with_name("other.json")
+        other_file.write_text(json.dumps({"1": [[0, 0], [1, 0]]}))
+        load_precomputed_solution_columns(other_file, cache_dir=self.cache_dir)
+        self.assertEqual(len(list(self.cache_dir.glob("*.npz"))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import networkx as nx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, ADGBackend, NaiveDepCreator, SparseCandidatePartitioningDepCreator
+from src.adg.dependency_creator_cpp_wrapper import DepCreationType
+from src.adg.reachability import (MAX_PENDING_DEPENDENCIES, ChainReachabilityIndex,
+                                  CompressedChainReachabilityIndex)
+from tests.random_solution import create_random_solution
+
+
+def assert_reachability_matches(test_case, adg, vertex_ids):
+    closure = {vertex_id: nx.descendants(adg.graph, vertex_id) | {vertex_id} for vertex_id in vertex_ids}
+    for source_id in vertex_ids:
+        for target_id in vertex_ids:
+            test_case.assertEqual(adg.is_reachable(source_id, target_id), target_id in closure[source_id])
+
+
+class TestReachability(unittest.TestCase):
+    def test_index_matches_path_search(self):
+        mapf_solution = create_random_solution(4, num_shuttles=8, num_steps=15, grid_size=5)
+        for adg_backend in ADGBackend:
+            adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                     skip_wait_actions=True, adg_backend=adg_backend)
+            vertex_ids = [action.related_vertex_id for action in adg.get_all_actions()]
+            assert_reachability_matches(self, adg, vertex_ids)
+            self.assertIsNotNone(adg._reachability_index)
+
+    def test_incremental_updates(self):
+        for adg_backend in ADGBackend:
+            self.check_incremental_updates(ChainReachabilityIndex, adg_backend)
+
+    def test_compressed_index_matches_dense_index(self):
+        for seed, (num_shuttles, num_steps, grid_size) in enumerate([(8, 15, 5), (20, 25, 8), (40, 10, 9)]):
+            mapf_solution = create_random_solution(seed, num_shuttles=num_shuttles, num_steps=num_steps,
+                                                   grid_size=grid_size)
+            for skip_wait_actions in (False, True):
+                adg = ADGBuilder().build(mapf_solution.get_all_actions(), SparseCandidatePartitioningDepCreator(),
+                                         skip_wait_actions=skip_wait_actions)
+                actions, dependencies = adg.get_all_actions(), adg.get_dependencies()
+                dense_index = ChainReachabilityIndex.from_dependencies(actions, dependencies)
+                # Blocks of a few shuttles, so the compressed index is assembled from several of them.
+                with mock.patch('src.adg.reachability.REDUCTION_BLOCK_ELEMENTS', 3 * len(actions)):
+                    compressed_index = CompressedChainReachabilityIndex.from_dependencies(actions, dependencies)
+                self.assertLess(len(compressed_index.change_keys), dense_index.earliest.size)
+
+                for source_id in range(len(actions)):
+                    descendants = nx.descendants(adg.graph, source_id) | {source_id}
+                    for target_id in range(len(actions)):
+                        is_reachable = compressed_index.is_reachable(source_id, target_id)
+                        self.assertEqual(is_reachable, dense_index.is_reachable(source_id, target_id))
+                        self.assertEqual(is_reachable, target_id in descendants)
+
+    def test_compressed_incremental_updates(self):
+        with mock.patch('src.adg.reachability.DENSE_REACHABILITY_ELEMENTS', 0):
+            for adg_backend in ADGBackend:
+                self.check_incremental_updates(CompressedChainReachabilityIndex, adg_backend)
+
+    def check_incremental_updates(self, index_type, adg_backend):
+        mapf_solution = create_random_solution(5, num_shuttles=8, num_steps=15, grid_size=5)
+        adg = ADGBuilder().create_adg(mapf_solution.get_all_actions(), adg_backend=adg_backend).get_adg()
+        vertex_ids = [action.related_vertex_id for action in adg.get_all_actions()]
+        self.assertFalse(adg.is_reachable(vertex_ids[-1], vertex_ids[0]))
+        index = adg._reachability_index
+        self.assertIsInstance(index, index_type)
+
+        # The dependencies are added one by one, the index built before is updated in place.
+        dep_creator = NaiveDepCreator().dep_creator
+        result = dep_creator.get_type2_dependencies(adg.get_all_actions(), DepCreationType.EXHAUSTIVE, 1)
+        dependencies = result.dependencies.tolist()
+        self.assertGreater(len(dependencies), 2 * MAX_PENDING_DEPENDENCIES)
+        for dependency_idx, (vertex_from, vertex_to) in enumerate(dependencies):
+            adg.add_dependency(vertex_from, vertex_to)
+            if dependency_idx == MAX_PENDING_DEPENDENCIES // 2:
+                assert_reachability_matches(self, adg, vertex_ids)
+        self.assertIs(adg._reachability_index, index)
+        assert_reachability_matches(self, adg, vertex_ids)
+
+        # A dependency closing a cycle drops the index, queries are answered by a path search.
+        shuttle_R = adg.get_action(vertex_ids[0]).shuttle_R
+        source_id = [vertex_id for vertex_id in vertex_ids if adg.get_action(vertex_id).shuttle_R == shuttle_R][-1]
+        target_id = vertex_ids[0]
+        adg.add_dependency(source_id, target_id)
+        self.assertIsNone(adg._reachability_index)
+        self.assertTrue(adg.is_reachable(source_id, target_id) and adg.is_reachable(target_id, source_id))
+
+if __name__ == '__main__':
+    unittest.main()
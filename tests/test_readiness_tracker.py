@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.adg import ADG
+from src.adg.readiness_tracker import ReadinessTracker
+from src.adg.vertex_action import VertexAction
+from src.common.action import Action, ActionStatus
+
+
+def create_adg():
+    # Shuttles 0, 1 and 2 with two actions each. b1 waits for a0 and c0 waits for b0 (type-2).
+    adg = ADG()
+    actions = {}
+    for shuttle_R, name in enumerate("abc"):
+        for time_step in range(2):
+            action = VertexAction(Action.new_action((shuttle_R, time_step), (shuttle_R, time_step + 1), time_step,
+                                                    shuttle_R))
+            adg.add_action(action)
+            actions[f"{name}{time_step}"] = action
+        adg.add_dependency(actions[f"{name}0"].related_vertex_id, actions[f"{name}1"].related_vertex_id)
+    adg.add_dependency(actions["a0"].related_vertex_id, actions["b1"].related_vertex_id)
+    adg.add_dependency(actions["b0"].related_vertex_id, actions["c0"].related_vertex_id)
+    return adg, actions
+
+
+def names_of(actions, selected):
+    return [name for selected_action in selected for name, action in actions.items() if action is selected_action]
+
+
+class TestReadinessTracker(unittest.TestCase):
+    def test_counters_and_ready_set(self):
+        adg, actions = create_adg()
+        tracker = ReadinessTracker(adg)
+        type1 = {name: tracker.pending_type1_predecessors[action.related_vertex_id] for name, action in actions.items()}
+        type2 = {name: tracker.unsatisfied_type2_predecessors[action.related_vertex_id]
+                 for name, action in actions.items()}
+        self.assertEqual(type1, {"a0": 0, "a1": 1, "b0": 0, "b1": 1, "c0": 0, "c1": 1})
+        self.assertEqual(type2, {"a0": 0, "a1": 0, "b0": 0, "b1": 1, "c0": 1, "c1": 0})
+        self.assertEqual(names_of(actions, tracker.ready_actions), ["a0", "b0"])
+
+        # Enqueuing a0 frees its type-1 successor a1, b1 still waits for a0 to complete.
+        self.assertEqual(names_of(actions, tracker.enqueue_ready_actions()), ["a0", "b0", "a1"])
+        self.assertFalse(tracker.is_action_equable(actions["b1"]))
+        self.assertEqual(tracker.pending_type1_predecessors[actions["b1"].related_vertex_id], 0)
+
+        self.assertEqual(names_of(actions, tracker.complete_action(actions["b0"])), ["c0", "c1"])
+        self.assertEqual(names_of(actions, tracker.complete_action(actions["a0"])), ["b1"])
+        self.assertEqual(tracker.unsatisfied_type2_predecessors[actions["b1"].related_vertex_id], 0)
+        with self.assertRaises(ValueError):
+            tracker.mark_completed(actions["a0"])
+
+    def test_same_instant_completions_are_drained_together(self):
+        adg, actions = create_adg()
+        tracker = ReadinessTracker(adg)
+        tracker.enqueue_ready_actions()
+        tracker.mark_completed(actions["a0"])
+        tracker.mark_completed(actions["b0"])
+        self.assertEqual(names_of(actions, tracker.enqueue_ready_actions()), ["b1", "c0", "c1"])
+        self.assertEqual(tracker.enqueue_ready_actions(), [])
+        self.assertTrue(all(action.status == ActionStatus.ENQUEUED for name, action in actions.items()
+                            if name in ["a1", "b1", "c0", "c1"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import unittest
+from typing import Dict, List, Tuple
+
+import numpy as np
+from shapely.geometry import box
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.common.grid_map import GridMap
+from src.common.rect_collision import check_rectangle_collision
+from src.config import simulation_result_config
+from src.config.simulation_result_config import SimulationResultConfig
+
+
+def shapely_rectangle_collision(rect_positions: Dict[int, Tuple[float, float]], rect_size_x: float,
+                                rect_size_y: float, eps: float = 1e-8) -> List[Tuple[int, int]]:
+    robot_ids = list(rect_positions.keys())
+    rectangles = [box(x, y, x + rect_size_x, y + rect_size_y).buffer(-eps) for x, y in rect_positions.values()]
+    return [(robot_ids[i], robot_ids[j]) for i in range(len(robot_ids)) for j in range(i + 1, len(robot_ids))
+            if rectangles[i].intersects(rectangles[j])]
+
+
+def shapely_collisions_in_paths(paths: Dict[int, np.ndarray]) -> List[Tuple[int, int, int]]:
+    total_frames = max(len(path) for path in paths.values())
+    collisions = []
+    for frame in range(total_frames):
+        robot_positions = {robot_id: path[min(frame, len(path) - 1)] for robot_id, path in paths.items()}
+        collisions += [(frame, id_1, id_2) for id_1, id_2 in shapely_rectangle_collision(robot_positions, 1.0, 1.0)]
+    return collisions
+
+
+class TestRectangleCollision(unittest.TestCase):
+    def test_matches_shapely_on_random_positions(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            num_robots = int(rng.integers(1, 40))
+            # Half of the positions are on the grid, so touching rectangles are covered as well.
+            positions = rng.uniform(-3.0, 8.0, size=(num_robots, 2))
+            positions[::2] = np.round(positions[::2])
+            rect_positions = {int(robot_id): tuple(position)
+                              for robot_id, position in zip(rng.permutation(100)[:num_robots], positions)}
+            for rect_size in [(1.0, 1.0), (0.5, 2.0)]:
+                self.assertListEqual(shapely_rectangle_collision(rect_positions, *rect_size),
+                                     check_rectangle_collision(rect_positions, *rect_size))
+
+    def test_paths_hold_last_position(self):
+        rng = np.random.default_rng(1)
+        paths = {robot_id: np.cumsum(rng.uniform(-0.2, 0.2, size=(int(rng.integers(1, 120)), 2)), axis=0)
+                 + rng.integers(0, 6, size=2)
+                 for robot_id in [7, 3, 11, 0, 5, 9]}
+        config = SimulationResultConfig(paths=paths, fps=60, grid_map=GridMap(grid_size_x=8, grid_size_y=8))
+
+        expected = shapely_collisions_in_paths(config.paths)
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual(expected, config.check_collisions_in_paths())
+
+        # Frame chunks that split the paths at different places.
+        self.addCleanup(setattr, simulation_result_config, 'COLLISION_CHECK_CHUNK_SIZE',
+                        simulation_result_config.COLLISION_CHECK_CHUNK_SIZE)
+        for chunk_size in [1, 13, 64]:
+            simulation_result_config.COLLISION_CHECK_CHUNK_SIZE = chunk_size
+            self.assertListEqual(expected, config.check_collisions_in_paths())
+
+    def test_no_collision_for_adjacent_cells(self):
+        paths = {0: [(0.0, 0.0), (1.0, 0.0)], 1: [(1.0, 1.0), (2.0, 1.0), (2.0, 0.0)]}
+        config = SimulationResultConfig(paths=paths, fps=60, grid_map=GridMap(grid_size_x=3, grid_size_y=3))
+        self.assertListEqual([], config.check_collisions_in_paths())
+
+
+if __name__ == '__main__':
+    unittest.main()
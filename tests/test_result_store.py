@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.common.result_store import JsonlResultStore, ResultRecord
+
+
+def create_record(iteration: int, method: str, result) -> ResultRecord:
+    return ResultRecord(map_name="random-32-32-20", num_agents=10, solution_file="init-random-32-32-20-s1-10.json",
+                        iteration=iteration, method=method, result=result)
+
+
+class TestJsonlResultStore(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.store = JsonlResultStore(Path(temp_dir.name) / "results.jsonl")
+
+    def test_append_and_read(self):
+        self.assertEqual(self.store.read_records(), [])
+        records = [create_record(0, "with_wait", 38.0),
+                   create_record(0, "scp", {"elapsed_time": 0.5, "created_type2_dependencies": 29})]
+        self.store.append(records[:1])
+        self.store.append(records[1:])
+
+        self.assertEqual(self.store.read_records(), records)
+        self.assertIsInstance(self.store.read_records()[1].result["created_type2_dependencies"], int)
+        self.assertEqual(self.store.completed_keys(), {record.key() for record in records})
+
+    def test_skips_cut_off_line(self):
+        self.store.append([create_record(0, "with_wait", 38.0), create_record(0, "without_wait", 37.0)])
+        content = self.store.file_path.read_text()
+        self.store.file_path.write_text(content[:-10])
+
+        self.assertEqual([record.method for record in self.store.read_records()], ["with_wait"])
+        self.store.append([create_record(1, "with_wait", 39.0)])
+        self.assertEqual([(record.iteration, record.method) for record in self.store.read_records()],
+                         [(0, "with_wait"), (1, "with_wait")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.common.rect_collision import find_rectangle_collisions
+from src.common.segment_collision import find_segment_collisions
+
+
+def sample_positions(segments_per_robot, sample_times):
+    positions = np.empty((len(sample_times), len(segments_per_robot), 2))
+    for robot_idx, segments in enumerate(segments_per_robot.values()):
+        position = np.full((len(sample_times), 2), segments[0][2], dtype=float)
+        for t_start, t_end, start, goal in segments:
+            progress = np.clip((sample_times - t_start) / (t_end - t_start), 0.0, 1.0)[:, None]
+            moved = sample_times >= t_start
+            position[moved] = (np.array(start) + progress * (np.array(goal) - np.array(start)))[moved]
+        positions[:, robot_idx] = position
+    return positions
+
+
+def random_segments(rng, num_robots, num_segments, grid_size):
+    segments_per_robot = {}
+    for robot_id in rng.permutation(3 * num_robots)[:num_robots].tolist():
+        position = tuple(rng.integers(0, grid_size, size=2).tolist())
+        t = float(rng.uniform(0.0, 2.0))
+        segments = []
+        for _ in range(num_segments):
+            step = [(0, 1), (0, -1), (1, 0), (-1, 0), (0, 0)][rng.integers(5)]
+            goal = (position[0] + step[0], position[1] + step[1])
+            duration = float(rng.choice([0.8, 1.0]))
+            segments.append((t, t + duration, position, goal))
+            t += duration + float(rng.choice([0.0, 0.0, rng.uniform(0.0, 1.5)]))
+            position = goal
+        segments_per_robot[robot_id] = segments
+    return segments_per_robot
+
+
+class TestSegmentCollision(unittest.TestCase):
+    def test_swapping_robots_collide(self):
+        segments = {4: [(0.0, 1.0, (0, 0), (1, 0))], 2: [(0.0, 1.0, (1, 0), (0, 0))]}
+        collisions = find_segment_collisions(segments)
+        self.assertEqual(1, len(collisions))
+        self.assertEqual((4, 2), collisions[0][1:])
+        self.assertLess(collisions[0][0], 1e-6)
+
+    def test_following_robot_does_not_collide(self):
+        segments = {0: [(0.0, 0.8, (1, 0), (2, 0)), (0.8, 1.6, (2, 0), (3, 0))],
+                    1: [(0.8, 1.6, (0, 0), (1, 0)), (1.6, 2.4, (1, 0), (2, 0))]}
+        self.assertListEqual([], find_segment_collisions(segments))
+
+    def test_collision_with_held_positions(self):
+        # Robot 3 waits at its start before its first segment, robot 0 stays at its goal after its last one.
+        segments = {0: [(0.0, 1.0, (0, 0), (1, 0))], 3: [(2.0, 3.0, (1, 0), (1, 1))],
+                    2: [(3.0, 4.0, (3, 0), (2, 0)), (4.0, 5.0, (2, 0), (1, 0))]}
+        collisions = find_segment_collisions(segments)
+        self.assertListEqual([(0, 3), (0, 2)], [collision[1:] for collision in collisions])
+        self.assertLess(collisions[0][0], 1e-6)
+        self.assertAlmostEqual(4.0, collisions[1][0])
+
+    def test_contains_all_sampled_collisions(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            segments_per_robot = random_segments(rng, num_robots=12, num_segments=10, grid_size=5)
+            robot_ids = list(segments_per_robot.keys())
+            collisions = {(robot_id_1, robot_id_2): collision_time
+                          for collision_time, robot_id_1, robot_id_2 in find_segment_collisions(segments_per_robot)}
+
+            sample_times = np.arange(0.0, 20.0, 1 / 60)
+            sampled = find_rectangle_collisions(sample_positions(segments_per_robot, sample_times), 1.0, 1.0)
+            for frame, robot_idx_1, robot_idx_2 in sampled.tolist():
+                pair = (robot_ids[robot_idx_1], robot_ids[robot_idx_2])
+                self.assertIn(pair, collisions)
+                self.assertLessEqual(collisions[pair], sample_times[frame] + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.common.grid_map import GridMap, CELL_UNPASSABLE_VALUE
+from src.config.simulation_result_config import SimulationResultConfig, convert_pickle_result
+
+
+class TestSimulationResultFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.grid_map = GridMap(grid_size_x=4, grid_size_y=3)
+        self.grid_map.update_pos(1, 2, CELL_UNPASSABLE_VALUE)
+
+    def test_convert_pickle_result(self):
+        rng = np.random.default_rng(0)
+        # Pickled results store every path as a list of float64 position rows.
+        paths = {5: list(rng.uniform(0, 3, (100, 2))), 2: [], 9: list(rng.uniform(0, 3, (37, 2)))}
+        pickle_file = Path(self.temp_dir.name) / "simulation_result.pkl"
+        with open(pickle_file, 'wb') as f:
+            pickle.dump({'paths': paths, 'fps': 60, 'grid_map': self.grid_map}, f)
+
+        result_file = convert_pickle_result(pickle_file)
+        expected = SimulationResultConfig.load(pickle_file)
+        result = SimulationResultConfig.load(result_file)
+
+        self.assertEqual(".simres", result_file.suffix)
+        self.assertEqual(60, result.fps)
+        self.assertEqual(self.grid_map.MAP, result.grid_map.MAP)
+        self.assertListEqual([5, 2, 9], list(result.paths.keys()))
+        for robot_id, path in expected.paths.items():
+            np.testing.assert_array_equal(path, result.paths[robot_id])
+        np.testing.assert_array_equal(expected.stacked_paths(), result.stacked_paths())
+
+    def test_save_without_positions(self):
+        result_file = Path(self.temp_dir.name) / "empty.simres"
+        SimulationResultConfig({3: np.zeros((0, 2))}, 60, self.grid_map).save(result_file)
+        result = SimulationResultConfig.load(result_file)
+        self.assertEqual((0, 2), result.paths[3].shape)
+        self.assertListEqual([], result.check_collisions_in_paths())
+
+
+if __name__ == '__main__':
+    unittest.main()
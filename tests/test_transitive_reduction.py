@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.adg.create_adg import ADGBuilder, ADGBackend, NaiveDepCreator
+from src.adg import transitive_reduction
+from src.adg.transitive_reduction import find_redundant_type2_dependencies
+from tests.random_solution import create_random_solution
+
+
+def reference_reduced_dependencies(adg):
+    # Removes every type-2 dependency that is implied by another path, one edge at a time.
+    graph = adg.graph.copy()
+    reduced = set()
+    for u, v in list(graph.edges()):
+        if adg.get_action(u).shuttle_R == adg.get_action(v).shuttle_R:
+            reduced.add((u, v))
+            continue
+        graph.remove_edge(u, v)
+        if not nx.has_path(graph, u, v):
+            reduced.add((u, v))
+        graph.add_edge(u, v)
+    return reduced
+
+
+class TestTransitiveReduction(unittest.TestCase):
+    def test_matches_path_search(self):
+        for seed in range(6):
+            mapf_solution = create_random_solution(seed, num_shuttles=10, num_steps=20, grid_size=5)
+            for adg_backend in ADGBackend:
+                adg = ADGBuilder().build(mapf_solution.get_all_actions(), NaiveDepCreator(),
+                                         skip_wait_actions=bool(seed % 2), adg_backend=adg_backend)
+                if not adg.is_acyclic():
+                    continue
+                num_dependencies = len(adg.get_dependencies())
+
+                reduced_adg = adg.transitive_reduction()
+                self.assertEqual({tuple(edge) for edge in reduced_adg.get_dependencies().tolist()},
+                                 reference_reduced_dependencies(adg))
+                self.assertEqual(len(adg.get_dependencies()), num_dependencies)
+                self.assertEqual(len(reduced_adg.get_all_actions()), len(adg.get_all_actions()))
+
+    def test_small_blocks_and_cycles(self):
+        # Two shuttles, chains 0 -> 1 -> 2 and 3 -> 4 -> 5; 0 -> 4 is implied by 0 -> 3.
+        shuttle_idx = np.array([0, 0, 0, 1, 1, 1])
+        chain_position = np.array([0, 1, 2, 0, 1, 2], dtype=np.int32)
+        edges_from = np.array([0, 1, 3, 4, 0, 0, 1])
+        edges_to = np.array([1, 2, 4, 5, 3, 4, 5])
+        for block_elements in [1, transitive_reduction.REDUCTION_BLOCK_ELEMENTS]:
+            with mock.patch.object(transitive_reduction, 'REDUCTION_BLOCK_ELEMENTS', block_elements):
+                redundant = find_redundant_type2_dependencies(shuttle_idx, chain_position, edges_from, edges_to)
+            self.assertEqual(redundant.tolist(), [False, False, False, False, False, True, False])
+
+        with self.assertRaises(ValueError):
+            find_redundant_type2_dependencies(shuttle_idx, chain_position, np.append(edges_from, 5),
+                                              np.append(edges_to, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()